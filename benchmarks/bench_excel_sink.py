@@ -0,0 +1,92 @@
+"""วัดเวลาและหน่วยความจำสูงสุดของการเขียน Excel ตามจำนวนแถว
+
+    python benchmarks/bench_excel_sink.py
+    python benchmarks/bench_excel_sink.py --rows 10000 100000 500000 --mode workbook
+
+- sink: sinks.ExcelSink (write-only, เขียนทีละแถว)
+- workbook: openpyxl.Workbook ปกติ + Alignment ต่อแถว (แบบเดิมของหน้า GUI) ไว้เทียบ
+แต่ละจำนวนแถววัดใน process แยก (peak RSS ไม่ปนกัน) ผลลัพธ์เป็น JSON หนึ่งบรรทัดต่อการวัด
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import extractors  # noqa: E402
+import sinks  # noqa: E402
+
+
+def synthetic_row(n):
+    fee = 1000 + n % 9000 + (n % 100) / 100
+    vat = round(fee * 0.07, 2)
+    return {"เลขที่": f"ASP-DIGIBLOC-CF-{20250000000 + n}", "วันที่": "26/09/2025",
+            "Unitholder No.": f"804-0-{n % 100000:05d}-1", "ชื่อกองทุน": "ASP-DIGIBLOC",
+            "Fee": f"{fee:,.2f}", "VAT": f"{vat:,.2f}", "total fee": f"{fee + vat:,.2f}"}
+
+
+def write_sink(path, rows):
+    with sinks.ExcelSink(path, "PDF Data") as sink:
+        for n in range(rows):
+            sink.write(synthetic_row(n))
+
+
+def write_workbook(path, rows):
+    import openpyxl
+    from openpyxl.styles import Alignment, Font
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(extractors.HEADERS)
+    for col in range(1, len(extractors.HEADERS) + 1):
+        ws.cell(row=1, column=col).font = Font(bold=True)
+    for n in range(rows):
+        ws.append(extractors.row_values(n + 1, synthetic_row(n)))
+        ws.cell(row=n + 2, column=1).alignment = Alignment(horizontal="center")
+    wb.save(path)
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux รายงานเป็น KB, macOS เป็น byte
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def run_one(mode, rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.xlsx")
+        started = time.perf_counter()
+        (write_sink if mode == "sink" else write_workbook)(path, rows)
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(path)
+    return {"mode": mode, "rows": rows, "seconds": round(elapsed, 3),
+            "us_per_row": round(elapsed / max(rows, 1) * 1e6, 2),
+            "peak_rss_mb": peak_rss_mb(), "file_mb": round(size / 1e6, 2)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 500000])
+    parser.add_argument("--mode", choices=["sink", "workbook"], default="sink")
+    parser.add_argument("--one", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.one:
+        print(json.dumps(run_one(args.mode, args.rows[0])))
+        return 0
+    for rows in args.rows:
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--one", "--mode", args.mode,
+                        "--rows", str(rows)], check=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""วัดเวลาและหน่วยความจำสูงสุดของการรวม PDF ทั้งโฟลเดอร์ (หน้า Merge PDF)
+
+    python benchmarks/bench_merge.py
+    python benchmarks/bench_merge.py --files 500 --pages 20 --modes streaming
+
+- streaming: pdfjoin.StreamingPdfWriter (เขียนทีละไฟล์ แล้วปล่อย reader ทิ้ง)
+- merger: PyPDF2.PdfMerger (แบบเดิม) ไว้เทียบ
+- append: รวมทุกไฟล์ยกเว้น --new ไฟล์สุดท้ายก่อน (ไม่จับเวลา) แล้ววัดเฉพาะการต่อท้ายไฟล์ใหม่
+สร้างไฟล์ทดสอบด้วย reportlab ครั้งเดียว แต่ละโหมดวัดใน process แยก ผลลัพธ์เป็น JSON หนึ่งบรรทัดต่อโหมด
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pdfjoin  # noqa: E402
+
+
+def make_pdfs(folder, files, pages, lines):
+    from reportlab.pdfgen import canvas
+
+    paths = []
+    for n in range(files):
+        path = os.path.join(folder, f"invoice_{n:05d}.pdf")
+        c = canvas.Canvas(path, pageCompression=0)
+        for page in range(pages):
+            for line in range(lines):
+                c.drawString(40, 800 - line * 10 % 780, f"{n:05d}/{page:03d}/{line:03d} Management Fee 3,867.43 VAT")
+            c.showPage()
+        c.save()
+        paths.append(path)
+    return paths
+
+
+def run_one(mode, folder, new):
+    paths = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.startswith("invoice_"))
+    output_path = os.path.join(folder, f"merged_{mode}.pdf")
+    if mode == "append":
+        pdfjoin.merge_files(paths[:-new], output_path)
+    started = time.perf_counter()
+    pages = pdfjoin.merge_files(paths, output_path, streaming=mode != "merger", append=mode == "append")
+    elapsed = time.perf_counter() - started
+    peak = pdfjoin.peak_rss_mb()
+    return {"mode": mode, "files": len(paths), "pages": pages, "seconds": round(elapsed, 3),
+            "peak_rss_mb": round(peak, 1) if peak else None,
+            "input_mb": round(sum(os.path.getsize(p) for p in paths) / 1e6, 2),
+            "largest_input_mb": round(max(os.path.getsize(p) for p in paths) / 1e6, 2),
+            "output_mb": round(os.path.getsize(output_path) / 1e6, 2)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--lines", type=int, default=60, help="จำนวนบรรทัดต่อหน้า (ขนาดไฟล์)")
+    parser.add_argument("--modes", nargs="+", choices=["streaming", "merger", "append"],
+                        default=["streaming", "merger", "append"])
+    parser.add_argument("--new", type=int, default=3, help="จำนวนไฟล์ใหม่ในโหมด append")
+    parser.add_argument("--one", metavar="FOLDER", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.one:
+        print(json.dumps(run_one(args.modes[0], args.one, args.new)))
+        return 0
+    with tempfile.TemporaryDirectory() as tmp:
+        make_pdfs(tmp, args.files, args.pages, args.lines)
+        for mode in args.modes:
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--one", tmp, "--modes", mode,
+                            "--new", str(args.new)], check=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
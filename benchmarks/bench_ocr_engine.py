@@ -0,0 +1,83 @@
+"""วัด overhead ต่อหน้าของ OCR engine แต่ละแบบ
+
+    python benchmarks/bench_ocr_engine.py --pages 20
+    python benchmarks/bench_ocr_engine.py --images scans/ --lang eng+tha
+
+- blank: ภาพว่างขนาดเล็ก → เวลาที่วัดได้คือ overhead คงที่ต่อหน้า (start process / โหลด traineddata)
+- text: ภาพข้อความจำลอง (หรือไฟล์ภาพจาก --images)
+ผลลัพธ์เป็น JSON หนึ่งบรรทัดต่อการวัด
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ocr  # noqa: E402
+
+
+def synthetic_page(width=1240, height=1754):
+    from PIL import Image, ImageDraw
+
+    img = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(img)
+    lines = ["TAX INVOICE", "Tax Invoice No. T-I11-202509300000353", "Date 26/09/2025",
+             "Unitholder No. 804-0-01209-1", "Fund Name EASTSPRING FIXED INCOME",
+             "Fee 3,867.43", "VAT 270.72", "Total Fee 4,138.15"]
+    for n, line in enumerate(lines):
+        draw.text((80, 120 + n * 60), line, fill=0)
+    return img
+
+
+def load_images(folder):
+    from PIL import Image
+
+    names = sorted(f for f in os.listdir(folder) if f.lower().endswith((".png", ".jpg", ".jpeg", ".tif", ".tiff")))
+    return [Image.open(os.path.join(folder, name)).convert("L") for name in names]
+
+
+def measure(label, engine, images, lang, batch):
+    started = time.perf_counter()
+    if batch:
+        engine.batch(images, lang=lang)
+    else:
+        for img in images:
+            engine.image_to_string(img, lang=lang)
+    elapsed = time.perf_counter() - started
+    return {"case": label, "engine": engine.name, "mode": "batch" if batch else "per-page",
+            "pages": len(images), "seconds": round(elapsed, 4),
+            "ms_per_page": round(elapsed / len(images) * 1000, 2)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--images", help="โฟลเดอร์ภาพที่ใช้แทนภาพจำลอง")
+    parser.add_argument("--lang", default="eng+tha")
+    args = parser.parse_args(argv)
+
+    from PIL import Image
+
+    cases = {
+        "blank": [Image.new("L", (64, 64), 255) for _ in range(args.pages)],
+        "text": load_images(args.images) if args.images else [synthetic_page() for _ in range(args.pages)],
+    }
+
+    engines = [ocr.PytesseractEngine()]
+    try:
+        engines.append(ocr.TesserocrEngine())
+    except ImportError:
+        print(json.dumps({"note": "tesserocr not installed, in-process engine skipped"}))
+
+    for label, images in cases.items():
+        for engine in engines:
+            # warm-up: ให้ engine แบบ in-process init API ก่อนเริ่มจับเวลา (เหมือน worker ที่อยู่ยาว)
+            engine.image_to_string(images[0], lang=args.lang)
+            for batch in (False, True):
+                print(json.dumps(measure(label, engine, images, args.lang, batch)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
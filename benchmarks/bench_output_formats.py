@@ -0,0 +1,83 @@
+"""วัดเวลาเขียนและเวลาอ่านกลับ (ฝั่งระบบกระทบยอด) ของแต่ละรูปแบบไฟล์ผลลัพธ์
+
+    python benchmarks/bench_output_formats.py
+    python benchmarks/bench_output_formats.py --rows 1000000 --formats csv jsonl parquet
+
+อ่านกลับทั้ง 8 คอลัมน์ด้วยวิธีมาตรฐานของแต่ละรูปแบบ (openpyxl read-only / csv / json / pyarrow)
+รูปแบบที่ไม่มี dependency จะถูกข้าม ผลลัพธ์เป็น JSON หนึ่งบรรทัดต่อรูปแบบ
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import sinks  # noqa: E402
+from bench_excel_sink import synthetic_row  # noqa: E402
+
+
+def read_xlsx(path):
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    rows = sum(1 for _ in wb.active.iter_rows(min_row=2, values_only=True))
+    wb.close()
+    return rows
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return sum(1 for _ in csv.reader(f)) - 1
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for line in f if json.loads(line))
+
+
+def read_parquet(path):
+    import pyarrow.parquet as pq
+
+    return pq.read_table(path).num_rows
+
+
+READERS = {"xlsx": read_xlsx, "csv": read_csv, "jsonl": read_jsonl, "parquet": read_parquet}
+
+
+def measure(fmt, rows, tmp):
+    path = os.path.join(tmp, "out." + fmt)
+    started = time.perf_counter()
+    with sinks.open_sink(path, fmt) as sink:
+        for n in range(rows):
+            sink.write(synthetic_row(n))
+    written = time.perf_counter() - started
+
+    started = time.perf_counter()
+    read_rows = READERS[fmt](path)
+    read = time.perf_counter() - started
+    return {"format": fmt, "rows": rows, "write_seconds": round(written, 3), "read_seconds": round(read, 3),
+            "file_mb": round(os.path.getsize(path) / 1e6, 2), "rows_read": read_rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--formats", nargs="+", choices=list(sinks.FORMATS), default=list(sinks.FORMATS))
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.formats:
+            try:
+                result = measure(fmt, args.rows, tmp)
+            except ImportError as e:
+                result = {"format": fmt, "skipped": str(e)}
+            print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""วัดความเร็วการสกัดข้อมูลของแต่ละกองทุนด้วยใบแจ้งหนี้จำลอง (เทียบระหว่าง commit)
+
+    python benchmarks/bench_providers.py
+    python benchmarks/bench_providers.py --invoices 200 --providers scbam eastspring --phases parse text_pdf
+    python benchmarks/bench_providers.py --keep corpus/ --out results.jsonl
+
+สร้าง PDF ตาม layout ของแต่ละกองทุน (DAOL (DAOL-…R) / SCBAM Fund Supervisor … VAT Included /
+Eastspring T-Ixx-… / Asset Fund ASP-…-CF-…) สองแบบ: มี text layer และเป็นภาพล้วน (ต้อง OCR)
+แล้วจับเวลาแยกขั้น:
+- parse: extract_*_text กับข้อความที่อ่านไว้แล้ว (regex / matching ล้วน)
+- text_pdf: ตัวประมวลผลของกองทุนกับไฟล์ที่มี text layer (เปิดไฟล์ + อ่านข้อความ + parse)
+- ocr: ตัวประมวลผลเดียวกันกับไฟล์ภาพ (ROI OCR / OCR ไล่ dpi, ปิดแคช OCR) ข้ามถ้าไม่มี tesseract
+- merge: pdfjoin.merge_files ทุกไฟล์ของกองทุน
+- excel: sinks.ExcelSink เขียนแถวที่สกัดได้ (ทำซ้ำจนครบ --excel-rows)
+ปิดแคชผลลัพธ์ / แคช OCR ทุกขั้น ผลลัพธ์เป็น JSON หนึ่งบรรทัดต่อ (กองทุน, ขั้น) พร้อม commit ปัจจุบัน
+complete = จำนวนแถวที่ได้ครบทุกฟิลด์ (ไว้ดูว่าเร็วขึ้นแล้วยังสกัดถูกอยู่)
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import extractors  # noqa: E402
+import ocr  # noqa: E402
+import pdfjoin  # noqa: E402
+import sinks  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+PHASES = ("parse", "text_pdf", "ocr", "merge", "excel")
+PARSERS = {
+    "daol": extractors.extract_daol_text,
+    "scbam": extractors.extract_scbam_text,
+    "eastspring": extractors.extract_eastspring_text,
+    "assetfund": extractors.extract_assetfund_text,
+}
+
+# ตำแหน่งบรรทัดบนหน้า A4 (point)
+TOP, LEADING, LEFT, FONT_SIZE = 790, 22, 60, 12
+RASTER_DPI = 200
+
+
+# -------------------- LAYOUT --------------------
+def amounts(n):
+    fee = 1000 + n * 37 % 9000 + (n % 100) / 100
+    vat = round(fee * 0.07, 2)
+    return f"{fee:,.2f}", f"{vat:,.2f}", f"{fee + vat:,.2f}"
+
+
+def daol_lines(n):
+    fee, vat, total = amounts(n)
+    return ["DAOL INVESTMENT MANAGEMENT", "TAX INVOICE / RECEIPT",
+            f"Tax Invoice No. DAOL{n:08d}", "Allocation Date 26-09-2025",
+            f"Unitholder No. : 8040{n:06d}", "Fund Name",
+            "(DAOL-FIXED INCOME R)", "Description Amount",
+            f"Management Fee {fee}", f"VAT 7% {vat}", f"Total {total}"]
+
+
+def scbam_lines(n):
+    fee, vat, total = amounts(n)
+    return ["SCB ASSET MANAGEMENT", "Statement of Fee", f"Date {n % 28 + 1:02d}/09/2025",
+            "Unitholder No. Client No.", f"000-0-{1872560 + n:07d}-3 {9910902 + n:010d}",
+            "(SCBUSAA)", "Fund Name SCB US EQUITY",
+            f"Fund Supervisor Fee {fee}", f"VAT (7%) {vat}", f"Fee (VAT Included) {total}"]
+
+
+def eastspring_lines(n):
+    fee, vat, total = amounts(n)
+    return ["EASTSPRING ASSET MANAGEMENT (THAILAND)", "TAX INVOICE / RECEIPT",
+            f"Tax Invoice No. T-I11-20250930{n:07d}", "Date 26/09/2025",
+            f"Unitholder No. 804-0-{n % 100000:05d}-1", "Address 9th Floor Sathorn Bangkok",
+            "Customer Name Example Company Limited", "Fund Name",
+            "EASTSPRING FIXED INCOME FUND", "Branch Head Office", "Payment Type Transfer",
+            "Period September 2025", "Description", "Management Fee", "Amount Baht",
+            f"{total} {vat}", fee, "Thank you"]
+
+
+def assetfund_lines(n):
+    fee, vat, total = amounts(n)
+    return ["ASSET PLUS FUND MANAGEMENT", f"ASP-DIGIBLOC-CF-2025{n:07d} Tax Invoice No",
+            "Date 26/09/2025", f"Unitholder No. : 000-0-{n % 100000:05d}-1", "Fund Name : ASP-DIGIBLOC",
+            "Fee (Excluding Vat)", fee, "Vat", vat, "Total Fee", total]
+
+
+LAYOUTS = {"daol": daol_lines, "scbam": scbam_lines, "eastspring": eastspring_lines, "assetfund": assetfund_lines}
+
+
+# -------------------- GENERATOR --------------------
+def raster_page(lines):
+    """ภาพหน้า A4 ที่ RASTER_DPI มีแต่ pixel (ไม่มี text layer)"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    scale = RASTER_DPI / 72
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", int(FONT_SIZE * scale))
+    except OSError:
+        font = ImageFont.load_default()
+    img = Image.new("L", (int(595 * scale), int(842 * scale)), 255)
+    draw = ImageDraw.Draw(img)
+    for i, line in enumerate(lines):
+        draw.text((LEFT * scale, (842 - TOP + i * LEADING - FONT_SIZE) * scale), line, fill=0, font=font)
+    return img
+
+
+def write_pdf(path, pages, raster):
+    """pages = [บรรทัดของแต่ละหน้า] raster=True วาดเป็นภาพทั้งหน้า"""
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(path, invariant=1)
+    for lines in pages:
+        if raster:
+            c.drawImage(ImageReader(raster_page(lines)), 0, 0, width=595, height=842)
+        else:
+            c.setFont("Helvetica", FONT_SIZE)
+            for i, line in enumerate(lines):
+                c.drawString(LEFT, TOP - i * LEADING, line)
+        c.showPage()
+    c.save()
+    return path
+
+
+def generate(folder, provider, invoices, raster):
+    """SCBAM = ไฟล์เดียวหลายหน้า (หนึ่งหน้าต่อแถว) กองทุนอื่น = หนึ่งไฟล์ต่อใบแจ้งหนี้"""
+    variant = "raster" if raster else "text"
+    out_dir = os.path.join(folder, provider, variant)
+    os.makedirs(out_dir, exist_ok=True)
+    layout = LAYOUTS[provider]
+    if extractors.PROVIDERS[provider]["input"] == "file":
+        return [write_pdf(os.path.join(out_dir, f"{provider}.pdf"), [layout(n) for n in range(invoices)], raster)]
+    return [write_pdf(os.path.join(out_dir, f"{provider}_{n:05d}.pdf"), [layout(n)], raster)
+            for n in range(invoices)]
+
+
+# -------------------- PHASES --------------------
+def page_texts(paths):
+    import pdfplumber
+
+    texts = []
+    for path in paths:
+        with pdfplumber.open(path) as pdf:
+            texts.extend(page.extract_text() or "" for page in pdf.pages)
+    return texts
+
+
+def complete(rows):
+    return sum(all(row.get(field) for field in extractors.empty_row()) for row in rows)
+
+
+def run_process(provider, paths):
+    process = extractors.PROVIDERS[provider]["process"]
+    rows, pages = [], 0
+    for path in paths:
+        file_rows, file_pages = process(path)
+        rows.extend(file_rows)
+        pages += file_pages
+    return rows, pages
+
+
+def ocr_available():
+    from PIL import Image
+
+    try:
+        ocr.image_to_string(Image.new("L", (32, 32), 255), lang="eng")
+        return True
+    except Exception:
+        return False
+
+
+def measure(provider, phase, corpus, tmp, excel_rows):
+    """คืนค่า (วินาที, จำนวนหน้า/แถว, แถวที่ได้ หรือ None)"""
+    text_paths = corpus[provider, "text"]
+    if phase == "parse":
+        texts = page_texts(text_paths)
+        parse = PARSERS[provider]
+        started = time.perf_counter()
+        rows = [parse(text) for text in texts]
+        return time.perf_counter() - started, len(texts), rows
+    if phase in ("text_pdf", "ocr"):
+        paths = text_paths if phase == "text_pdf" else corpus[provider, "raster"]
+        started = time.perf_counter()
+        rows, pages = run_process(provider, paths)
+        return time.perf_counter() - started, pages, rows
+    if phase == "merge":
+        started = time.perf_counter()
+        pages = pdfjoin.merge_files(text_paths, os.path.join(tmp, f"{provider}_merged.pdf"))
+        return time.perf_counter() - started, pages, None
+    rows, _ = run_process(provider, text_paths)
+    spec = extractors.PROVIDERS[provider]
+    started = time.perf_counter()
+    with sinks.ExcelSink(os.path.join(tmp, spec["output"]), spec["sheet"], spec.get("widths")) as sink:
+        for n in range(excel_rows):
+            sink.write(rows[n % len(rows)])
+    return time.perf_counter() - started, excel_rows, None
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invoices", type=int, default=50, help="จำนวนใบแจ้งหนี้ (หน้า) ต่อกองทุน")
+    parser.add_argument("--providers", nargs="+", default=list(LAYOUTS), choices=list(LAYOUTS))
+    parser.add_argument("--phases", nargs="+", default=list(PHASES), choices=PHASES)
+    parser.add_argument("--repeat", type=int, default=3, help="วัดซ้ำกี่ครั้ง (ใช้ค่าน้อยสุด)")
+    parser.add_argument("--excel-rows", type=int, default=10000, help="จำนวนแถวที่เขียนในขั้น excel")
+    parser.add_argument("--keep", help="เก็บไฟล์จำลองไว้ในโฟลเดอร์นี้ (ใช้ซ้ำได้ถ้ามีอยู่แล้ว)")
+    parser.add_argument("--out", help="ต่อท้ายผลลัพธ์ลงไฟล์ .jsonl นี้ด้วย")
+    args = parser.parse_args(argv)
+
+    extractors.VERBOSE = False
+    extractors.RESULT_CACHE_ENABLED = False
+    ocr.CACHE_ENABLED = False
+    phases = list(args.phases)
+    if "ocr" in phases and not ocr_available():
+        print(json.dumps({"note": "OCR engine not available, ocr phase skipped"}), flush=True)
+        phases.remove("ocr")
+
+    commit = git_commit()
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.keep or tmp
+        corpus = {}
+        for provider in args.providers:
+            for raster in (False, True):
+                if raster and "ocr" not in phases:
+                    continue
+                variant = "raster" if raster else "text"
+                existing = os.path.join(folder, provider, variant)
+                if args.keep and os.path.isdir(existing) and os.listdir(existing):
+                    corpus[provider, variant] = sorted(os.path.join(existing, name)
+                                                       for name in extractors.list_pdfs(existing))
+                else:
+                    corpus[provider, variant] = generate(folder, provider, args.invoices, raster)
+
+        for provider in args.providers:
+            for phase in phases:
+                runs = [measure(provider, phase, corpus, tmp, args.excel_rows) for _ in range(max(1, args.repeat))]
+                seconds, count, rows = min(runs, key=lambda run: run[0])
+                result = {"commit": commit, "python": platform.python_version(), "provider": provider,
+                          "phase": phase, "items": count, "seconds": round(seconds, 4),
+                          "ms_per_item": round(seconds / max(1, count) * 1000, 3)}
+                if rows is not None:
+                    result["complete"] = complete(rows)
+                line = json.dumps(result, ensure_ascii=False)
+                print(line, flush=True)
+                if args.out:
+                    with open(args.out, "a", encoding="utf-8") as f:
+                        f.write(line + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""ตรวจว่าแคชผลลัพธ์ไม่เก็บรอบที่ล้มเหลว (รหัสผ่านผิด / OCR ไม่ได้) รอบถัดไปต้องได้ข้อมูลจริง
+
+    python benchmarks/check_result_cache.py
+
+- password: DAOL ที่เข้ารหัส รอบแรกรหัสผิด (ต้องได้แถว ERROR) รอบสองรหัสถูก (ต้องได้ข้อมูลครบ ไม่ใช่แถวจากแคช)
+  รอบสาม / สี่ไม่ใส่รหัส / รหัสผิด หลังจากผลอยู่ในแคชแล้ว (ต้องได้แถว ERROR ไม่ใช่ผลหรือสำเนาที่รหัสของรอบสองปลดไว้)
+- ocr: Eastspring แบบภาพล้วนเมื่อไม่มี OCR engine ต้องได้แถว ERROR และไม่มีอะไรถูกเก็บในแคช
+  (ข้ามถ้ามี OCR engine)
+ใช้โฟลเดอร์แคชชั่วคราว ผลลัพธ์เป็น JSON หนึ่งบรรทัดต่อกรณี, exit code 1 ถ้ามีกรณีที่ไม่ผ่าน
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import extractors  # noqa: E402
+from bench_providers import LAYOUTS, ocr_available, write_pdf  # noqa: E402
+
+
+def extract_once(provider, pdf_path, password=None):
+    """แถวของไฟล์เดียวผ่าน iter_provider_files (ใช้แคชผลลัพธ์เหมือนการใช้งานจริง)"""
+    (_, rows, _), = extractors.iter_provider_files(provider, [pdf_path], password=password, workers=1)
+    return rows
+
+
+def is_error(row):
+    return str(row.get("เลขที่", "")).startswith("ERROR:")
+
+
+def check_password(folder):
+    from PyPDF2 import PdfReader, PdfWriter
+
+    plain = write_pdf(os.path.join(folder, "daol_plain.pdf"), [LAYOUTS["daol"](1)], raster=False)
+    writer = PdfWriter()
+    for page in PdfReader(plain).pages:
+        writer.add_page(page)
+    writer.encrypt("secret")
+    pdf_path = os.path.join(folder, "daol_locked.pdf")
+    with open(pdf_path, "wb") as f:
+        writer.write(f)
+
+    wrong = extract_once("daol", pdf_path, password="wrong")
+    right = extract_once("daol", pdf_path, password="secret")
+    missing = extract_once("daol", pdf_path)
+    wrong_again = extract_once("daol", pdf_path, password="wrong")
+    ok = is_error(wrong[0]) and all(right[0].values()) and is_error(missing[0]) and is_error(wrong_again[0])
+    return {"case": "password", "first": wrong[0]["เลขที่"], "second": right[0], "no_password": missing[0]["เลขที่"],
+            "wrong_after_cache": wrong_again[0]["เลขที่"], "ok": ok}
+
+
+def check_ocr(folder):
+    pdf_path = write_pdf(os.path.join(folder, "eastspring_scan.pdf"), [LAYOUTS["eastspring"](1)], raster=True)
+    rows = extract_once("eastspring", pdf_path)
+    key = extractors.result_key("eastspring", pdf_path)
+    cached = extractors.get_result_cache().get(key) is not None
+    return {"case": "ocr", "row": rows[0]["เลขที่"], "cached": cached, "ok": is_error(rows[0]) and not cached}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args(argv)
+
+    extractors.VERBOSE = False
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["FUNDFEE_CACHE_DIR"] = os.path.join(tmp, "cache")
+        results = [check_password(tmp)]
+        if ocr_available():
+            print(json.dumps({"note": "OCR engine available, ocr case skipped"}))
+        else:
+            results.append(check_ocr(tmp))
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False))
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
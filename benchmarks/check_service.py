@@ -0,0 +1,96 @@
+"""ตรวจ service HTTP (fundfee serve) กับ localhost: ส่งงาน รอผล และดาวน์โหลดไฟล์ผลลัพธ์
+
+    python benchmarks/check_service.py
+    python benchmarks/check_service.py --invoices 10 --provider eastspring
+
+เปิด service.make_server(port=0) ใน thread ของสคริปต์นี้ แล้วเรียกผ่าน service.Client เหมือนหน้าจอ Tk
+- extract: ส่ง path ของไฟล์ (service ในเครื่องเดียวกัน)
+- upload: อัปโหลดเนื้อไฟล์แล้วส่งงานด้วย upload id (service เครื่องอื่น)
+- remote: service.run_remote(upload=True) แบบที่หน้าจอใช้เมื่อ service ไม่ได้อยู่ในเครื่องนี้
+- merge: รวม PDF ผ่าน service
+ทุกกรณีรอด้วย GET /jobs/<id> แล้วดาวน์โหลด /jobs/<id>/result มาตรวจจำนวนแถว / จำนวนหน้า
+ใช้โฟลเดอร์แคชชั่วคราว ผลลัพธ์เป็น JSON หนึ่งบรรทัดต่อกรณี, exit code 1 ถ้ามีกรณีที่ไม่ผ่าน
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import extractors  # noqa: E402
+import service  # noqa: E402
+from bench_providers import generate  # noqa: E402
+
+
+def csv_rows(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return len(list(csv.reader(f))) - 1
+
+
+def check_extract(client, case, provider, paths, invoices, out_dir, upload=False):
+    job = client.submit("extract", provider, files=paths, fmt="csv", upload=upload)
+    job = client.wait(job["id"], poll=0.1)
+    output_path = client.download(job["id"], os.path.join(out_dir, f"{case}.csv"))
+    rows = csv_rows(output_path)
+    return {"case": case, "status": job["status"], "rows": rows, "errors": job["errors"],
+            "ok": job["rows"] == rows == invoices and not job["errors"]}
+
+
+def check_remote(client, provider, paths, invoices, out_dir):
+    output_path = os.path.join(out_dir, "remote.csv")
+    job = service.run_remote("extract", output_path, provider=provider, files=paths, fmt="csv",
+                             url=client.url, upload=True)
+    rows = csv_rows(output_path)
+    return {"case": "remote", "status": job["status"], "rows": rows, "ok": rows == invoices and not job["errors"]}
+
+
+def check_merge(client, paths, invoices, out_dir):
+    from PyPDF2 import PdfReader
+
+    job = client.wait(client.submit("merge", files=paths, upload=True)["id"], poll=0.1)
+    output_path = client.download(job["id"], os.path.join(out_dir, "merged.pdf"))
+    pages = len(PdfReader(output_path).pages)
+    return {"case": "merge", "status": job["status"], "pages": pages, "ok": pages == job["pages"] == invoices}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", default="daol", choices=sorted(extractors.PROVIDERS))
+    parser.add_argument("--invoices", type=int, default=3, help="จำนวนใบแจ้งหนี้จำลอง")
+    args = parser.parse_args(argv)
+
+    extractors.VERBOSE = False
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["FUNDFEE_CACHE_DIR"] = os.path.join(tmp, "cache")
+        out_dir = os.path.join(tmp, "out")
+        os.makedirs(out_dir)
+        paths = generate(os.path.join(tmp, "in"), args.provider, args.invoices, raster=False)
+
+        server = service.make_server(port=0, workers=1, work_dir=os.path.join(tmp, "service"))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = service.Client(f"http://{service.HOST}:{server.server_address[1]}")
+        results = []
+        try:
+            # SCBAM = หลายใบในไฟล์เดียว จำนวนแถว / หน้าเท่าจำนวนใบแจ้งหนี้เหมือนกองทุนอื่น
+            results.append(check_extract(client, "extract", args.provider, paths, args.invoices, out_dir))
+            results.append(check_extract(client, "upload", args.provider, paths, args.invoices, out_dir,
+                                         upload=True))
+            results.append(check_remote(client, args.provider, paths, args.invoices, out_dir))
+            results.append(check_merge(client, paths, args.invoices, out_dir))
+        except Exception as e:
+            results.append({"case": "error", "error": f"{type(e).__name__}: {e}", "ok": False})
+        finally:
+            server.shutdown()
+            server.server_close()
+            server.jobs.close()
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False))
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
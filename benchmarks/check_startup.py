@@ -0,0 +1,67 @@
+"""ตรวจเวลา import ตอนเปิดโปรแกรม (หน้าแรกต้องขึ้นเร็ว) เทียบกับงบเวลา
+
+    python benchmarks/check_startup.py
+    python benchmarks/check_startup.py --budget-ms 300 --modules main inbox
+
+import แต่ละ module ใน process ใหม่ด้วย python -X importtime (ใช้ค่าน้อยสุดจาก --runs ครั้ง)
+เกินงบ หรือมี library หนัก (HEAVY) ถูก import ไปด้วย → exit code 1 ใช้เป็น regression check ก่อนปล่อยเวอร์ชัน
+(Pillow ไม่อยู่ใน HEAVY: ttkbootstrap import เองอยู่แล้ว) ผลลัพธ์เป็น JSON หนึ่งบรรทัดต่อ module
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# ต้องโหลดเมื่อใช้งานจริงเท่านั้น (ในฟังก์ชันที่ต้องใช้ / ตอนเปิดหน้านั้นครั้งแรก)
+HEAVY = ("pdfplumber", "pdfminer", "PyPDF2", "openpyxl", "pytesseract", "tesserocr", "fitz", "pyarrow")
+BUDGET_MS = 500
+# main + ทุกหน้า (แต่ละหน้าถูก import ตอนเปิดครั้งแรก ต้องไม่ลาก library หนัก / ตั้งค่า tesseract ตอน import)
+MODULES = ("main", "mergepdf", "splitpdf", "doal", "scbam", "eastspring", "assetfund", "inbox")
+
+CHILD = "import {module}; import sys, json; print(json.dumps(sorted(set(sys.modules) & set({heavy!r}))))"
+
+
+def parse_importtime(stderr):
+    """[(module, cumulative ms)] เฉพาะ import ชั้นบนสุด"""
+    top = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            top.append((name.strip(), int(cumulative) / 1000))
+    return top
+
+
+def measure(module):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD.format(module=module, heavy=HEAVY)],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode:
+        return {"module": module, "error": (proc.stderr.strip().splitlines() or ["?"])[-1]}
+    top = parse_importtime(proc.stderr)
+    return {"module": module, "ms": round(sum(ms for _, ms in top), 1), "heavy": json.loads(proc.stdout),
+            "slowest": [[name, round(ms, 1)] for name, ms in sorted(top, key=lambda x: -x[1])[:5]]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=list(MODULES), help="module ที่ต้องเปิดได้เร็ว")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="เวลา import สูงสุดต่อ module")
+    parser.add_argument("--runs", type=int, default=3, help="จำนวนครั้งที่วัด (ใช้ค่าน้อยสุด)")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for module in args.modules:
+        results = [measure(module) for _ in range(max(1, args.runs))]
+        result = min(results, key=lambda r: r.get("ms", float("inf")))
+        result["ok"] = "error" not in result and result["ms"] <= args.budget_ms and not result["heavy"]
+        failed += not result["ok"]
+        print(json.dumps(result, ensure_ascii=False))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""stress test การจับคู่ฟิลด์กับข้อความ OCR เพี้ยนแบบจงใจ (หา regex ที่ backtrack แบบ quadratic)
+
+    python benchmarks/stress_matching.py
+    python benchmarks/stress_matching.py --chars 200000 --limit-ms 500
+
+ทุกกองทุน × ทุกรูปแบบข้อความ ต้องเสร็จภายใน --limit-ms ต่อหน้า (ค่าเริ่มต้นเท่ากับงบเวลา matching.BUDGET_MS)
+ผลลัพธ์เป็น JSON หนึ่งบรรทัดต่อการวัด, exit code 1 ถ้ามีหน้าที่เกินเวลา
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import extractors  # noqa: E402
+import matching  # noqa: E402
+
+EXTRACTORS = {
+    "daol": extractors.extract_daol_text,
+    "scbam": extractors.extract_scbam_text,
+    "eastspring": extractors.extract_eastspring_text,
+    "assetfund": extractors.extract_assetfund_text,
+}
+
+
+def repeat(unit, chars):
+    return unit * max(1, chars // len(unit))
+
+
+def adversarial_pages(chars, seed=0):
+    """{ชื่อ: ข้อความ} ที่เล็งจุดอ่อนของ pattern แต่ละแบบ"""
+    rnd = random.Random(seed)
+    return {
+        # กลุ่มตัวอักษรยาวไม่มีตัวคั่น ([A-Z]{2,}-..., [A-Z]{3,}[A-Z0-9]*, [^0-9\s]{3,}/...)
+        "letter_run": "A" * chars,
+        "alnum_run": repeat("AAA1", chars),
+        "slash_run": repeat("ab/", chars),
+        # anchor ซ้ำ ๆ ที่ไม่มีวันปิด (\(DAOL-...R\), ชื่อกองทุน...\(, เลขที่ ...Tax Invoice No|$)
+        "open_anchors": repeat("(DAOL-X ", chars),
+        "fund_labels": repeat("ชื่อกองทุน : กองทุนเปิด ", chars),
+        "invoice_labels": repeat("เลขที่ AB12 ", chars),
+        "fund_words": repeat("ABCDEF Fun ", chars),
+        # ช่องว่าง / ขึ้นบรรทัดยาว (\s*[:\-]?\s*, \s*[\r\n]+\s*)
+        "whitespace_after_label": "ใบกำกับภาษี เลขที่" + " " * chars + "X",
+        "blank_lines": "(SCBX1)" + " \n" * (chars // 2) + "Fund",
+        # เลขบัญชีซ้ำ ๆ ไม่มีเลขที่ตามหลัง (pair regex .{0,80}?)
+        "unit_numbers": repeat("000-0-1234567-8 xx ", chars),
+        # ขยะ OCR แบบสุ่ม
+        "noise": "".join(rnd.choice("AB1-/. :(\n") for _ in range(chars)),
+        "noise_amounts": " ".join(f"{rnd.randint(0, 99999):,}.{rnd.randint(0, 99):02d}" for _ in range(chars // 9)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", type=int, default=50000, help="ความยาวข้อความต่อหน้า")
+    parser.add_argument("--limit-ms", type=float, default=matching.BUDGET_MS, help="เวลาสูงสุดต่อหน้า")
+    args = parser.parse_args(argv)
+
+    extractors.VERBOSE = False
+    failed = 0
+    for name, text in adversarial_pages(args.chars).items():
+        for provider, extract in EXTRACTORS.items():
+            start = time.perf_counter()
+            extract(text)
+            ms = (time.perf_counter() - start) * 1000
+            ok = ms <= args.limit_ms
+            failed += not ok
+            print(json.dumps({"case": name, "provider": provider, "chars": len(text),
+                              "ms": round(ms, 1), "ok": ok}))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import hashlib
+import os
+import platform
+import sqlite3
+import threading
+import time
+
+
+def log(message):
+    # ผ่าน extractors.log เหมือนข้อความอื่นของการสกัด (import ตอนใช้: extractors → unlock → cache)
+    import extractors
+
+    extractors.log(message)
+
+
+# -------------------- CACHE DIR --------------------
+def cache_dir(*parts):
+    """โฟลเดอร์แคชของโปรแกรม (เปลี่ยนได้ด้วย env FUNDFEE_CACHE_DIR)"""
+    base = os.environ.get("FUNDFEE_CACHE_DIR")
+    if not base:
+        if platform.system() == "Windows":
+            base = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "fundfee", "cache")
+        elif platform.system() == "Darwin":  # macOS
+            base = os.path.expanduser("~/Library/Caches/fundfee")
+        else:
+            base = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "fundfee")
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """sha256 ของเนื้อไฟล์ (อ่านทีละ chunk ไม่โหลดทั้งไฟล์เข้าหน่วยความจำ)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# -------------------- SQLITE LRU --------------------
+class LRUCache:
+    """key/value (text) บน SQLite จำกัดขนาดรวมด้วยการลบรายการที่ไม่ได้ใช้นานที่สุด
+
+    ใช้ได้จากหลาย thread และหลาย process (WAL) — แต่ละ process เปิด connection ของตัวเอง
+    ตรวจขนาดรวมตอนเปิด connection และทุกครั้งที่เขียนเพิ่มครบ CHECK_FRACTION ของขนาดสูงสุด
+    (งานสั้น ๆ ที่เขียนไม่กี่รายการก็ยังถูกจำกัดขนาด)
+    """
+
+    CHECK_FRACTION = 0.05
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._written = 0
+
+    def _connect(self):
+        # connection ใช้ข้าม fork ไม่ได้ → เปิดใหม่เมื่อ pid เปลี่ยน
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS entries ("
+                         "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                         "size INTEGER NOT NULL, last_used REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+            conn.commit()
+            self._conn, self._pid = conn, os.getpid()
+            self._written = 0
+            self._evict(conn)
+        return self._conn
+
+    def get(self, key):
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+                return row[0]
+            except sqlite3.Error as e:
+                log(f"⚠️ อ่านแคชไม่ได้ ({self.path}): {e}")
+                return None
+
+    def put(self, key, value):
+        with self._lock:
+            try:
+                conn = self._connect()
+                size = len(value.encode("utf-8"))
+                conn.execute("INSERT OR REPLACE INTO entries (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                             (key, value, size, time.time()))
+                conn.commit()
+                self._written += size
+                if self._written >= self.max_bytes * self.CHECK_FRACTION:
+                    self._written = 0
+                    self._evict(conn)
+            except sqlite3.Error as e:
+                log(f"⚠️ เขียนแคชไม่ได้ ({self.path}): {e}")
+
+    def delete(self, key):
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.commit()
+            except sqlite3.Error as e:
+                log(f"⚠️ ลบรายการในแคชไม่ได้ ({self.path}): {e}")
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # ลบจนเหลือ 90% ของขนาดสูงสุด เพื่อไม่ต้องลบทุกครั้งที่เขียน
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            stale.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+        conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
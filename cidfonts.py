@@ -0,0 +1,151 @@
+import json
+import os
+import re
+
+import ocr
+
+# ถอดข้อความจากฟอนต์ CID ที่ไม่มี ToUnicode (pdfplumber ได้ "(cid:123)")
+# ด้วยตาราง CID → ตัวอักษรต่อฟอนต์ แทนการ OCR ทั้งหน้า
+#
+# ตารางมาจาก 2 ที่:
+#   1. ไฟล์ cidmaps/*.json ที่มากับโปรแกรม {"<font>": {"<cid>": "<char>"}}
+#   2. calibrate_page() — OCR ทีละ glyph ครั้งแรกที่เจอฟอนต์ แล้วเก็บไว้ในแคช (fonts.sqlite3)
+
+CID_RE = re.compile(r"^\(cid:(\d+)\)$")
+SUBSET_RE = re.compile(r"^[A-Z]{6}\+")
+MAPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cidmaps")
+
+# ปิดการ calibrate อัตโนมัติได้ด้วย FUNDFEE_NO_CID_CALIBRATE=1
+CALIBRATE = os.environ.get("FUNDFEE_NO_CID_CALIBRATE", "") == ""
+CALIBRATE_DPI = 300
+
+_shipped = None
+_learned = {}
+_store = None
+# (font, cid) ที่ calibrate แล้วไม่สำเร็จ ไม่ลองซ้ำใน process เดิม
+_attempted = set()
+
+
+# -------------------- FONT KEY --------------------
+def font_key(fontname):
+    """ชื่อฟอนต์ตัด subset tag (ABCDEF+) ออก → เอกสารใหม่ที่ใช้ฟอนต์เดียวกันได้ key เดิม"""
+    return SUBSET_RE.sub("", fontname or "")
+
+
+def cid_of(char):
+    m = CID_RE.match(char.get("text", ""))
+    return int(m.group(1)) if m else None
+
+
+# -------------------- MAPPING STORE --------------------
+def shipped_maps():
+    global _shipped
+    if _shipped is None:
+        _shipped = {}
+        if os.path.isdir(MAPS_DIR):
+            for name in sorted(os.listdir(MAPS_DIR)):
+                if name.endswith(".json"):
+                    with open(os.path.join(MAPS_DIR, name), encoding="utf-8") as f:
+                        for font, table in json.load(f).items():
+                            _shipped.setdefault(font, {}).update({int(k): v for k, v in table.items()})
+    return _shipped
+
+
+def get_store():
+    global _store
+    if _store is None:
+        from cache import LRUCache, cache_dir
+
+        _store = LRUCache(os.path.join(cache_dir(), "fonts.sqlite3"), 16 * 1024 * 1024)
+    return _store
+
+
+def get_mapping(key):
+    if key not in _learned:
+        table = dict(shipped_maps().get(key, {}))
+        value = get_store().get(key)
+        if value:
+            table.update({int(k): v for k, v in json.loads(value).items()})
+        _learned[key] = table
+    return _learned[key]
+
+
+def save_mapping(key, table):
+    _learned[key] = table
+    get_store().put(key, json.dumps({str(k): v for k, v in table.items()}, ensure_ascii=False))
+
+
+# -------------------- DECODE --------------------
+def missing_cids(chars):
+    """{font_key: {cid: char ตัวอย่าง}} ของ CID ที่ยังไม่มีในตาราง"""
+    missing = {}
+    for char in chars:
+        cid = cid_of(char)
+        if cid is None:
+            continue
+        key = font_key(char.get("fontname"))
+        if cid not in get_mapping(key):
+            missing.setdefault(key, {}).setdefault(cid, char)
+    return missing
+
+
+def decode_page(page, calibrate=None):
+    """ข้อความของหน้าโดยแทน (cid:N) ด้วยตัวอักษรจริง
+    คืนค่า None ถ้ายังมี CID ที่ถอดไม่ได้ (ให้ผู้เรียก OCR ต่อเหมือนเดิม)"""
+    from pdfplumber.utils import extract_text
+
+    chars = page.chars
+    missing = missing_cids(chars)
+    if missing and (CALIBRATE if calibrate is None else calibrate):
+        todo = {key: {cid: char for cid, char in samples.items() if (key, cid) not in _attempted}
+                for key, samples in missing.items()}
+        todo = {key: samples for key, samples in todo.items() if samples}
+        if todo:
+            calibrate_page(page, todo)
+            missing = missing_cids(chars)
+    if missing:
+        return None
+
+    decoded = []
+    for char in chars:
+        cid = cid_of(char)
+        if cid is not None:
+            char = dict(char, text=get_mapping(font_key(char.get("fontname")))[cid])
+        decoded.append(char)
+    return extract_text(decoded)
+
+
+# -------------------- CALIBRATION --------------------
+def calibrate_page(page, missing):
+    """render หน้าครั้งเดียวแล้ว OCR ทีละ glyph (psm 10) ด้วย batch เดียว
+    เก็บเฉพาะ glyph ที่ OCR ได้ตัวอักษรเดียวชัดเจน"""
+    from PIL import Image
+
+    scale = CALIBRATE_DPI / 72.0
+    img = page.to_image(resolution=CALIBRATE_DPI).original.convert("L")
+
+    jobs, crops = [], []
+    for key, samples in missing.items():
+        for cid, char in samples.items():
+            box = (int((char["x0"] - page.bbox[0]) * scale) - 2, int((char["top"] - page.bbox[1]) * scale) - 2,
+                   int((char["x1"] - page.bbox[0]) * scale) + 2, int((char["bottom"] - page.bbox[1]) * scale) + 2)
+            glyph = img.crop(box)
+            # เว้นขอบขาวรอบตัวอักษร tesseract อ่านตัวเดี่ยวได้แม่นขึ้น
+            canvas = Image.new("L", (glyph.width + 40, glyph.height + 40), 255)
+            canvas.paste(glyph, (20, 20))
+            jobs.append((key, cid))
+            crops.append(canvas)
+    if not crops:
+        return
+
+    texts = ocr.images_to_strings(crops, lang="eng+tha", config="--psm 10")
+    learned = {}
+    for (key, cid), text in zip(jobs, texts):
+        _attempted.add((key, cid))
+        text = text.strip()
+        if len(text) == 1:
+            learned.setdefault(key, {})[cid] = text
+    for key, table in learned.items():
+        merged = dict(get_mapping(key))
+        merged.update(table)
+        save_mapping(key, merged)
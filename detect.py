@@ -0,0 +1,121 @@
+import functools
+import os
+import re
+
+import cidfonts
+import extractors
+import jobs
+import ocr
+import unlock
+
+# แยกกองทุนของไฟล์จากหน้าแรกเท่านั้น (ไม่ต้องรู้ล่วงหน้าว่าโฟลเดอร์เป็นของกองทุนไหน)
+#
+# ใช้ marker เดียวกับที่ตัวสกัดแต่ละกองทุนใช้จับเลขที่/ชื่อกองทุน ให้คะแนนตามน้ำหนัก
+# กองทุนที่คะแนนสูงสุด (อย่างน้อย MIN_SCORE และไม่เสมอกับกองทุนอื่น) ชนะ ไม่งั้นเป็น None (ไม่รู้จัก)
+# หน้าแรกไม่มี text layer (หรือยังมี CID ที่ถอดไม่ได้) จึง OCR ที่ DETECT_DPI
+
+MARKERS = {
+    "daol": [(re.compile(r"\(DAOL-"), 3), (re.compile(r"\bDAOL\b"), 2),
+             (re.compile(r"วันที่จัดสรรหน่วย|Allocation\s*Date", re.I), 1)],
+    "scbam": [(re.compile(r"SCB\s*Asset\s*Management|SCBAM", re.I), 3), (re.compile(r"Fund\s+Supervisor", re.I), 2),
+              (re.compile(r"\bSCB"), 1), (re.compile(r"\b\d{3}-\d-\d{7}-\d\b"), 1)],
+    "eastspring": [(re.compile(r"\bT-I\d{1,2}-\d{8,20}"), 3), (re.compile(r"Eastspring", re.I), 3)],
+    "assetfund": [(re.compile(r"(?<![A-Z])[A-Z]{2,}-[A-Z0-9 ]{1,30}-CF-\d{8,}"), 3),
+                  (re.compile(r"Asset\s*Plus|แอสเซทพลัส", re.I), 3), (re.compile(r"\(ASP-"), 2)],
+}
+MIN_SCORE = 2
+DETECT_DPI = 150
+# text layer ที่สั้นกว่านี้ (ไม่นับช่องว่าง) ถือว่าเป็นหน้าสแกน
+MIN_TEXT_CHARS = 20
+
+_detected = {}
+
+
+def scores(text):
+    return {provider: sum(weight for rx, weight in markers if rx.search(text))
+            for provider, markers in MARKERS.items()}
+
+
+def classify_text(text):
+    """กองทุนจากข้อความหน้าแรก หรือ None ถ้าไม่แน่ใจ"""
+    ranked = sorted(scores(text).items(), key=lambda item: item[1], reverse=True)
+    (best, top), (_, second) = ranked[0], ranked[1]
+    if top < MIN_SCORE or top == second:
+        return None
+    return best
+
+
+def first_page_text(page):
+    """text layer ของหน้า (ถอด CID ถ้าจำเป็น) คืนค่า "" ถ้าไม่มีข้อความที่ใช้ได้"""
+    text = page.extract_text() or ""
+    if "(cid:" in text:
+        text = cidfonts.decode_page(page) or ""
+    return text if len("".join(text.split())) >= MIN_TEXT_CHARS else ""
+
+
+def detect_provider(pdf_path, password=None):
+    """กองทุนของไฟล์ (ดูหน้าแรกเท่านั้น) แคชตาม (path, size, mtime) ใน process นี้"""
+    st = os.stat(pdf_path)
+    key = (os.path.abspath(pdf_path), st.st_size, st.st_mtime)
+    if key in _detected:
+        return _detected[key]
+
+    with unlock.open_plumber(pdf_path, password=password, pages=[1]) as pdf:
+        if not pdf.pages:
+            provider = None
+        else:
+            page = pdf.pages[0]
+            text = first_page_text(page)
+            provider = classify_text(text) if text else None
+            if provider is None and not text:
+                # หน้าสแกน — dpi / ภาษาเดียวกับขั้นแรกของ OCR ladder จึงใช้แคช OCR ร่วมกันได้
+                provider = classify_text(ocr.ocr_page(page, DETECT_DPI, lang="eng+tha"))
+    extractors.log(f"🔎 {os.path.basename(pdf_path)} → {provider or 'ไม่รู้จัก'}")
+    _detected[key] = provider
+    return provider
+
+
+def _detect_one(pdf_path, password=None):
+    jobs.checkpoint()
+    try:
+        return detect_provider(pdf_path, password=password)
+    except Exception as e:
+        extractors.log(f"⚠️ แยกกองทุนไม่ได้ {os.path.basename(pdf_path)}: {e}")
+        return None
+
+
+def detect_files(paths, password=None, workers=None):
+    """{pdf_path: provider หรือ None} — หลายไฟล์กระจายให้ process pool"""
+    workers = workers or extractors.default_workers()
+    if workers <= 1 or len(paths) <= 1:
+        return {pdf_path: _detect_one(pdf_path, password) for pdf_path in paths}
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths)), initializer=extractors._init_worker,
+                             initargs=(extractors.worker_settings(),)) as pool:
+        chunksize = max(1, len(paths) // (workers * 4))
+        found = pool.map(functools.partial(_detect_one, password=password), paths, chunksize=chunksize)
+        return dict(zip(paths, found))
+
+
+def group_files(paths, password=None, workers=None):
+    """คืนค่า ({provider: [pdf_path, ...]}, [ไฟล์ที่ไม่รู้จัก]) ลำดับไฟล์ในแต่ละกลุ่มเหมือนเดิม"""
+    groups, unknown = {}, []
+    for pdf_path, provider in detect_files(paths, password=password, workers=workers).items():
+        if provider:
+            groups.setdefault(provider, []).append(pdf_path)
+        else:
+            unknown.append(pdf_path)
+    return groups, unknown
+
+
+def iter_inbox(groups, password=None, workers=None, on_page=None):
+    """ประมวลผลไฟล์ที่แยกกลุ่มแล้ว คืนค่า (provider, pdf_path, rows, pages) ทีละไฟล์
+
+    แต่ละกลุ่มใช้ตัวสกัดของกองทุนนั้นแบบขนานเหมือนเลือกหน้านั้นเอง (รวมแคชผลลัพธ์)"""
+    for provider in extractors.PROVIDERS:
+        if groups.get(provider):
+            for pdf_path, rows, pages in extractors.iter_provider_files(
+                    provider, groups[provider], password=password, workers=workers, on_page=on_page):
+                yield provider, pdf_path, rows, pages
@@ -1,33 +1,20 @@
 import os
-import re
-import threading
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from tkinter import filedialog, messagebox
-import pdfplumber
-import openpyxl
-from openpyxl.styles import Font, Alignment
-from PIL import Image
-import pytesseract
-import platform
-
-# ตั้ง path tesseract สำหรับ cross-platform
-if platform.system() == "Windows":
-    pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-elif platform.system() == "Darwin":  # macOS
-    # Check common macOS locations
-    possible_paths = ["/opt/homebrew/bin/tesseract", "/usr/local/bin/tesseract", "/usr/bin/tesseract"]
-    for path in possible_paths:
-        if os.path.exists(path):
-            pytesseract.pytesseract.tesseract_cmd = path
-            break
-    # If not found, pytesseract will try to use 'tesseract' from PATH
+from jobbar import JobBar
+from progress import ProgressFeed
+import extractors
+import service
+import sinks
 
 class DaolPage(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.folder_var = ttk.StringVar()
         self.password_var = ttk.StringVar()
+        self.workers_var = ttk.IntVar(value=extractors.default_workers())
+        self.format_var = ttk.StringVar(value="xlsx")
 
         # -------------------- HEADER --------------------
         ttk.Label(self, text="📄 DAOL Tax Invoice Extractor Pro",
@@ -52,16 +39,25 @@ class DaolPage(ttk.Frame):
         password_entry.grid(row=1, column=1, padx=10, pady=5)
         self.create_context_menu(password_entry)
 
+        ttk.Label(frame, text="⚙️ จำนวน process:", font=("Kanit", 10)).grid(row=2, column=0, sticky="w", padx=10, pady=5)
+        ttk.Spinbox(frame, textvariable=self.workers_var, from_=1, to=64, width=6,
+                    bootstyle="info").grid(row=2, column=1, sticky="w", padx=10, pady=5)
+        ttk.Label(frame, text="💾 รูปแบบไฟล์ผลลัพธ์:", font=("Kanit", 10)).grid(row=3, column=0, sticky="w", padx=10, pady=5)
+        ttk.Combobox(frame, textvariable=self.format_var, values=list(sinks.FORMATS), state="readonly", width=8,
+                     bootstyle="info").grid(row=3, column=1, sticky="w", padx=10, pady=5)
+
         # -------------------- PROGRESS + STATUS --------------------
         self.progress_bar = ttk.Progressbar(self, length=500, mode="determinate", bootstyle="info-striped")
         self.progress_bar.pack(pady=10)
 
         self.status_label = ttk.Label(self, text="พร้อมทำงาน", font=("Kanit", 10))
         self.status_label.pack(pady=5)
+        self.feed = ProgressFeed(self, self.progress_bar, self.status_label)
 
         # -------------------- ACTION BUTTON --------------------
-        ttk.Button(self, text="เริ่มประมวลผล", bootstyle="primary", width=20,
-                   command=lambda: threading.Thread(target=self.run_process, daemon=True).start()).pack(pady=10)
+        self.job_bar = JobBar(self, "เริ่มประมวลผล", self.run_process, self.folder_var.get, self.feed,
+                              params=self.read_form, bootstyle="primary", width=20)
+        self.job_bar.pack(pady=10)
 
         ttk.Label(self, text="© 2025 NongAumzaap", foreground="#888",
                   font=("Kanit", 8)).pack(pady=5)
@@ -80,124 +76,67 @@ class DaolPage(ttk.Frame):
         if folder:
             self.folder_var.set(folder)
 
-    # -------------------- MAIN PROCESS --------------------
-    def run_process(self):
-        folder_path = self.folder_var.get()
-        password = self.password_var.get().strip()
+    # -------------------- WORKERS --------------------
+    def get_workers(self):
+        try:
+            return max(1, int(self.workers_var.get()))
+        except Exception:
+            return extractors.default_workers()
+
+    # -------------------- FORM --------------------
+    def read_form(self):
+        """ค่าจากฟอร์ม อ่านใน main loop ตอนกดเริ่ม (งานใน thread ของตัวจัดคิวไม่แตะตัวแปร Tk)"""
+        return {"folder_path": self.folder_var.get(), "password": self.password_var.get().strip(),
+                "fmt": self.format_var.get(), "workers": self.get_workers()}
 
+    # -------------------- SERVICE --------------------
+    def show_remote(self, job):
+        self.feed.update(value=job["done_files"], maximum=job["total_files"],
+                         text=f"🌐 service: {job['status']} ({job['done_files']}/{job['total_files']} ไฟล์)")
+
+    # -------------------- MAIN PROCESS --------------------
+    def run_process(self, folder_path, password, fmt, workers):
         if not folder_path:
-            messagebox.showwarning("แจ้งเตือน", "กรุณาเลือกโฟลเดอร์ก่อน")
+            self.feed.call(messagebox.showwarning, "แจ้งเตือน", "กรุณาเลือกโฟลเดอร์ก่อน")
             return
 
         try:
             files = [f for f in os.listdir(folder_path) if f.lower().endswith(".pdf")]
             total_files = len(files)
             if total_files == 0:
-                messagebox.showwarning("แจ้งเตือน", "ไม่พบไฟล์ PDF ในโฟลเดอร์นี้")
+                self.feed.call(messagebox.showwarning, "แจ้งเตือน", "ไม่พบไฟล์ PDF ในโฟลเดอร์นี้")
+                return
+
+            if service.SERVICE_URL:
+                # ส่งงานให้ service กลาง (FUNDFEE_SERVICE_URL) แทนการประมวลผลในเครื่องนี้
+                output_path = os.path.join(folder_path, sinks.output_name(extractors.PROVIDERS["daol"]["output"], fmt))
+                service.run_remote("extract", output_path, provider="daol", folder=folder_path,
+                                   password=password or None, fmt=fmt, on_progress=self.show_remote)
+                self.feed.finish("✅ เสร็จสิ้น")
+                self.feed.call(messagebox.showinfo, "สำเร็จ", f"บันทึกไฟล์เรียบร้อย:\n{output_path}")
                 return
 
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "PDF Data"
-
-            headers = ["ลำดับ", "เลขที่", "วันที่", "Unitholder No.", "ชื่อกองทุน", "Fee", "VAT", "total fee"]
-            ws.append(headers)
-            for col in range(1, len(headers)+1):
-                ws.cell(row=1, column=col).font = Font(bold=True)
-
-            self.progress_bar["maximum"] = total_files
-            self.progress_bar["value"] = 0
-            self.status_label.config(text="เริ่มประมวลผล...")
-
-            index = 1
-            for filename in files:
-                pdf_path = os.path.join(folder_path, filename)
-                self.status_label.config(text=f"กำลังประมวลผลไฟล์ {index}/{total_files}: {filename}")
-                self.update_idletasks()
-
-                data = self.extract_info_from_pdf(pdf_path, password=password)
-                ws.append([
-                    index,
-                    data["เลขที่"],
-                    data["วันที่"],
-                    data["Unitholder No."],
-                    data["ชื่อกองทุน"],
-                    data["Fee"],
-                    data["VAT"],
-                    data["total fee"]
-                ])
-                ws.cell(row=index+1, column=1).alignment = Alignment(horizontal="center")
-
-                index += 1
-                self.progress_bar["value"] += 1
-                self.update_idletasks()
-
-            output_path = os.path.join(folder_path, "TaxInvoiceDaol.xlsx")
-            wb.save(output_path)
-            self.status_label.config(text="✅ เสร็จสิ้น")
-            messagebox.showinfo("สำเร็จ", f"บันทึกไฟล์เรียบร้อย:\n{output_path}")
+            self.feed.start(total_files, unit="ไฟล์")
+
+            paths = [os.path.join(folder_path, f) for f in files]
+            results = extractors.iter_files(extractors.process_daol_file, paths, password=password,
+                                            workers=workers, provider="daol")
+            provider = extractors.PROVIDERS["daol"]
+            output_path = os.path.join(folder_path, sinks.output_name(provider["output"], fmt))
+            with sinks.open_sink(output_path, fmt, provider["sheet"]) as sink:
+                for pdf_path, rows, _ in results:
+                    sink.write(rows[0])
+
+                    self.feed.update(value=sink.count,
+                                     text=f"ประมวลผลแล้ว {sink.count}/{total_files}: {os.path.basename(pdf_path)}")
+
+            self.feed.finish("✅ เสร็จสิ้น")
+            self.feed.call(messagebox.showinfo, "สำเร็จ", f"บันทึกไฟล์เรียบร้อย:\n{output_path}")
 
         except Exception as e:
-            messagebox.showerror("ข้อผิดพลาด", str(e))
-            self.status_label.config(text="❌ เกิดข้อผิดพลาด")
+            self.feed.call(messagebox.showerror, "ข้อผิดพลาด", str(e))
+            self.feed.finish("❌ เกิดข้อผิดพลาด")
 
     # -------------------- PDF EXTRACTION --------------------
     def extract_info_from_pdf(self, pdf_path, password=None):
-        data = {"เลขที่": "", "วันที่": "", "Unitholder No.": "", "ชื่อกองทุน": "", "Fee": "", "VAT": "", "total fee": ""}
-        full_text = ""
-
-        try:
-            with pdfplumber.open(pdf_path, password=password) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        full_text += text + "\n"
-
-                # ✅ OCR fallback
-                if ("cid" in full_text or "Fund Name" not in full_text):
-                    page = pdf.pages[0]
-                    img = page.to_image(resolution=150).original
-                    ocr_text = pytesseract.image_to_string(img, lang="eng+tha")
-                    full_text += "\n" + ocr_text
-        except Exception as e:
-            print(f"❌ ไม่สามารถเปิดไฟล์: {pdf_path}\n{e}")
-            return data
-
-        # 🔎 ดึงเลขที่
-        m = re.search(r"(?:ใบกำกับภาษีเลขที่|Tax Invoice No\.?)\s*[:\-]?\s*([A-Za-z0-9\-]+)", full_text)
-        if m: data["เลขที่"] = m.group(1)
-
-        # 🔎 วันที่
-        m = re.search(r"(?:วันที่จัดสรรหน่วย|Allocation Date).*?(\d{2}-\d{2}-\d{4})", full_text)
-        if m:
-            data["วันที่"] = m.group(1).replace("-", "/")
-
-        # 🔎 Unitholder No.
-        m = re.search(r"(?:Unitholder\s*No\.?|ลขที่ผู้ถือหน่วยลงทุน).*?:\s*([0-9A-Za-z]+)", full_text)
-        if m: data["Unitholder No."] = m.group(1)
-
-        # 🔎 ชื่อกองทุน
-        match = re.search(r"\(DAOL-[A-Z0-9\-\s\S]*?R\)", full_text)
-        if not match:
-            match = re.search(r"\(DAOL-[A-Z0-9\-]+\)", full_text)
-        if match:
-            cleaned = match.group(0).replace(" ", "").replace("\n", "").strip("()")
-            cleaned = re.sub(r"มูลค่าหน่วยลงทุน\d*\.?\d*บาท", "", cleaned)
-            data["ชื่อกองทุน"] = cleaned
-
-        # 🔎 ค่าธรรมเนียม
-        lines = [l.strip() for l in full_text.splitlines() if l.strip()]
-        start_idx = None
-        for i, line in enumerate(lines):
-            if re.search(r"Fee", line, re.IGNORECASE) or "ค่าธรรม" in line:
-                start_idx = i
-                break
-        if start_idx is not None:
-            numbers = []
-            for j in range(start_idx, min(start_idx + 15, len(lines))):
-                m = re.search(r"([\d,]+\.\d{2})", lines[j])
-                if m:
-                    numbers.append(m.group(1))
-            if len(numbers) >= 3:
-                data["Fee"], data["VAT"], data["total fee"] = numbers[:3]
-        return data
+        return extractors.extract_daol_pdf(pdf_path, password=password)
@@ -0,0 +1,820 @@
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+import cidfonts
+import jobs
+import matching
+import ocr
+import regions
+import unlock
+import validate
+
+# โมดูลสกัดข้อมูลที่ไม่ขึ้นกับ Tk ใช้ร่วมกันทั้งหน้า GUI และ CLI (fundfee.py)
+# import pdfplumber ไว้ในฟังก์ชันเพื่อให้ CLI เริ่มทำงานได้เร็ว (เปิดไฟล์ผ่าน unlock.open_plumber)
+
+HEADERS = ["ลำดับ", "เลขที่", "วันที่", "Unitholder No.", "ชื่อกองทุน", "Fee", "VAT", "total fee"]
+FIELDS = HEADERS[1:]
+
+# ปิดได้จาก CLI เพื่อไม่ให้ Raw Text ท่วม console
+VERBOSE = True
+
+
+def log(*args):
+    if VERBOSE:
+        print(*args)
+
+
+def empty_row():
+    return {field: "" for field in FIELDS}
+
+
+def error_row(e):
+    row = empty_row()
+    row["เลขที่"] = f"ERROR: {str(e)[:50]}"
+    return row
+
+
+def row_values(index, data):
+    return [index] + [data.get(field, "") or "" for field in FIELDS]
+
+
+def list_pdfs(folder_path):
+    return [f for f in os.listdir(folder_path) if f.lower().endswith(".pdf")]
+
+
+def print_raw_text(text, limit=3000):
+    if len(text) > limit:
+        log(text[:limit])
+        log(f"\n... (ตัดทอน ยังมีอีก {len(text) - limit} ตัวอักษร) ...")
+    else:
+        log(text)
+
+
+# จำนวนหน้าที่นับแล้ว แคชตาม (path, size, mtime, รหัสผ่าน) เหมือน unlock.resolve
+_page_counts = {}
+
+
+def read_page_count(pdf_path, password=None):
+    """จำนวนหน้าจาก /Count ของ page tree (ไม่ parse เนื้อหาหน้า) แคชต่อไฟล์"""
+    key = unlock.resolved_key(pdf_path, password)
+    if key not in _page_counts:
+        from PyPDF2 import PdfReader
+
+        reader = PdfReader(pdf_path, strict=False)
+        if reader.is_encrypted:
+            # decrypt แค่คำนวณ key ไม่ได้ถอดรหัสทั้งไฟล์ (ลองทุกรหัสที่ให้มา)
+            unlock.decrypt_reader(reader, password, os.path.basename(pdf_path))
+        _page_counts[key] = int(reader.trailer["/Root"]["/Pages"]["/Count"])
+    return _page_counts[key]
+
+
+def count_pages(pdf_path, password=None):
+    """ใช้กะขนาด progress bar เท่านั้น นับไม่ได้คืนค่า 1"""
+    try:
+        return max(1, read_page_count(pdf_path, password=password))
+    except Exception:
+        return 1
+
+
+# ==================== OCR LADDER ====================
+# OCR ที่ dpi ต่ำก่อน ถ้าแถวที่สกัดได้ไม่ผ่าน validate (ฟิลด์ไม่ครบ / Fee + VAT ≠ total / VAT ไม่ใช่ 7%)
+# ค่อย render ใหม่ที่ dpi ถัดไป — หน้าที่ชัดอยู่แล้วจ่ายแค่ขั้นแรก
+OCR_LADDERS = {
+    "daol": (150, 300),
+    "scbam": (200, 300, 400),
+    "eastspring": (150, 200, 300),
+    "assetfund": (150, 200, 300),
+}
+
+# บันทึก dpi ที่ใช้ได้จริงของแต่ละหน้า (JSON lines ในโฟลเดอร์แคช) ไว้ปรับ OCR_LADDERS
+# สรุปด้วย: python -m fundfee dpi-stats
+DPI_LOG_ENABLED = os.environ.get("FUNDFEE_NO_DPI_LOG", "") == ""
+
+
+def dpi_log_path():
+    from cache import cache_dir
+
+    return os.path.join(cache_dir(), "ocr_dpi.jsonl")
+
+
+def record_dpi(provider, pdf_path, page_num, dpi, ok):
+    if not DPI_LOG_ENABLED:
+        return
+    entry = {"provider": provider, "file": os.path.basename(pdf_path or ""), "page": page_num,
+             "dpi": dpi, "ok": ok, "time": int(time.time())}
+    try:
+        # เขียนบรรทัดเดียวต่อครั้งแบบ append → หลาย process เขียนพร้อมกันได้
+        with open(dpi_log_path(), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError as e:
+        log(f"⚠️ บันทึก dpi ไม่ได้: {e}")
+
+
+def dpi_stats(path=None):
+    """{provider: {dpi: [ผ่าน, ไม่ผ่าน]}} จากบันทึก dpi"""
+    stats = {}
+    path = path or dpi_log_path()
+    if not os.path.exists(path):
+        return stats
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            counts = stats.setdefault(entry["provider"], {}).setdefault(entry["dpi"], [0, 0])
+            counts[0 if entry["ok"] else 1] += 1
+    return stats
+
+
+def ocr_ladder(page, provider, parse, pdf_path=None, page_num=None, **ocr_kwargs):
+    """OCR ไล่ dpi ตาม OCR_LADDERS[provider] จนแถวที่ parse(text) ได้ผ่าน validate
+    ไม่ผ่านเลยใช้ผลที่มีปัญหาน้อยที่สุด (เท่ากันใช้ dpi สูงกว่า) คืนค่า (text, data)"""
+    best = None
+    for dpi in OCR_LADDERS[provider]:
+        text = ocr.ocr_page(page, resolution=dpi, **ocr_kwargs)
+        data = parse(text)
+        problems = validate.validate_row(data)
+        if best is None or len(problems) <= len(best[3]):
+            best = (dpi, text, data, problems)
+        if not problems:
+            break
+        log(f"🔁 OCR {dpi} dpi ไม่ผ่าน ({', '.join(problems)})")
+    dpi, text, data, problems = best
+    record_dpi(provider, pdf_path, page_num, dpi, not problems)
+    return text, data
+
+
+# ==================== DAOL ====================
+def read_daol_text(pdf_path, password=None):
+    """คืนค่า (full_text, จำนวนหน้า) ของไฟล์ DAOL พร้อม OCR fallback ที่หน้าแรก"""
+    full_text = ""
+    with unlock.open_plumber(pdf_path, password=password) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()
+            if text and "(cid:" in text:
+                # ฟอนต์ไม่มี ToUnicode → ถอดด้วยตาราง CID ของฟอนต์นั้นก่อน (ไม่ต้อง OCR)
+                text = cidfonts.decode_page(page) or text
+            if text:
+                full_text += text + "\n"
+
+        # ✅ OCR fallback (ยังเหลือ cid ที่ถอดไม่ได้ หรือไม่เจอ Fund Name)
+        if ("cid" in full_text or "Fund Name" not in full_text):
+            text_layer = full_text
+            ocr_text, _ = ocr_ladder(pdf.pages[0], "daol",
+                                     lambda t: extract_daol_text(text_layer + "\n" + t),
+                                     pdf_path=pdf_path, page_num=1, lang="eng+tha")
+            full_text += "\n" + ocr_text
+        return full_text, len(pdf.pages)
+
+
+def extract_daol_pdf(pdf_path, password=None):
+    """แถวของ DAOL หนึ่งไฟล์ เปิดไม่ได้ได้แถว ERROR (ไม่ใช่แถวว่าง)"""
+    try:
+        full_text, _ = read_daol_text(pdf_path, password=password)
+    except Exception as e:
+        log(f"❌ ไม่สามารถเปิดไฟล์: {pdf_path}\n{e}")
+        return error_row(e)
+    return extract_daol_text(full_text)
+
+
+def daol_fund_name(raw):
+    cleaned = raw.replace(" ", "").replace("\n", "").strip("()")
+    return re.sub(r"มูลค่าหน่วยลงทุน\d*\.?\d*บาท", "", cleaned)
+
+
+DAOL_RULES = [
+    # 🔎 ดึงเลขที่
+    matching.find(r"(?:ใบกำกับภาษีเลขที่|Tax Invoice No\.?)\s*(?:[:\-]\s*)?([A-Za-z0-9\-]+)", "เลขที่"),
+    # 🔎 วันที่
+    matching.find(r"(?:วันที่จัดสรรหน่วย|Allocation Date).{0,300}?(\d{2}-\d{2}-\d{4})", "วันที่",
+                  clean=lambda v: v.replace("-", "/")),
+    # 🔎 Unitholder No.
+    matching.find(r"(?:Unitholder\s*No\.?|ลขที่ผู้ถือหน่วยลงทุน).{0,300}?:\s*([0-9A-Za-z]+)", "Unitholder No."),
+    # 🔎 ชื่อกองทุน
+    matching.find([r"\(DAOL-[\s\S]{0,300}?R\)", r"\(DAOL-[A-Z0-9\-]+\)"], "ชื่อกองทุน", group=0,
+                  clean=daol_fund_name),
+    # 🔎 ค่าธรรมเนียม: 3 จำนวนแรกภายใน 15 บรรทัดนับจากบรรทัดแรกที่มี Fee / ค่าธรรม
+    matching.amount_block(r"Fee|ค่าธรรม", span=15),
+]
+
+
+def extract_daol_text(full_text):
+    return matching.match(DAOL_RULES, full_text)
+
+
+def process_daol_file(pdf_path, password=None, on_page=None):
+    """DAOL หนึ่งไฟล์ = หนึ่งแถว เปิดไม่ได้ (รหัสผ่านผิด / OCR ไม่ได้) ได้แถว ERROR (ไม่ถูกเก็บในแคชผลลัพธ์)"""
+    jobs.checkpoint()
+    try:
+        full_text, pages = read_daol_text(pdf_path, password=password)
+        data = extract_daol_text(full_text)
+    except Exception as e:
+        log(f"❌ ไม่สามารถเปิดไฟล์: {pdf_path}\n{e}")
+        data, pages = error_row(e), 1
+    if on_page:
+        on_page(pages, pages)
+    return [data], pages
+
+
+# ==================== SCBAM ====================
+def scbam_needs_ocr(text):
+    return not text or "Fund" not in text
+
+
+def scbam_page_row(page, page_num, pdf_path=None):
+    text = page.extract_text() or ""
+    data = None
+    if scbam_needs_ocr(text):
+        # หน้าสแกน → OCR เฉพาะบริเวณที่มีข้อมูลก่อน ผ่าน validate แล้วไม่ต้อง OCR ทั้งหน้า
+        data = regions.extract_fields(page, "scbam")
+        if data is not None:
+            log(">> ROI OCR PAGE", page_num, data)
+            return data
+
+        # OCR fallback
+        custom_config = r"--oem 3 --psm 6 -c preserve_interword_spaces=1"
+        text, data = ocr_ladder(page, "scbam", extract_scbam_text, pdf_path=pdf_path, page_num=page_num,
+                                lang="eng+tha", config=custom_config, preprocess=ocr.preprocess_scb)
+
+    # 🟣 PRINT RAW TEXT ก่อน extract
+    log("\n\n================ RAW TEXT PAGE", page_num, "================")
+    log(text)
+    log("====================================================\n\n")
+
+    return data if data is not None else extract_scbam_text(text)
+
+
+def process_scbam_file(pdf_path, password=None, on_page=None, workers=1):
+    """SCBAM หนึ่งหน้า = หนึ่งแถว ข้อผิดพลาดของไฟล์ส่งต่อให้ผู้เรียก (เช่นรหัสผ่านผิด)
+
+    workers>1 แบ่งหน้าให้หลาย process (ดู iter_scbam_pages)
+    """
+    rows = []
+    if workers and workers > 1:
+        total_pages = 0
+        for i, total_pages, data in iter_scbam_pages(pdf_path, password=password, workers=workers):
+            rows.append(data)
+            if on_page:
+                on_page(i, total_pages)
+        return rows, total_pages
+
+    with unlock.open_plumber(pdf_path, password=password) as pdf:
+        total_pages = len(pdf.pages)
+        for i, page in enumerate(pdf.pages, start=1):
+            jobs.checkpoint()
+            rows.append(scbam_page_row(page, i, pdf_path))
+            if on_page:
+                on_page(i, total_pages)
+    return rows, total_pages
+
+
+def process_scbam_range(pdf_path, start, stop, password=None):
+    """ประมวลผลหน้า start..stop-1 (0-based) — ทำงานใน worker ของโหมดแบ่งหน้า"""
+    pages = list(range(start + 1, stop + 1))
+    rows = []
+    with unlock.open_plumber(pdf_path, password=password, pages=pages) as pdf:
+        for page in pdf.pages:
+            jobs.checkpoint()
+            rows.append(scbam_page_row(page, page.page_number, pdf_path))
+    return rows
+
+
+def page_ranges(total_pages, workers, per_worker=4):
+    """แบ่งหน้าเป็นช่วงต่อเนื่องไม่ทับกัน ประมาณ per_worker ช่วงต่อ worker
+    (ช่วงเล็กลงช่วยให้หน้าที่ต้อง OCR กระจายไปทุก worker ไม่กองอยู่ที่ worker เดียว)"""
+    chunk = max(1, -(-total_pages // (workers * per_worker)))
+    return [(start, min(start + chunk, total_pages)) for start in range(0, total_pages, chunk)]
+
+
+def iter_scbam_pages(pdf_path, password=None, workers=None):
+    """โหมดแบ่งหน้า: worker แต่ละตัวเปิดไฟล์เดียวกันแล้วทำช่วงหน้าของตัวเอง
+    คืนค่า (page_num, total_pages, data) เรียงตามหน้าทันทีที่ช่วงก่อนหน้าเสร็จ"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or default_workers()
+    try:
+        total_pages = read_page_count(pdf_path, password=password)
+    except Exception:
+        with unlock.open_plumber(pdf_path, password=password) as pdf:
+            total_pages = len(pdf.pages)
+    ranges = page_ranges(total_pages, workers)
+    if not ranges:
+        return
+    # ถอดรหัสครั้งเดียวที่นี่ก่อน ไม่ให้ทุก worker ถอดไฟล์เดียวกันพร้อมกัน
+    unlock.resolve(pdf_path, password)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)),
+                             initializer=_init_worker, initargs=(worker_settings(),)) as pool:
+        futures = [pool.submit(process_scbam_range, pdf_path, start, stop, password)
+                   for start, stop in ranges]
+        for (start, _), future in zip(ranges, futures):
+            for offset, data in enumerate(future.result()):
+                yield start + offset + 1, total_pages, data
+
+
+# ---------- block ค่าธรรมเนียม: Fund Supervisor / Fee (VAT Excluded) → Fee (VAT Included) หรือ Brokerage Fee ----------
+SCBAM_FEE_START = re.compile(r"Fund\s+Supervisor|(Fee\s*\()?(V|W)AT\s*Excluded", re.IGNORECASE)
+SCBAM_FEE_END = re.compile(r"(Fee\s*\()?(V|W)AT\s*Included", re.IGNORECASE)
+SCBAM_BROKER = re.compile(r"Brokerage\s*Fee", re.IGNORECASE)
+SCBAM_VAT_HINT = re.compile(r"\bVAT\b", re.IGNORECASE)
+SCBAM_INT = re.compile(r"\b(\d{3,7})\b")
+
+
+def scbam_fees(page, data, values):
+    fee_start = None
+    fee_end = None
+    idx_broker = None
+
+    for idx, line in enumerate(page.lines):
+        # normalize เล็กน้อยให้ทน OCR เพี้ยน
+        norm = line.replace("Exctuded", "Excluded").replace("Exduded", "Excluded")
+
+        # เริ่ม block จาก Fund Supervisor หรือ Fee (VAT Excluded)
+        if fee_start is None and SCBAM_FEE_START.search(norm):
+            fee_start = idx
+        # จบ block ที่ Fee (VAT Included) ถ้ามี
+        if SCBAM_FEE_END.search(norm):
+            fee_end = idx
+        # เก็บตำแหน่ง Brokerage Fee ไว้ใช้เป็น fallback
+        if idx_broker is None and SCBAM_BROKER.search(norm):
+            idx_broker = idx
+
+    # ถ้าไม่เจอ Included แต่มี Brokerage Fee → ใช้มันเป็นจุดจบ block
+    if fee_start is not None and fee_end is None and idx_broker is not None and idx_broker > fee_start:
+        fee_end = idx_broker
+
+    vat_val = None
+    all_nums = []
+
+    if fee_start is not None and fee_end is not None and fee_end >= fee_start:
+        for idx in range(fee_start, fee_end + 1):
+            line = page.lines[idx]
+            tokens = page.amounts(idx)
+            has_vat_hint = ("(7%)" in line) or SCBAM_VAT_HINT.search(line)
+
+            if tokens:
+                # ถ้าเป็นบรรทัด VAT ให้ใช้ตัวแรกเป็น VAT
+                if has_vat_hint and vat_val is None:
+                    vat_val = tokens[0][1]
+                # เก็บทุกตัวเข้ารวม
+                all_nums.extend(value for _, value in tokens)
+            elif has_vat_hint and vat_val is None:
+                # ไม่มีทศนิยมแต่เป็นบรรทัด VAT (เช่น 51688) → แปลงเป็น x/100
+                m_int = SCBAM_INT.search(line)
+                if m_int:
+                    vat_val = int(m_int.group(1)) / 100.0
+                    all_nums.append(vat_val)
+
+    # ---------- ตรรกะเลือก Fee / VAT / total fee ----------
+    fee_val = None
+    total_val = None
+
+    if all_nums:
+        total_val = max(all_nums)
+
+    # เคสปกติ: ถ้ามีทั้ง VAT และ Total → คำนวน Fee จากส่วนต่าง
+    if vat_val is not None and total_val is not None:
+        fee_val = round(total_val - vat_val, 2)
+
+    # ถ้ายังไม่มี VAT แต่มี hint ว่ามีบรรทัด VAT และมีเลขอย่างน้อย 2 ตัว
+    if (vat_val is None or fee_val is None) and all_nums:
+        # สมมติว่า "ค่าธรรมเนียมก่อน VAT" คือเลขที่น้อยที่สุดใน block
+        fee_guess = min(all_nums)
+        total_guess = max(all_nums)
+        if total_guess > fee_guess:
+            fee_val = fee_guess
+            vat_val = round(total_guess - fee_guess, 2)
+            total_val = total_guess
+
+    # Fallback เดิม: ถ้ามีเลข ≥ 3 ตัวและยังไม่ได้ set อะไร
+    if (fee_val is None or total_val is None) and len(all_nums) >= 3:
+        fee_val = all_nums[0] if fee_val is None else fee_val
+        if vat_val is None:
+            vat_val = all_nums[1]
+        if total_val is None:
+            total_val = all_nums[2]
+
+    # ---------- format กลับเป็น string (รวมค่า 0 / ติดลบตามเดิม) ----------
+    if fee_val is not None:
+        data["Fee"] = validate.fmt(fee_val)
+    if vat_val is not None:
+        data["VAT"] = validate.fmt(vat_val)
+    if total_val is not None:
+        data["total fee"] = validate.fmt(total_val)
+
+
+def fix_oq(value):
+    # แก้ OCR เพี้ยน: Q / O -> 0
+    return value.replace("O", "0").replace("Q", "0").strip()
+
+
+SCBAM_RULES = [
+    # ---------- วันที่: ใช้ dd/mm/yyyy ตัวแรก ----------
+    matching.find(r"\b([0-9]{1,2}/[0-9]{1,2}/[0-9]{4})\b", "วันที่"),
+    # ---------- จับคู่ Unitholder No. + Client No. (เลขที่) ----------
+    # รูปแบบประมาณ: 000-0-1872560-3 .... 0009910902 (. ข้ามบรรทัดได้)
+    matching.find(r"([0-9OQ]{3}-[0-9]-[0-9]{7}-[0-9]).{0,80}?([0-9]{6,12})", flags=re.S,
+                  fields={"Unitholder No.": 1, "เลขที่": 2},
+                  clean={"Unitholder No.": fix_oq, "เลขที่": str.strip}),
+    # Fallback แยกจับ ถ้าคู่ไม่เจอ: Unitholder No. = เลขแบบมีขีด 000-0-2540211-7
+    matching.find(r"\b[0-9OQ]{3}-[0-9]-[0-9]{7}-[0-9]\b", "Unitholder No.", group=0, clean=fix_oq),
+    # เลขที่ = ตัวเลขล้วน 6–12 หลัก ที่อยู่หลังข้อความประมาณ Xxxxx/Xxxxx 0010106785
+    matching.near(r"/", r"(?<=[^0-9\s]{3})/[^0-9\s]{3,}\s*([0-9]{6,12})", "เลขที่", before=60, after=80,
+                  clean=str.strip),
+    # ---------- Fund Code (ชื่อกองทุน): (SCBUSAA) แล้วตามด้วยบรรทัด Fund Name ----------
+    matching.find(r"\(([A-Z0-9]{3,})\)[^\S\r\n]*[\r\n]\s*Fund\s*Name", "ชื่อกองทุน", flags=re.IGNORECASE,
+                  clean=str.strip),
+    matching.compute(scbam_fees),
+]
+
+
+def extract_scbam_text(text: str):
+    data = matching.match(SCBAM_RULES, text)
+    log(">> EXTRACTED DATA:", data)
+    return data
+
+
+# ==================== PAGE-PER-ROW (Eastspring / Asset Fund) ====================
+def page_needs_ocr(text):
+    return not text or len(text.strip()) < 50
+
+
+def process_pages(pdf_path, extract, provider, password=None, on_page=None, show_raw=False):
+    """ประมวลผลทุกหน้าในไฟล์ หน้าที่พังได้แถว ERROR ไฟล์ที่เปิดไม่ได้ได้แถว ERROR หนึ่งแถว"""
+    filename = os.path.basename(pdf_path)
+    rows = []
+    try:
+        with unlock.open_plumber(pdf_path, password=password) as pdf:
+            total_pages_file = len(pdf.pages)
+
+            for page_num, page in enumerate(pdf.pages, 1):
+                jobs.checkpoint()
+                try:
+                    # อ่านข้อความจากหน้า
+                    text = page.extract_text() or ""
+                    data = None
+                    if page_needs_ocr(text):
+                        # หน้าสแกน → OCR เฉพาะบริเวณที่มีข้อมูลก่อน ผ่าน validate แล้วไม่ต้อง OCR ทั้งหน้า
+                        data = regions.extract_fields(page, provider)
+                        if data is not None:
+                            log(f"📄 ไฟล์: {filename} | หน้า: {page_num}/{total_pages_file} | ROI OCR: {data}")
+                            rows.append(data)
+                            if on_page:
+                                on_page(page_num, total_pages_file)
+                            continue
+
+                        # OCR fallback ไล่ dpi
+                        try:
+                            text, data = ocr_ladder(
+                                page, provider, functools.partial(extract, pdf_path=pdf_path, page_num=page_num),
+                                pdf_path=pdf_path, page_num=page_num, lang="eng+tha")
+                        except Exception as e:
+                            # OCR ไม่ได้ (ไม่มี tesseract ฯลฯ) → แถว ERROR ไม่ใช่แถวว่าง ให้รอบหน้าลองใหม่
+                            log(f"⚠️ OCR หน้า {page_num} ของไฟล์ {filename} ไม่ได้: {e}")
+                            data = error_row(e)
+
+                    if show_raw:
+                        # แสดง Raw Text ก่อน
+                        log("\n" + "-"*100)
+                        log(f"📄 ไฟล์: {filename} | หน้า: {page_num}/{total_pages_file}")
+                        log("-"*100)
+                        print_raw_text(text)
+                        log("-"*100 + "\n")
+
+                    rows.append(data if data is not None else extract(text, pdf_path=pdf_path, page_num=page_num))
+                except Exception as page_error:
+                    log(f"⚠️ เกิดข้อผิดพลาดกับหน้า {page_num} ของไฟล์ {filename}: {str(page_error)}")
+                    rows.append(error_row(page_error))
+
+                if on_page:
+                    on_page(page_num, total_pages_file)
+            return rows, total_pages_file
+
+    except Exception as e:
+        log(f"⚠️ เกิดข้อผิดพลาดกับไฟล์ {filename}: {str(e)}")
+        if on_page:
+            on_page(1, 1)
+        return [error_row(e)], 1
+
+
+# ==================== EASTSPRING ====================
+def dash_to_slash(value):
+    return value.replace("-", "/")
+
+
+# ค่าธรรมเนียม: บรรทัดที่ 16 total fee (ซ้าย) / VAT (ขวา), บรรทัดที่ 17 Fee → คำค้น → เดาจากตัวเลขทั้งหมด
+EASTSPRING_RULES = [
+    # 🔎 เลขที่ (Tax Invoice No.) - รูปแบบ T-I11-202509300000353 (14-20 หลัก) → ยืดหยุ่น 8-20 หลัก
+    matching.find([r"(T-I\d{1,2}-\d{14,20})", r"(T-I\d{1,2}-\d{8,20})"], "เลขที่"),
+    # มีช่องว่างแทนขีด
+    matching.find(r"(T-I\d{1,2}[- ]\d{8,20})", "เลขที่", clean=lambda v: v.replace(" ", "-")),
+    # Fallback: หาเลขที่รูปแบบอื่น
+    matching.find([
+        r"(?:ใบกำกับภาษีเลขที่|Tax Invoice No\.?|Invoice No\.?)\s*(?:[:\-]\s*)?([A-Za-z0-9\-]{10,30})",
+        r"(?:Invoice\s*No\.?|เลขที่)\s*([A-Za-z0-9\-]{10,30})",
+        r"([A-Z]-\w+-\d{8,20})",  # รูปแบบทั่วไป (8-20 หลัก)
+        r"(T-I\d{1,2}[- ]?\d{8,20})",  # อาจมีช่องว่างแทนขีด
+    ], "เลขที่", flags=re.IGNORECASE, clean=lambda v: re.sub(r"\s+", "-", v.strip())),
+    # 🔎 วันที่ - รูปแบบ 26/09/2025 หรือ 26-09-2025
+    matching.find(r"(\d{2}/\d{2}/\d{4})", "วันที่"),
+    matching.find(r"(\d{2}-\d{2}-\d{4})", "วันที่", clean=dash_to_slash),
+    # 🔎 Unitholder No. - รูปแบบ 804-0-01209-1
+    matching.find([r"(\d{3}-\d-\d{5}-\d)",
+                   r"(?:Unitholder\s*No\.?|ลขที่ผู้ถือหน่วยลงทุน).{0,300}?:\s*([0-9\-]+)"], "Unitholder No."),
+    # 🔎 ชื่อกองทุน - ทั้งบรรทัดที่ 9
+    matching.line_at("ชื่อกองทุน", 8),
+    # 🔎 ค่าธรรมเนียม
+    matching.line_amounts(15, {1: {"total fee": 0}, 2: {"total fee": 0, "VAT": -1}}, min_lines=17),
+    matching.line_amounts(16, {1: {"Fee": 0}}, min_lines=18),
+    matching.labelled("Fee", r"Fee|ค่าธรรม"),
+    matching.labelled("VAT", r"VAT|ภาษี|V\.A\.T"),
+    matching.labelled("total fee", r"total|รวม|Total"),
+    matching.guess_amounts(),
+    # ตรวจสอบความถูกต้อง: total fee = Fee + VAT
+    matching.reconcile_total(),
+]
+
+
+def extract_eastspring_text(full_text, pdf_path=None, page_num=None, index=None):
+    data = matching.match(EASTSPRING_RULES, full_text)
+
+    # 🖨️ แสดง Raw Text และข้อมูลที่สกัดได้ใน console
+    log("\n" + "="*80)
+    if pdf_path:
+        log(f"📄 ไฟล์: {os.path.basename(pdf_path)}")
+    if page_num:
+        log(f"📑 หน้า: {page_num}")
+    if index is not None:
+        log(f"ลำดับ: {index}")
+    log("="*80)
+
+    # แสดง Raw Text
+    log("\n📝 Raw Text:")
+    log("-" * 80)
+    # แสดง raw text เต็มๆ หรือตัดทอนถ้ายาวเกินไป
+    if len(full_text) > 3000:
+        log(full_text[:3000])
+        log(f"\n... (ตัดทอน ยังมีอีก {len(full_text) - 3000} ตัวอักษร) ...")
+    else:
+        log(full_text)
+    log("-" * 80)
+
+    # แสดงข้อมูลที่สกัดได้
+    log("\n📊 ข้อมูลที่สกัดได้:")
+    log("-" * 80)
+    log(f"เลขที่: {data['เลขที่'] if data['เลขที่'] else '(ไม่พบ)'}")
+    log(f"วันที่: {data['วันที่'] if data['วันที่'] else '(ไม่พบ)'}")
+    log(f"Unitholder No.: {data['Unitholder No.'] if data['Unitholder No.'] else '(ไม่พบ)'}")
+    log(f"ชื่อกองทุน: {data['ชื่อกองทุน'] if data['ชื่อกองทุน'] else '(ไม่พบ)'}")
+    log(f"Fee: {data['Fee'] if data['Fee'] else '(ไม่พบ)'}")
+    log(f"VAT: {data['VAT'] if data['VAT'] else '(ไม่พบ)'}")
+    log(f"total fee: {data['total fee'] if data['total fee'] else '(ไม่พบ)'}")
+    log("="*80 + "\n")
+
+    return data
+
+
+def process_eastspring_file(pdf_path, password=None, on_page=None):
+    return process_pages(pdf_path, extract_eastspring_text, "eastspring", password=password, on_page=on_page)
+
+
+# ==================== ASSET FUND ====================
+def clean_assetfund_invoice(value):
+    # ตัด "Tax Invoice No" ออกถ้ายังมีอยู่ แล้วแทนที่ช่องว่างหลายตัวด้วยช่องว่างเดียว
+    value = re.sub(r"\s+Tax\s+Invoice\s+No.*$", "", value.strip(), flags=re.IGNORECASE)
+    return re.sub(r"\s+", " ", value).strip()
+
+
+ASSETFUND_RULES = [
+    # 🔎 เลขที่ (Invoice No.) เช่น ASP-DIGIBLOC-CF-20250028635, ASP-DAPP 3M2-CF-20250000309
+    # ไม่เอา "Tax Invoice No" ที่ต่อท้าย
+    matching.find([
+        r"ใบกำกับภาษี\s*เลขที่\s*(?:[:\-]\s*)?([A-Za-z0-9\s\-]{1,80}?)(?:\s+Tax\s+Invoice\s+No|$)",
+        r"(?:Invoice\s*No\.?|เลขที่|Tax\s+Invoice\s+No\.?)\s*(?:[:\-]\s*)?([A-Za-z0-9\s\-]{1,80}?)"
+        r"(?:\s+Tax\s+Invoice\s+No|$)",
+        r"(?<![A-Z])([A-Z]{2,}-[A-Z0-9\s]+-CF-\d{11})(?:\s+Tax\s+Invoice\s+No|$)",
+        r"(?<![A-Z])([A-Z]{2,}-[A-Z0-9]+-CF-\d{11})(?:\s+Tax\s+Invoice\s+No|$)",
+        r"(?<![A-Z])([A-Z]{2,}-[A-Z0-9\s]+-CF-\d{11})",
+        r"(?<![A-Z])([A-Z]{2,}-[A-Z0-9]+-CF-\d{11})",
+        r"(?<![A-Z])([A-Z]{2,}-\d{4,}-\d{6,})",
+    ], "เลขที่", flags=re.IGNORECASE, clean=clean_assetfund_invoice),
+    # 🔎 วันที่ - รูปแบบ dd/mm/yyyy หรือ dd-mm-yyyy
+    matching.find(r"(\d{2}[/-]\d{2}[/-]\d{4})", "วันที่", clean=dash_to_slash),
+    # 🔎 Unitholder No. - "เลขบัญชีผู้ถือหน่วยลงทุน" ตามด้วยตัวเลข 12 หลัก → 000-0-00000-0 → คำว่า Unitholder
+    matching.find([r"เลขบัญชีผู้ถือหน่วยลงทุน\s+(\d{12})", r"(\d{3}-\d-\d{5,7}-\d)"], "Unitholder No."),
+    matching.find(r"(?:Unitholder\s*No\.?|เลขที่ผู้ถือหน่วยลงทุน).{0,300}?:\s*([0-9\-]+)", "Unitholder No.",
+                  flags=re.IGNORECASE),
+    # 🔎 ชื่อกองทุน - รหัสในวงเล็บ เช่น ชื่อกองทุน : กองทุนเปิด แอสเซทพลัส ดิจิทัล บล็อกเชน (ASP-DIGIBLOC)
+    matching.find([r"ชื่อกองทุน[^\(]{0,300}\(([^\)]{1,200})\)",
+                   r"(?i)(?:Fund\s*Name|ชื่อกองทุน)\s*(?:[:\-]\s*)?([A-Za-z0-9ก-๙\s\-]{1,200}?)(?:\n|$)"],
+                  "ชื่อกองทุน", clean=matching.collapse),
+    matching.near(r"(?i)Fund|กองทุน", r"(?i)([A-Z]{3}[A-Z0-9]*)\s*(?:Fund|กองทุน)", "ชื่อกองทุน",
+                  before=64, after=64, clean=matching.collapse),
+    # 🔎 ค่าธรรมเนียม: จากบรรทัดคำกำกับ (หรือ 2 บรรทัดถัดไป) → เดาจากตัวเลขทั้งหมด
+    matching.labelled("Fee", r"ค่าธรรมเนียมไม่รวมภาษีมูลค่าเพิ่ม|Fee\s*\(Excluding\s*Vat\)", ahead=2),
+    matching.labelled("VAT", r"^ภาษีมูลค่าเพิ่ม|^Vat$", exclude=r"ไม่รวม|Excluding", ahead=2),
+    matching.labelled("total fee", r"ค่าธรรมเนียมรวมภาษีมูลค่าเพิ่ม|Total\s*Fee$", ahead=2),
+    matching.guess_amounts(),
+    # ตรวจสอบความถูกต้อง: total fee = Fee + VAT (ไม่มี total fee ก็คำนวณให้)
+    matching.reconcile_total(fill=True),
+]
+
+
+def extract_assetfund_text(full_text, pdf_path=None, page_num=None, index=None):
+    data = matching.match(ASSETFUND_RULES, full_text)
+
+    # แสดงข้อมูลที่สกัดได้จากหน้านี้
+    log("\n📊 ข้อมูลที่สกัดได้จากหน้านี้:")
+    log("-" * 80)
+    log(f"เลขที่: {data['เลขที่'] if data['เลขที่'] else '(ไม่พบ)'}")
+    log(f"วันที่: {data['วันที่'] if data['วันที่'] else '(ไม่พบ)'}")
+    log(f"Unitholder No.: {data['Unitholder No.'] if data['Unitholder No.'] else '(ไม่พบ)'}")
+    log(f"ชื่อกองทุน: {data['ชื่อกองทุน'] if data['ชื่อกองทุน'] else '(ไม่พบ)'}")
+    log(f"Fee: {data['Fee'] if data['Fee'] else '(ไม่พบ)'}")
+    log(f"VAT: {data['VAT'] if data['VAT'] else '(ไม่พบ)'}")
+    log(f"total fee: {data['total fee'] if data['total fee'] else '(ไม่พบ)'}")
+    log("-" * 80 + "\n")
+
+    return data
+
+
+def process_assetfund_file(pdf_path, password=None, on_page=None):
+    return process_pages(pdf_path, extract_assetfund_text, "assetfund", password=password,
+                         on_page=on_page, show_raw=True)
+
+
+# ==================== PROVIDERS ====================
+# input: "folder" = ทุกไฟล์ในโฟลเดอร์, "file" = ไฟล์เดียวหลายหน้า (SCBAM)
+# widths: ความกว้างคอลัมน์ใน Excel (ถ้ามี)
+# version: เพิ่มทุกครั้งที่แก้ตรรกะสกัดข้อมูลของ provider นั้น (แคชผลลัพธ์เดิมจะไม่ถูกใช้อีก)
+PROVIDERS = {
+    "daol": {"version": 2, "process": process_daol_file, "input": "folder",
+             "output": "TaxInvoiceDaol.xlsx", "sheet": "PDF Data"},
+    "scbam": {"version": 3, "process": process_scbam_file, "input": "file",
+              "output": "TaxInvoiceSCBAM.xlsx", "sheet": "SCB Data"},
+    "eastspring": {"version": 3, "process": process_eastspring_file, "input": "folder",
+                   "output": "TaxInvoiceEastspringPro.xlsx", "sheet": "PDF Data"},
+    "assetfund": {"version": 3, "process": process_assetfund_file, "input": "folder",
+                  "output": "TaxInvoiceAssetFund.xlsx", "sheet": "Asset Fund Data",
+                  "widths": {"A": 10, "B": 35, "C": 15, "D": 20, "E": 40, "F": 15, "G": 15, "H": 15}},
+}
+
+
+# ==================== PARALLEL ====================
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def worker_settings():
+    """ค่าที่ต้องส่งต่อให้ worker process (spawn ไม่ได้สืบทอดตัวแปร global)"""
+    return {"verbose": VERBOSE, "ocr_cache": ocr.CACHE_ENABLED, "ocr_engine": ocr.ENGINE,
+            "roi_ocr": regions.ENABLED, "dpi_log": DPI_LOG_ENABLED, "unlock_cache": unlock.ENABLED,
+            # สำเนาที่ถอดรหัสแล้วอยู่ในโฟลเดอร์ของ process หลัก → ทุก worker ใช้ร่วมกัน และลบตอนปิดโปรแกรม
+            "unlock_dir": unlock.session_dir() if unlock.ENABLED else None,
+            # หยุดชั่วคราว / ยกเลิกงานของตัวจัดคิว (jobs.checkpoint ทุกหน้าใน worker)
+            "job": jobs.worker_events()}
+
+
+def _init_worker(settings):
+    global VERBOSE, DPI_LOG_ENABLED
+    VERBOSE = settings["verbose"]
+    ocr.CACHE_ENABLED = settings["ocr_cache"]
+    ocr.ENGINE = settings["ocr_engine"]
+    regions.ENABLED = settings["roi_ocr"]
+    DPI_LOG_ENABLED = settings["dpi_log"]
+    unlock.ENABLED = settings["unlock_cache"]
+    if settings["unlock_dir"]:
+        unlock.use_dir(settings["unlock_dir"])
+    jobs.use_worker_events(settings["job"])
+    # สร้าง engine ไว้ตั้งแต่เริ่ม worker → ทุกหน้าใน worker นี้ใช้ tesseract ตัวเดิม
+    try:
+        ocr.get_engine()
+    except Exception as e:
+        log(f"⚠️ เริ่ม OCR engine ไม่ได้: {e}")
+
+
+def run_file(process, pdf_path, password=None, on_page=None):
+    """เรียก process กับไฟล์เดียว ไฟล์ที่ล้มเหลวทั้งไฟล์จะได้แถว ERROR หนึ่งแถว"""
+    try:
+        return process(pdf_path, password=password, on_page=on_page)
+    except Exception as e:
+        log(f"⚠️ เกิดข้อผิดพลาดกับไฟล์ {os.path.basename(pdf_path)}: {str(e)}")
+        return [error_row(e)], 1
+
+
+def iter_files(process, paths, password=None, workers=None, on_page=None, provider=None):
+    """ประมวลผลหลายไฟล์ คืนค่า (pdf_path, rows, pages) ตามลำดับไฟล์เดิมเสมอ
+
+    workers=1 ทำงานใน process นี้ทีละไฟล์ (เรียก on_page(pdf_path, page_num, total) รายหน้า)
+    workers>1 กระจายไฟล์ให้ ProcessPoolExecutor แล้วเรียงผลกลับตามลำดับเดิม
+    provider ระบุแล้วจะใช้แคชผลลัพธ์รายไฟล์ ส่งเฉพาะไฟล์ใหม่/ไฟล์ที่เปลี่ยนไปประมวลผล
+    """
+    workers = workers or default_workers()
+
+    # แยกไฟล์ที่มีผลในแคชแล้วออกก่อน
+    keys, cached = {}, {}
+    if provider and RESULT_CACHE_ENABLED:
+        for pdf_path in paths:
+            keys[pdf_path], hit = load_result(provider, pdf_path, password=password)
+            if hit is not None:
+                cached[pdf_path] = hit
+    pending = [p for p in paths if p not in cached]
+
+    def finish(pdf_path, rows, pages):
+        if pdf_path in keys:
+            save_result(keys[pdf_path], rows, pages)
+        return pdf_path, rows, pages
+
+    if workers <= 1 or len(pending) <= 1:
+        for pdf_path in paths:
+            if pdf_path in cached:
+                yield (pdf_path,) + cached[pdf_path]
+                continue
+            jobs.checkpoint()
+            callback = functools.partial(on_page, pdf_path) if on_page else None
+            rows, pages = run_file(process, pdf_path, password=password, on_page=callback)
+            yield finish(pdf_path, rows, pages)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    job = functools.partial(run_file, process, password=password)
+    with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                             initializer=_init_worker, initargs=(worker_settings(),)) as pool:
+        # pool.map คืนผลตามลำดับ input → ลำดับ / แถว ERROR เหมือนรันแบบ serial
+        results = pool.map(job, pending)
+        for pdf_path in paths:
+            if pdf_path in cached:
+                yield (pdf_path,) + cached[pdf_path]
+            else:
+                rows, pages = next(results)
+                yield finish(pdf_path, rows, pages)
+
+
+def iter_provider_files(provider, paths, password=None, workers=None, on_page=None):
+    """iter_files ด้วยตัวสกัดของ provider (ใช้แคชผลลัพธ์)
+    provider แบบไฟล์เดียวหลายหน้า (SCBAM) ที่มีไฟล์เดียว → แบ่งหน้าให้ worker แทนการแบ่งไฟล์"""
+    spec = PROVIDERS[provider]
+    if spec["input"] == "file" and len(paths) == 1:
+        process = functools.partial(spec["process"], workers=workers or default_workers())
+        return iter_files(process, paths, password=password, workers=1, on_page=on_page, provider=provider)
+    return iter_files(spec["process"], paths, password=password, workers=workers, on_page=on_page,
+                      provider=provider)
+
+
+# ==================== RESULT CACHE ====================
+# แคชผลลัพธ์รายไฟล์ key = hash เนื้อไฟล์ + provider + version ของ parser
+RESULT_CACHE_ENABLED = os.environ.get("FUNDFEE_NO_RESULT_CACHE", "") == ""
+RESULT_CACHE_MAX_MB = int(os.environ.get("FUNDFEE_RESULT_CACHE_MB", "64"))
+
+_result_cache = None
+# service (slots > 1) เรียกจากหลาย thread พร้อมกัน → สร้างแคชครั้งเดียว
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            from cache import LRUCache, cache_dir
+
+            _result_cache = LRUCache(os.path.join(cache_dir(), "results.sqlite3"),
+                                     RESULT_CACHE_MAX_MB * 1024 * 1024)
+        return _result_cache
+
+
+def result_key(provider, pdf_path):
+    from cache import file_digest
+
+    version = PROVIDERS[provider]["version"]
+    return f"{provider}:{version}:{file_digest(pdf_path)}"
+
+
+def load_result(provider, pdf_path, password=None):
+    """คืนค่า (key, (rows, pages) หรือ None)
+    ไฟล์เข้ารหัสต้องเปิดได้ด้วย password ก่อน (key ไม่รวมรหัสผ่าน) ไม่งั้นถือว่าไม่มีในแคช → ได้แถว ERROR ตามปกติ"""
+    try:
+        key = result_key(provider, pdf_path)
+    except OSError:
+        return None, None
+    value = get_result_cache().get(key)
+    if value is None:
+        return key, None
+    try:
+        unlock.check_password(pdf_path, password)
+    except (unlock.PasswordRequired, unlock.WrongPassword):
+        return key, None
+    entry = json.loads(value)
+    return key, (entry["rows"], entry["pages"])
+
+
+def save_result(key, rows, pages):
+    # ไม่เก็บไฟล์ที่มีแถว ERROR ไว้ให้ลองใหม่รอบหน้า (key ไม่รวมรหัสผ่าน: load_result ตรวจรหัสก่อนคืนผล)
+    if key is None or any(str(row.get("เลขที่", "")).startswith("ERROR:") for row in rows):
+        return
+    get_result_cache().put(key, json.dumps({"rows": rows, "pages": pages}, ensure_ascii=False))
@@ -0,0 +1,260 @@
+#!/usr/local/bin/python3
+"""Fund Fee only แบบ command line (ไม่ใช้ Tk / ไม่ต้องมีหน้าจอ)
+
+ตัวอย่าง:
+    python -m fundfee extract --provider eastspring --in DIR --out FILE
+    python -m fundfee extract --provider scbam --in FILE.pdf --format parquet
+    python -m fundfee extract --provider auto --in INBOX
+    python -m fundfee watch --in INBOX --in INBOX2 --out RESULTS
+    python -m fundfee serve --port 8765
+    python -m fundfee dpi-stats
+
+exit code: 0 = สำเร็จ, 1 = ล้มเหลว, 2 = เสร็จแต่มีแถว ERROR
+"""
+import argparse
+import os
+import sys
+import time
+
+import detect
+import extractors
+import ocr
+import regions
+import service
+import sinks
+import watch
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_PARTIAL = 2
+
+
+def collect_inputs(in_path):
+    if os.path.isdir(in_path):
+        return [os.path.join(in_path, f) for f in extractors.list_pdfs(in_path)]
+    if os.path.isfile(in_path):
+        return [in_path]
+    raise FileNotFoundError(f"ไม่พบไฟล์หรือโฟลเดอร์: {in_path}")
+
+
+def default_output(provider, in_path, fmt="xlsx"):
+    folder = in_path if os.path.isdir(in_path) else os.path.dirname(os.path.abspath(in_path))
+    return os.path.join(folder, sinks.output_name(provider["output"], fmt))
+
+
+# -------------------- EXTRACT --------------------
+def apply_options(args):
+    extractors.VERBOSE = args.verbose
+    if args.no_ocr_cache:
+        ocr.CACHE_ENABLED = False
+    ocr.ENGINE = args.ocr_engine
+    if args.roi_ocr:
+        regions.ENABLED = True
+    if args.no_result_cache:
+        extractors.RESULT_CACHE_ENABLED = False
+
+
+def cmd_extract(args):
+    apply_options(args)
+    password = args.password or None
+
+    files = collect_inputs(args.in_path)
+    if not files:
+        print("ไม่พบไฟล์ PDF", file=sys.stderr)
+        return EXIT_FAILED
+    if args.provider == "auto":
+        return extract_inbox(args, files, password)
+
+    provider = extractors.PROVIDERS[args.provider]
+    fmt = args.format or (sinks.format_from_path(args.out) if args.out else "xlsx")
+    output_path = args.out or default_output(provider, args.in_path, fmt)
+
+    started = time.perf_counter()
+    total_pages = 0
+    results = extractors.iter_provider_files(args.provider, files, password=password, workers=args.workers)
+    # เขียนแถวลงไฟล์ทันทีที่แต่ละไฟล์เสร็จ ไม่เก็บทุกแถวไว้ในหน่วยความจำ
+    with sinks.open_sink(output_path, fmt, provider["sheet"], widths=provider.get("widths")) as sink:
+        for n, (pdf_path, file_rows, pages) in enumerate(results, start=1):
+            if not args.quiet:
+                print(f"[{n}/{len(files)}] {os.path.basename(pdf_path)}", file=sys.stderr)
+            sink.write_all(file_rows)
+            total_pages += pages
+
+    elapsed = time.perf_counter() - started
+    rate = total_pages / elapsed if elapsed > 0 else 0.0
+    print(f"✅ {sink.count} rows, {total_pages} pages in {elapsed:.1f}s ({rate:.2f} pages/sec) → {output_path}",
+          file=sys.stderr)
+    if sink.errors:
+        print(f"⚠️ {sink.errors} ERROR rows", file=sys.stderr)
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+
+def extract_inbox(args, files, password):
+    """--provider auto: แยกกองทุนจากหน้าแรกของแต่ละไฟล์ แล้วเขียนผลแยกไฟล์ตามกองทุน (--out = โฟลเดอร์)"""
+    fmt = args.format or "xlsx"
+    out_dir = args.out or (args.in_path if os.path.isdir(args.in_path)
+                           else os.path.dirname(os.path.abspath(args.in_path)))
+    os.makedirs(out_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    groups, unknown = detect.group_files(files, password=password, workers=args.workers)
+    if not args.quiet:
+        found = ", ".join(f"{provider} {len(paths)}" for provider, paths in groups.items())
+        print(f"🔎 {found or '-'}, ไม่รู้จัก {len(unknown)}", file=sys.stderr)
+
+    opened = {provider: sinks.open_provider_sink(provider, out_dir, fmt) for provider in groups}
+    total_pages = 0
+    try:
+        results = detect.iter_inbox(groups, password=password, workers=args.workers)
+        for n, (provider, pdf_path, file_rows, pages) in enumerate(results, start=1):
+            if not args.quiet:
+                print(f"[{n}/{len(files) - len(unknown)}] {provider}: {os.path.basename(pdf_path)}",
+                      file=sys.stderr)
+            opened[provider].write_all(file_rows)
+            total_pages += pages
+    except BaseException:
+        for sink in opened.values():
+            sink.abort()
+        raise
+    for sink in opened.values():
+        sink.close()
+
+    elapsed = time.perf_counter() - started
+    rate = total_pages / elapsed if elapsed > 0 else 0.0
+    for provider, sink in opened.items():
+        print(f"✅ {provider}: {sink.count} rows → {sink.output_path}", file=sys.stderr)
+    print(f"✅ {total_pages} pages in {elapsed:.1f}s ({rate:.2f} pages/sec)", file=sys.stderr)
+    errors = sum(sink.errors for sink in opened.values())
+    if errors:
+        print(f"⚠️ {errors} ERROR rows", file=sys.stderr)
+    for pdf_path in unknown:
+        print(f"⚠️ ไม่รู้จักกองทุน: {os.path.basename(pdf_path)}", file=sys.stderr)
+    return EXIT_PARTIAL if errors or unknown else EXIT_OK
+
+
+# -------------------- WATCH --------------------
+def cmd_watch(args):
+    apply_options(args)
+
+    def on_file(provider, pdf_path, rows, output_path):
+        if provider is None:
+            print(f"⚠️ ไม่รู้จักกองทุน: {os.path.basename(pdf_path)} (ลองใหม่เมื่อไฟล์เปลี่ยน)", file=sys.stderr)
+        elif output_path is None:
+            print(f"❌ {provider}: {os.path.basename(pdf_path)} {rows[0]['เลขที่']} (ลองใหม่เมื่อไฟล์เปลี่ยน)",
+                  file=sys.stderr)
+        elif not args.quiet:
+            print(f"✅ {provider}: {os.path.basename(pdf_path)} +{len(rows)} rows → {output_path}", file=sys.stderr)
+
+    if not args.quiet:
+        print(f"👀 เฝ้า {', '.join(args.in_paths)} (Ctrl+C เพื่อหยุด)", file=sys.stderr)
+    watch.watch(args.in_paths, provider=args.provider, out_dir=args.out, fmt=args.format,
+                password=args.password or None, workers=args.workers, settle=args.settle, poll=args.poll,
+                use_inotify=not args.polling, initial=not args.no_initial, on_file=on_file)
+    return EXIT_OK
+
+
+# -------------------- SERVE --------------------
+def cmd_serve(args):
+    apply_options(args)
+    if not args.quiet:
+        print(f"🌐 http://{args.host}:{args.port} (Ctrl+C เพื่อหยุด)"
+              f" หน้าจอ Tk ใช้ service นี้เมื่อตั้ง FUNDFEE_SERVICE_URL", file=sys.stderr)
+    service.serve(args.host, args.port, workers=args.workers, slots=args.slots, work_dir=args.work_dir)
+    return EXIT_OK
+
+
+# -------------------- DPI STATS --------------------
+def cmd_dpi_stats(args):
+    stats = extractors.dpi_stats(args.log)
+    if not stats:
+        print("ยังไม่มีบันทึก dpi", file=sys.stderr)
+        return EXIT_OK
+    for provider in sorted(stats):
+        ladder = extractors.OCR_LADDERS.get(provider, ())
+        print(f"{provider} (ladder: {', '.join(map(str, ladder))})")
+        for dpi in sorted(stats[provider]):
+            ok, failed = stats[provider][dpi]
+            print(f"  {dpi:>4} dpi: ผ่าน {ok:>6}  ไม่ผ่าน {failed:>6}")
+    return EXIT_OK
+
+
+def add_processing_options(p):
+    """ตัวเลือกการสกัดที่ใช้ร่วมกันระหว่าง extract / watch / serve"""
+    p.add_argument("--workers", type=int, default=extractors.default_workers(),
+                   help="จำนวน process ที่ใช้พร้อมกัน (ค่าเริ่มต้น: จำนวน CPU, 1 = ทีละไฟล์)")
+    p.add_argument("--no-ocr-cache", action="store_true",
+                   help="ไม่ใช้แคชผล OCR (ค่าเริ่มต้นเก็บไว้ในโฟลเดอร์แคช ดู FUNDFEE_CACHE_DIR)")
+    p.add_argument("--ocr-engine", default=ocr.ENGINE, choices=["auto"] + sorted(ocr.ENGINES),
+                   help="auto = tesserocr (ใน process) ถ้ามี ไม่งั้น pytesseract (subprocess)")
+    p.add_argument("--roi-ocr", action="store_true",
+                   help="ลอง OCR เฉพาะบริเวณที่มีข้อมูลก่อน OCR ทั้งหน้า (ทดลอง: box ยังไม่ได้เทียบกับสแกนจริง)")
+    p.add_argument("--no-result-cache", action="store_true",
+                   help="ประมวลผลทุกไฟล์ใหม่ ไม่ใช้ผลลัพธ์ของไฟล์ที่ไม่เปลี่ยนจากรอบก่อน")
+    p.add_argument("--verbose", action="store_true", help="แสดง Raw Text และข้อมูลที่สกัดได้")
+    p.add_argument("--quiet", action="store_true", help="ไม่แสดงความคืบหน้ารายไฟล์")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="fundfee", description="Fund Fee only (headless)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("extract", help="สกัดข้อมูลใบกำกับภาษีเป็น Excel / CSV / JSONL / Parquet")
+    p.add_argument("--provider", required=True, choices=sorted(extractors.PROVIDERS) + ["auto"],
+                   help="auto = แยกกองทุนจากหน้าแรกของแต่ละไฟล์ (โฟลเดอร์ที่มีหลายกองทุนปนกัน)")
+    p.add_argument("--in", dest="in_path", required=True, help="โฟลเดอร์ PDF หรือไฟล์ PDF")
+    p.add_argument("--out", help="ไฟล์ผลลัพธ์ (ค่าเริ่มต้น: ชื่อเดิมของแต่ละ provider ในโฟลเดอร์ input)"
+                                 " สำหรับ --provider auto เป็นโฟลเดอร์ผลลัพธ์")
+    p.add_argument("--format", choices=list(sinks.FORMATS),
+                   help="รูปแบบไฟล์ผลลัพธ์ (ค่าเริ่มต้น: ตามนามสกุลของ --out หรือ xlsx) parquet ต้องมี pyarrow")
+    p.add_argument("--password", action="append",
+                   help="รหัสผ่าน PDF (ถ้ามี) ใส่ซ้ำได้เพื่อให้ลองหลายรหัส เช่น --password 0101 --password 0202")
+    add_processing_options(p)
+    p.set_defaults(func=cmd_extract)
+
+    p = sub.add_parser("watch", help="เฝ้าโฟลเดอร์ สกัดไฟล์ PDF ที่วางเข้ามาใหม่แล้วต่อท้ายไฟล์ผลลัพธ์ (csv / jsonl)")
+    p.add_argument("--in", dest="in_paths", action="append", required=True,
+                   help="โฟลเดอร์ที่เฝ้า ใส่ซ้ำได้หลายโฟลเดอร์")
+    p.add_argument("--provider", default="auto", choices=sorted(extractors.PROVIDERS) + ["auto"],
+                   help="ค่าเริ่มต้น auto = แยกกองทุนจากหน้าแรกของแต่ละไฟล์")
+    p.add_argument("--out", help="โฟลเดอร์ผลลัพธ์ (ค่าเริ่มต้น: โฟลเดอร์เดียวกับไฟล์ PDF)")
+    p.add_argument("--format", default="csv", choices=list(sinks.APPEND_FORMATS),
+                   help="รูปแบบไฟล์ผลลัพธ์ (ต่อท้ายไฟล์เดิมได้เฉพาะ csv / jsonl)")
+    p.add_argument("--settle", type=float, default=watch.SETTLE_SECONDS,
+                   help="วินาทีที่ขนาดไฟล์ต้องไม่เปลี่ยนก่อนเริ่มสกัด (กันไฟล์ที่ยังคัดลอกไม่เสร็จ)")
+    p.add_argument("--poll", type=float, default=watch.POLL_SECONDS, help="รอบการเช็กไฟล์ (วินาที)")
+    p.add_argument("--polling", action="store_true", help="สแกนโฟลเดอร์เป็นรอบ ไม่ใช้ inotify (เช่น network drive)")
+    p.add_argument("--no-initial", action="store_true", help="ไม่สกัดไฟล์ที่มีอยู่แล้วตอนเริ่ม เฉพาะไฟล์ใหม่")
+    p.add_argument("--password", action="append",
+                   help="รหัสผ่าน PDF (ถ้ามี) ใส่ซ้ำได้เพื่อให้ลองหลายรหัส เช่น --password 0101 --password 0202")
+    add_processing_options(p)
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("serve", help="service HTTP ในเครื่อง รับงานสกัดข้อมูล / รวม PDF เข้าคิวกลาง")
+    p.add_argument("--host", default=service.HOST,
+                   help="ค่าเริ่มต้น 127.0.0.1 (ไม่มีการยืนยันตัวตน เปิดให้เครื่องอื่นเฉพาะในเครือข่ายที่ไว้ใจได้)")
+    p.add_argument("--port", type=int, default=service.PORT)
+    p.add_argument("--slots", type=int, default=1, help="จำนวนงานที่รันพร้อมกัน (แต่ละงานใช้ --workers process)")
+    p.add_argument("--work-dir", help="โฟลเดอร์เก็บไฟล์อัปโหลด / ผลลัพธ์ (ค่าเริ่มต้น: โฟลเดอร์ชั่วคราว ลบตอนหยุด)")
+    add_processing_options(p)
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("dpi-stats", help="สรุป dpi ที่ OCR ผ่านของแต่ละหน้า (ไว้ปรับ OCR_LADDERS)")
+    p.add_argument("--log", help="ไฟล์บันทึก (ค่าเริ่มต้น: ocr_dpi.jsonl ในโฟลเดอร์แคช)")
+    p.set_defaults(func=cmd_dpi_stats)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
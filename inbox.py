@@ -0,0 +1,154 @@
+import os
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from tkinter import filedialog, messagebox
+from jobbar import JobBar
+from progress import ProgressFeed
+import detect
+import extractors
+import sinks
+
+class InboxPage(ttk.Frame):
+    """โฟลเดอร์ที่มีใบกำกับภาษีหลายกองทุนปนกัน → แยกกองทุนจากหน้าแรกแล้วส่งให้ตัวสกัดของกองทุนนั้น"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.folder_var = ttk.StringVar()
+        self.password_var = ttk.StringVar()
+        self.workers_var = ttk.IntVar(value=extractors.default_workers())
+        self.format_var = ttk.StringVar(value="xlsx")
+
+        # -------------------- HEADER --------------------
+        ttk.Label(self, text="📥 Inbox (แยกกองทุนอัตโนมัติ)",
+                  font=("Kanit Semibold", 18)).pack(pady=10)
+        ttk.Label(self, text="DAOL / SCBAM / Eastspring / Asset Fund ปนกันในโฟลเดอร์เดียว → แยกไฟล์ผลลัพธ์ตามกองทุน",
+                  font=("Kanit", 11)).pack(pady=(0, 15))
+
+        # -------------------- INPUT SECTION --------------------
+        frame = ttk.Frame(self)
+        frame.pack(pady=10)
+
+        ttk.Label(frame, text="📁 โฟลเดอร์ไฟล์ PDF:", font=("Kanit", 10)).grid(row=0, column=0, sticky="w", padx=10, pady=5)
+        folder_entry = ttk.Entry(frame, textvariable=self.folder_var, width=40, bootstyle="info")
+        folder_entry.grid(row=0, column=1, padx=10, pady=5)
+        self.create_context_menu(folder_entry)
+
+        ttk.Button(frame, text="Browse...", bootstyle="secondary-outline",
+                   command=self.select_folder).grid(row=0, column=2, padx=5)
+
+        ttk.Label(frame, text="🔐 รหัสผ่าน PDF (ถ้ามี):", font=("Kanit", 10)).grid(row=1, column=0, sticky="w", padx=10, pady=5)
+        password_entry = ttk.Entry(frame, textvariable=self.password_var, show="*", width=40, bootstyle="info")
+        password_entry.grid(row=1, column=1, padx=10, pady=5)
+        self.create_context_menu(password_entry)
+
+        ttk.Label(frame, text="⚙️ จำนวน process:", font=("Kanit", 10)).grid(row=2, column=0, sticky="w", padx=10, pady=5)
+        ttk.Spinbox(frame, textvariable=self.workers_var, from_=1, to=64, width=6,
+                    bootstyle="info").grid(row=2, column=1, sticky="w", padx=10, pady=5)
+        ttk.Label(frame, text="💾 รูปแบบไฟล์ผลลัพธ์:", font=("Kanit", 10)).grid(row=3, column=0, sticky="w", padx=10, pady=5)
+        ttk.Combobox(frame, textvariable=self.format_var, values=list(sinks.FORMATS), state="readonly", width=8,
+                     bootstyle="info").grid(row=3, column=1, sticky="w", padx=10, pady=5)
+
+        # -------------------- PROGRESS + STATUS --------------------
+        self.progress_bar = ttk.Progressbar(self, length=500, mode="determinate", bootstyle="info-striped")
+        self.progress_bar.pack(pady=10)
+
+        self.status_label = ttk.Label(self, text="พร้อมทำงาน", font=("Kanit", 10))
+        self.status_label.pack(pady=5)
+        self.feed = ProgressFeed(self, self.progress_bar, self.status_label)
+
+        # -------------------- ACTION BUTTON --------------------
+        self.job_bar = JobBar(self, "เริ่มประมวลผล", self.run_process, self.folder_var.get, self.feed,
+                              params=self.read_form, bootstyle="primary", width=20)
+        self.job_bar.pack(pady=10)
+
+        ttk.Label(self, text="© 2025 NongAumzaap", foreground="#888",
+                  font=("Kanit", 8)).pack(pady=5)
+
+    # -------------------- CONTEXT MENU --------------------
+    def create_context_menu(self, entry_widget):
+        menu = ttk.Menu(entry_widget, tearoff=0)
+        menu.add_command(label="Copy", command=lambda: entry_widget.event_generate("<<Copy>>"))
+        menu.add_command(label="Paste", command=lambda: entry_widget.event_generate("<<Paste>>"))
+        menu.add_command(label="Cut", command=lambda: entry_widget.event_generate("<<Cut>>"))
+        entry_widget.bind("<Button-3>", lambda e: menu.tk_popup(e.x_root, e.y_root))
+
+    # -------------------- FOLDER SELECT --------------------
+    def select_folder(self):
+        folder = filedialog.askdirectory()
+        if folder:
+            self.folder_var.set(folder)
+
+    # -------------------- WORKERS --------------------
+    def get_workers(self):
+        try:
+            return max(1, int(self.workers_var.get()))
+        except Exception:
+            return extractors.default_workers()
+
+    # -------------------- FORM --------------------
+    def read_form(self):
+        """ค่าจากฟอร์ม อ่านใน main loop ตอนกดเริ่ม (งานใน thread ของตัวจัดคิวไม่แตะตัวแปร Tk)"""
+        return {"folder_path": self.folder_var.get(), "password": self.password_var.get().strip(),
+                "fmt": self.format_var.get(), "workers": self.get_workers()}
+
+    # -------------------- MAIN PROCESS --------------------
+    def run_process(self, folder_path, password, fmt, workers):
+        password = password or None
+
+        if not folder_path:
+            self.feed.call(messagebox.showwarning, "แจ้งเตือน", "กรุณาเลือกโฟลเดอร์ก่อน")
+            return
+
+        try:
+            files = extractors.list_pdfs(folder_path)
+            if not files:
+                self.feed.call(messagebox.showwarning, "แจ้งเตือน", "ไม่พบไฟล์ PDF ในโฟลเดอร์นี้")
+                return
+            paths = [os.path.join(folder_path, f) for f in files]
+
+            # แยกกองทุนจากหน้าแรกของแต่ละไฟล์ (text layer / OCR เฉพาะหน้าสแกน)
+            self.feed.update(text=f"🔎 กำลังแยกกองทุน {len(paths)} ไฟล์...")
+            groups, unknown = detect.group_files(paths, password=password, workers=workers)
+
+            # นับจำนวนหน้าโดยประมาณจาก page tree แล้วปรับ maximum ให้ตรงระหว่างประมวลผล
+            known = [p for group in groups.values() for p in group]
+            estimates = {p: extractors.count_pages(p, password=password) for p in known}
+            total_pages = sum(estimates.values())
+            self.feed.start(total_pages)
+            current_page = 0
+
+            def on_page(pdf_path, page_num, total_pages_file):
+                self.feed.update(value=current_page + page_num,
+                                 text=f"กำลังประมวลผลไฟล์: {os.path.basename(pdf_path)} (หน้า {page_num}/{total_pages_file})")
+
+            opened = {provider: sinks.open_provider_sink(provider, folder_path, fmt) for provider in groups}
+            try:
+                for provider, pdf_path, rows, pages in detect.iter_inbox(groups, password=password, workers=workers,
+                                                                         on_page=on_page):
+                    opened[provider].write_all(rows)
+                    current_page += pages
+                    total_pages += pages - estimates[pdf_path]
+                    self.feed.update(value=current_page, maximum=total_pages,
+                                     text=f"ประมวลผลแล้ว ({provider}): {os.path.basename(pdf_path)}")
+            except BaseException:
+                for sink in opened.values():
+                    sink.abort()
+                raise
+            for sink in opened.values():
+                sink.close()
+
+            summary = "\n".join(f"{provider}: {sink.count} รายการ → {os.path.basename(sink.output_path)}"
+                                for provider, sink in opened.items())
+            if unknown:
+                summary += f"\n\n⚠️ ไม่รู้จักกองทุน {len(unknown)} ไฟล์:\n" + "\n".join(
+                    os.path.basename(p) for p in unknown[:20])
+                if len(unknown) > 20:
+                    summary += f"\n... และอีก {len(unknown) - 20} ไฟล์"
+            self.feed.finish("✅ เสร็จสิ้น")
+            self.feed.call(messagebox.showinfo, "สำเร็จ", f"บันทึกไฟล์เรียบร้อย:\n{summary or '-'}")
+
+        except Exception as e:
+            self.feed.call(messagebox.showerror, "ข้อผิดพลาด", str(e))
+            self.feed.finish("❌ เกิดข้อผิดพลาด")
+            import traceback
+            traceback.print_exc()
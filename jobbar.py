@@ -0,0 +1,86 @@
+import ttkbootstrap as ttk
+from tkinter import messagebox
+import jobs
+
+class JobBar(ttk.Frame):
+    """ปุ่มเริ่ม / หยุดชั่วคราว / ยกเลิก ของหนึ่งหน้า งานเข้าคิวกลาง (jobs.scheduler) แทนการสร้าง thread เอง
+
+    run(**params()) คืองานของหน้า (ทำงานใน thread ของตัวจัดคิว) params() อ่านค่าจากฟอร์มใน main loop ตอนกดเริ่ม
+    (thread ของงานไม่แตะตัวแปร Tk) key() คืนค่าโฟลเดอร์/ไฟล์ของงาน (ใช้กันกดซ้ำ + priority)
+    feed คือ progress.ProgressFeed ของหน้า (ข้อความสถานะ) ปุ่มถูกแตะจาก main loop เท่านั้น"""
+
+    # ตรวจว่างานจบหรือยัง (ms)
+    POLL_MS = 200
+
+    def __init__(self, parent, text, run, key, feed=None, params=None, bootstyle="primary", width=20):
+        super().__init__(parent)
+        self.run = run
+        self.key = key
+        self.params = params
+        self.feed = feed
+        self.job = None
+
+        self.start_btn = ttk.Button(self, text=text, bootstyle=bootstyle, width=width, command=self.start)
+        self.start_btn.pack(side="left", padx=5)
+        self.pause_btn = ttk.Button(self, text="⏸️ หยุดชั่วคราว", bootstyle="warning-outline", width=14,
+                                    command=self.toggle_pause, state="disabled")
+        self.pause_btn.pack(side="left", padx=5)
+        self.cancel_btn = ttk.Button(self, text="⏹️ ยกเลิก", bootstyle="danger-outline", width=10,
+                                     command=self.cancel, state="disabled")
+        self.cancel_btn.pack(side="left", padx=5)
+
+    def set_status(self, text):
+        if self.feed is not None:
+            self.feed.update(text=text)
+
+    def start(self):
+        key = self.key() or None
+        params = self.params() if self.params else {}
+        try:
+            priority = jobs.priority_for(key, params.get("password") or None) if key else jobs.INTERACTIVE
+            self.job = jobs.scheduler().submit(lambda job: self.run(**params), key=key, priority=priority)
+        except jobs.FolderBusy:
+            messagebox.showwarning("มีงานอยู่แล้ว", "โฟลเดอร์/ไฟล์นี้กำลังประมวลผลหรือรอคิวอยู่")
+            return
+        self.start_btn.configure(state="disabled")
+        self.pause_btn.configure(state="normal", text="⏸️ หยุดชั่วคราว")
+        self.cancel_btn.configure(state="normal")
+        if self.job.state == "queued":
+            self.set_status("⏳ รอคิว (มีงานอื่นกำลังทำอยู่)...")
+        self.after(self.POLL_MS, self._watch, self.job)
+
+    def _watch(self, job):
+        if job is not self.job:
+            return
+        if not job.done.is_set():
+            self.after(self.POLL_MS, self._watch, job)
+            return
+        if job.status == "cancelled" and self.feed is not None:
+            self.feed.finish("⏹️ ยกเลิกแล้ว (ไม่ได้บันทึกไฟล์ผลลัพธ์)", value=0)
+        self.reset()
+
+    def reset(self):
+        self.start_btn.configure(state="normal")
+        self.pause_btn.configure(state="disabled", text="⏸️ หยุดชั่วคราว")
+        self.cancel_btn.configure(state="disabled")
+
+    def toggle_pause(self):
+        if self.job is None:
+            return
+        if self.job.paused:
+            self.job.resume()
+            self.pause_btn.configure(text="⏸️ หยุดชั่วคราว")
+            self.set_status("▶️ ทำต่อ...")
+        else:
+            self.job.pause()
+            self.pause_btn.configure(text="▶️ ทำต่อ")
+            self.set_status("⏸️ หยุดชั่วคราว (หยุดหลังหน้าที่กำลังทำอยู่)")
+
+    def cancel(self):
+        if self.job is None:
+            return
+        self.job.cancel()
+        self.pause_btn.configure(state="disabled")
+        self.cancel_btn.configure(state="disabled")
+        if self.job.state != "cancelled":
+            self.set_status("⏹️ กำลังยกเลิก (หลังหน้าที่กำลังทำอยู่)...")
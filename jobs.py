@@ -0,0 +1,250 @@
+import heapq
+import itertools
+import os
+import threading
+
+# ตัวจัดคิวงานกลางของทุกหน้าจอ (ปุ่ม "เริ่มประมวลผล" / Merge / Split ส่งงานมาที่นี่แทนการสร้าง thread เอง)
+#
+# - โฟลเดอร์/ไฟล์เดียวกันมีงานได้ทีละงาน (กดซ้ำระหว่างที่ยังรอ/ทำอยู่ → FolderBusy)
+# - รันพร้อมกันได้ SLOTS งาน (แต่ละงานใช้ process pool ของตัวเองเต็ม CPU อยู่แล้ว) ที่เหลือรอในคิวตาม priority
+# - งานเล็ก (INTERACTIVE) มาทีหลังได้ก่อนงานใหญ่ (BULK): ถ้าช่องเต็มด้วยงานใหญ่ งานใหญ่จะหยุดรอที่หน้าถัดไป
+#   คืนช่องให้งานเล็ก แล้วทำต่อจากหน้าเดิมเมื่องานเล็กเสร็จ
+# - หยุดชั่วคราว / ยกเลิกแบบ cooperative: ตัวสกัดเรียก checkpoint() ทุกหน้า (ทั้งใน thread ของงานและใน worker
+#   process ผ่าน multiprocessing.Event ที่ส่งไปกับ extractors.worker_settings) ยกเลิกแล้วไฟล์ผลลัพธ์ไม่ถูกเขียนทับ
+#   ไฟล์ที่ทำเสร็จก่อนยกเลิกอยู่ในแคชผลลัพธ์แล้ว กดเริ่มใหม่จะทำต่อเฉพาะไฟล์ที่เหลือ
+
+INTERACTIVE = 0
+BULK = 1
+
+SLOTS = int(os.environ.get("FUNDFEE_JOB_SLOTS", "1"))
+# งานที่ถือว่าเล็ก: โฟลเดอร์ไม่เกิน SMALL_JOB_FILES ไฟล์ หรือไฟล์เดียวไม่เกิน SMALL_JOB_PAGES หน้า
+SMALL_JOB_FILES = 3
+SMALL_JOB_PAGES = 20
+
+_local = threading.local()
+_worker = None
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class Cancelled(BaseException):
+    """งานถูกยกเลิก (BaseException: ไม่ถูกจับเป็นแถว ERROR หรือข้อผิดพลาดทั่วไประหว่างทาง)"""
+
+
+class FolderBusy(Exception):
+    """มีงานของโฟลเดอร์/ไฟล์นี้อยู่ในคิวหรือกำลังทำอยู่แล้ว"""
+
+
+class Job:
+    def __init__(self, scheduler, run, key, priority, name):
+        self.scheduler = scheduler
+        self.run = run
+        self.key = key
+        self.priority = priority
+        self.name = name
+        self.seq = 0
+        self.thread = None
+        self.status = "queued"  # queued / running / done / cancelled / failed
+        self.error = None
+        self.cancelled = False
+        self.paused = False
+        self.preempted = False
+        self.done = threading.Event()
+        self._go = threading.Event()
+        self._go.set()
+        self._events = None
+
+    @property
+    def state(self):
+        """สถานะสำหรับแสดงผล (รวมหยุดชั่วคราว / รองานที่สำคัญกว่า)"""
+        if self.status == "running":
+            if self.cancelled:
+                return "cancelling"
+            if self.paused:
+                return "paused"
+            if self.preempted:
+                return "waiting"
+        return self.status
+
+    def _update(self):
+        go = self.cancelled or not (self.paused or self.preempted)
+        (self._go.set if go else self._go.clear)()
+        if self._events:
+            cancel, resume = self._events
+            if self.cancelled:
+                cancel.set()
+            (resume.set if go else resume.clear)()
+
+    def cancel(self):
+        self.scheduler.cancel(self)
+
+    def pause(self):
+        with self.scheduler.lock:
+            self.paused = True
+            self._update()
+
+    def resume(self):
+        with self.scheduler.lock:
+            self.paused = False
+            self._update()
+
+    def worker_events(self):
+        """(cancel, resume) แบบ multiprocessing.Event สำหรับ worker process ของงานนี้ (สร้างเมื่อใช้ครั้งแรก)"""
+        with self.scheduler.lock:
+            if self._events is None:
+                import multiprocessing
+
+                self._events = (multiprocessing.Event(), multiprocessing.Event())
+                self._update()
+            return self._events
+
+    def checkpoint(self):
+        if not self._go.is_set():
+            self._go.wait()
+        if self.cancelled:
+            raise Cancelled(self.name)
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+# -------------------- SCHEDULER --------------------
+class Scheduler:
+    def __init__(self, slots=SLOTS):
+        self.slots = max(1, slots)
+        self.lock = threading.Lock()
+        self.queue = []
+        self.running = set()
+        self.keys = {}
+        self.counter = itertools.count()
+
+    def submit(self, run, key=None, priority=BULK, name=""):
+        """เข้าคิว run(job) ใน thread ของตัวจัดคิว key = โฟลเดอร์/ไฟล์ของงาน (ซ้ำกับงานที่ค้างอยู่ → FolderBusy)"""
+        key = os.path.normcase(os.path.abspath(key)) if key else None
+        with self.lock:
+            if key and key in self.keys:
+                raise FolderBusy(key)
+            job = Job(self, run, key, priority, name or key or "")
+            job.seq = next(self.counter)
+            if key:
+                self.keys[key] = job
+            heapq.heappush(self.queue, (priority, job.seq, job))
+            self._preempt(priority)
+            self._dispatch()
+        return job
+
+    def cancel(self, job):
+        with self.lock:
+            job.cancelled = True
+            job._update()
+            if job.thread is None:
+                # ยังไม่เริ่ม → ออกจากคิวเลย
+                self._remove(job)
+                job.status = "cancelled"
+                job.done.set()
+
+    def jobs(self):
+        with self.lock:
+            return sorted(list(self.running) + [job for _, _, job in self.queue], key=lambda job: job.seq)
+
+    def _remove(self, job):
+        self.queue = [entry for entry in self.queue if entry[2] is not job]
+        heapq.heapify(self.queue)
+        self.running.discard(job)
+        if job.key and self.keys.get(job.key) is job:
+            del self.keys[job.key]
+
+    def _preempt(self, priority):
+        """ช่องเต็มด้วยงานที่สำคัญน้อยกว่า → งานนั้นหยุดที่หน้าถัดไปแล้วกลับเข้าคิว (ทำต่อจากเดิมเมื่อถึงคิว)"""
+        if len(self.running) < self.slots:
+            return
+        victims = [job for job in self.running if job.priority > priority and not job.cancelled]
+        if victims:
+            job = max(victims, key=lambda job: (job.priority, job.seq))
+            self.running.discard(job)
+            job.preempted = True
+            job._update()
+            heapq.heappush(self.queue, (job.priority, job.seq, job))
+
+    def _dispatch(self):
+        while len(self.running) < self.slots and self.queue:
+            _, _, job = heapq.heappop(self.queue)
+            self.running.add(job)
+            if job.thread is not None:
+                job.preempted = False
+                job._update()
+            else:
+                job.thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+                job.thread.start()
+
+    def _run(self, job):
+        _local.job = job
+        try:
+            job.status = "running"
+            job.checkpoint()
+            job.run(job)
+            job.status = "done"
+        except Cancelled:
+            job.status = "cancelled"
+        except BaseException as e:
+            job.status, job.error = "failed", e
+        finally:
+            _local.job = None
+            with self.lock:
+                self._remove(job)
+                self._dispatch()
+            job.done.set()
+
+
+def scheduler():
+    """ตัวจัดคิวกลางของ process นี้"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
+
+
+def priority_for(path, password=None):
+    """INTERACTIVE สำหรับงานเล็ก (ดู SMALL_JOB_FILES / SMALL_JOB_PAGES) ไม่งั้น BULK
+    นับหน้าไม่ได้ (เช่น ไฟล์เข้ารหัสที่รหัสผ่านผิด/ไม่ได้ใส่) → BULK ไม่ให้ไฟล์ใหญ่แซงคิว"""
+    import extractors
+
+    try:
+        if os.path.isdir(path):
+            return INTERACTIVE if len(extractors.list_pdfs(path)) <= SMALL_JOB_FILES else BULK
+        return INTERACTIVE if extractors.read_page_count(path, password=password) <= SMALL_JOB_PAGES else BULK
+    except Exception:
+        return BULK
+
+
+# -------------------- CHECKPOINT --------------------
+def current():
+    """งานของ thread นี้ (None = ไม่ได้รันผ่านตัวจัดคิว เช่น CLI / service)"""
+    return getattr(_local, "job", None)
+
+
+def worker_events():
+    job = current()
+    return job.worker_events() if job else None
+
+
+def use_worker_events(events):
+    """worker process: ใช้ (cancel, resume) ของงานที่สร้าง pool นี้"""
+    global _worker
+    _worker = events
+    # fork จาก thread ของงานได้ thread-local ของงานติดมาด้วย (สำเนาที่ไม่มีวันเปลี่ยน) → ใช้ events แทน
+    _local.job = None
+
+
+def checkpoint():
+    """เรียกระหว่างหน้า: หยุดรอถ้างานถูกหยุดชั่วคราว, Cancelled ถ้างานถูกยกเลิก (ไม่มีงาน = ไม่ทำอะไร)"""
+    job = current()
+    if job is not None:
+        job.checkpoint()
+    elif _worker is not None:
+        cancel, resume = _worker
+        if not resume.is_set():
+            resume.wait()
+        if cancel.is_set():
+            raise Cancelled()
@@ -0,0 +1,291 @@
+import os
+import re
+import time
+
+import validate
+
+# เครื่องมือจับคู่ฟิลด์ที่ใช้ร่วมกันทุกกองทุน
+#
+# แต่ละกองทุนประกาศกฎเป็นข้อมูล (list ของ rule ตามลำดับความสำคัญ) ไม่ใช่โค้ด:
+#   find(...)          ค้น regex ทั้งหน้า ค่าแรกที่เจอ
+#   near(...)          ค้น regex เฉพาะหน้าต่างรอบคำ anchor (ไม่ไล่ทั้งหน้า)
+#   line_at(...)       ใช้ทั้งบรรทัดที่ตำแหน่งคงที่
+#   labelled(...)      จำนวนเงินบนบรรทัดที่มีคำกำกับ (หรือ N บรรทัดถัดไป)
+#   line_amounts(...)  จำนวนเงินตามลำดับบนบรรทัดที่ตำแหน่งคงที่
+#   amount_block(...)  จำนวนเงิน 3 ตัวแรกหลังบรรทัดคำกำกับ (เก็บข้อความเดิม)
+#   guess_amounts()    เดาจากจำนวนเงินทั้งหน้า
+#   reconcile_total()  แก้ total fee ให้เท่ากับ Fee + VAT
+#   compute(fn)        ตรรกะเฉพาะที่เขียนเป็นกฎไม่ได้
+#
+# rule ข้ามไปถ้าทุกฟิลด์ที่มันตั้งค่ามีค่าแล้ว (หรือ rule ก่อนหน้าเจอแล้วแม้ค่าจะว่าง) → ลำดับใน list = ลำดับ fallback
+# regex ถูก compile ครั้งเดียวตอน import, หน้าแต่ละหน้าตัดบรรทัด/หาจำนวนเงินครั้งเดียว (PageText)
+# และกฎ labelled ที่อยู่ติดกันถูกตรวจพร้อมกันในการไล่บรรทัดรอบเดียว
+#
+# regex ต้องไม่ backtrack แบบ quadratic บนข้อความ OCR เพี้ยนยาว ๆ:
+#   - quantifier ที่ซ้อนกัน (\s*[:\-]?\s*, [A-Z]{3,}[A-Z0-9]*) เขียนให้แต่ละตัวอักษรมีทางจับได้ทางเดียว
+#   - pattern ที่ขึ้นต้นด้วยกลุ่มตัวอักษรยาวไม่จำกัด ใส่ (?<!...) ให้เริ่มได้เฉพาะต้นกลุ่ม
+#   - ส่วนที่ต้องค้นไกลจาก anchor จำกัดความยาว {0,N} หรือใช้ near()
+# ทั้งหน้ามีงบเวลา BUDGET_MS — เกินแล้วข้ามกฎค้นทั้งหน้าที่เหลือ ใช้เฉพาะกฎที่อิงบรรทัด
+# (แถวที่ได้มักไม่ผ่าน validate → OCR ladder / ผู้ใช้ตรวจต่อ) หน้าเดียวจึงไม่ทำให้ทั้ง batch ค้าง
+
+AMOUNT_FIELDS = ("Fee", "VAT", "total fee")
+AMOUNT_RE = validate.AMOUNT_RE
+
+BUDGET_MS = int(os.environ.get("FUNDFEE_MATCH_BUDGET_MS", "1000"))
+# near(): จำนวน anchor สูงสุดที่ตรวจต่อหน้า
+MAX_ANCHORS = 200
+
+
+class PageText:
+    """ข้อความหนึ่งหน้าที่ตัดบรรทัดไว้ครั้งเดียว จำนวนเงินของแต่ละบรรทัดหาเมื่อใช้ครั้งแรกแล้วเก็บไว้"""
+
+    __slots__ = ("text", "lines", "_amounts")
+
+    def __init__(self, text):
+        self.text = text or ""
+        self.lines = [l.strip() for l in self.text.splitlines() if l.strip()]
+        self._amounts = [None] * len(self.lines)
+
+    def amounts(self, i):
+        """[(ข้อความ, ค่า), ...] ของบรรทัด i ตามลำดับจากซ้ายไปขวา"""
+        tokens = self._amounts[i]
+        if tokens is None:
+            line = self.lines[i]
+            # ไม่มีจุดทศนิยม = ไม่มีจำนวนเงิน ไม่ต้องรัน regex
+            tokens = [(m.group(0), float(m.group(0).replace(",", ""))) for m in AMOUNT_RE.finditer(line)] \
+                if "." in line else []
+            self._amounts[i] = tokens
+        return tokens
+
+    def first_amount(self, i):
+        tokens = self.amounts(i)
+        return tokens[0][1] if tokens else None
+
+    def all_amounts(self):
+        return [value for i in range(len(self.lines)) for _, value in self.amounts(i)]
+
+
+def collapse(text):
+    return re.sub(r"\s+", " ", text.strip())
+
+
+# -------------------- RULES --------------------
+def find(patterns, field=None, flags=0, group=1, clean=None, fields=None):
+    """ค้น pattern (หรือ list ของ pattern ตามลำดับ) ทั้งหน้า ค่าแรกที่เจอ → field
+    fields={ชื่อฟิลด์: group} ใช้เมื่อ match เดียวให้หลายฟิลด์ clean เป็นฟังก์ชันหรือ dict ต่อฟิลด์"""
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return {"kind": "find", "res": [re.compile(p, flags) for p in patterns],
+            "fields": fields or {field: group}, "clean": clean}
+
+
+def near(anchor, pattern, field=None, before=0, after=0, flags=0, group=1, clean=None, fields=None,
+         max_anchors=MAX_ANCHORS):
+    """ค้น pattern ที่ครอบ anchor ภายในช่วง before ตัวอักษรก่อน ถึง after ตัวอักษรหลัง anchor แต่ละตัว (ตามลำดับ)
+    เวลาต่อหน้า = O(ความยาวหน้า + จำนวน anchor × ขนาดหน้าต่าง) ไม่ว่าข้อความจะเพี้ยนแค่ไหน"""
+    return {"kind": "near", "anchor": re.compile(anchor, flags), "re": re.compile(pattern, flags),
+            "before": before, "after": after, "max_anchors": max_anchors,
+            "fields": fields or {field: group}, "clean": clean}
+
+
+def line_at(field, index, clean=collapse):
+    return {"kind": "line_at", "fields": {field: None}, "index": index, "clean": clean}
+
+
+def labelled(field, label, flags=re.IGNORECASE, exclude=None, ahead=0):
+    """บรรทัดแรกที่ตรง label (และไม่ตรง exclude) ที่มีจำนวนเงินตัวแรก > 0
+    บนบรรทัดนั้นหรือภายใน ahead บรรทัดถัดไป"""
+    return {"kind": "labelled", "fields": {field: None}, "amount": True,
+            "label": re.compile(label, flags), "exclude": re.compile(exclude, flags) if exclude else None,
+            "ahead": ahead}
+
+
+def line_amounts(index, picks, min_lines=0):
+    """จำนวนเงิน > 0 บนบรรทัด index — picks = {จำนวน token ขั้นต่ำ: {ฟิลด์: ลำดับ}}
+    ใช้ picks ของจำนวน token มากสุดที่ไม่เกินที่พบ และต้องมีค่า > 0 ครบทุกฟิลด์"""
+    fields = {field: None for pick in picks.values() for field in pick}
+    return {"kind": "line_amounts", "fields": fields, "amount": True, "index": index,
+            "picks": sorted(picks.items()), "min_lines": min_lines}
+
+
+def amount_block(label, span, flags=re.IGNORECASE):
+    """บรรทัดแรกที่ตรง label แล้วเก็บจำนวนเงินตัวแรกของแต่ละบรรทัดใน span บรรทัด
+    ได้ ≥ 3 ตัว → Fee, VAT, total fee เป็นข้อความตามเอกสาร"""
+    return {"kind": "amount_block", "fields": {field: None for field in AMOUNT_FIELDS},
+            "label": re.compile(label, flags), "span": span}
+
+
+def guess_amounts():
+    """เดาจากจำนวนเงิน > 0 ทั้งหน้า (ไม่ซ้ำ เรียงน้อยไปมาก): VAT = น้อยสุด, Fee = รองมากสุด, total = มากสุด"""
+    return {"kind": "guess_amounts", "fields": {field: None for field in AMOUNT_FIELDS}, "amount": True}
+
+
+def reconcile_total(fill=False):
+    """total fee ≠ Fee + VAT (เกิน 0.01) → ใช้ Fee + VAT, fill=True คำนวณให้ถ้ายังไม่มี total fee"""
+    return {"kind": "reconcile_total", "fill": fill}
+
+
+def compute(fn):
+    """fn(page, data, values) สำหรับตรรกะเฉพาะกองทุน"""
+    return {"kind": "compute", "fn": fn}
+
+
+# -------------------- ENGINE --------------------
+def _done(rule, data, values, matched):
+    fields = rule.get("fields")
+    if not fields:
+        return False
+    if rule.get("amount"):
+        return all(values.get(field) for field in fields)
+    return all(data.get(field) or field in matched for field in fields)
+
+
+def _set_fields(rule, m, data, matched):
+    clean = rule["clean"]
+    for field, group in rule["fields"].items():
+        if data[field] or field in matched:
+            continue
+        value = m.group(group)
+        fn = clean.get(field) if isinstance(clean, dict) else clean
+        data[field] = fn(value) if fn else value
+        matched.add(field)
+
+
+def _apply_find(rule, page, data, matched, deadline):
+    for regex in rule["res"]:
+        if time.perf_counter() > deadline:
+            return
+        m = regex.search(page.text)
+        if m:
+            _set_fields(rule, m, data, matched)
+            return
+
+
+def _apply_near(rule, page, data, matched):
+    text = page.text
+    for n, anchor in enumerate(rule["anchor"].finditer(text)):
+        if n >= rule["max_anchors"]:
+            return
+        pos = max(0, anchor.start() - rule["before"])
+        end = min(len(text), anchor.end() + rule["after"])
+        while True:
+            m = rule["re"].search(text, pos, end)
+            if not m or m.start() > anchor.start():
+                break
+            # ใช้เฉพาะ match ที่ครอบ anchor นี้และไม่ชนขอบหน้าต่าง (อาจถูกตัด)
+            # match ของ anchor อื่นให้หน้าต่างของ anchor นั้นจับเอง
+            if m.end() >= anchor.end() and (m.end() < end or end == len(text)):
+                _set_fields(rule, m, data, matched)
+                return
+            pos = m.start() + 1
+
+
+def _scan_labelled(rules, page, values):
+    """กฎ labelled หลายฟิลด์ในการไล่บรรทัดรอบเดียว"""
+    pending = [rule for rule in rules if not values.get(next(iter(rule["fields"])))]
+    for i, line in enumerate(page.lines):
+        if not pending:
+            break
+        for rule in list(pending):
+            if not rule["label"].search(line):
+                continue
+            if rule["exclude"] is not None and rule["exclude"].search(line):
+                continue
+            for j in range(0, rule["ahead"] + 1):
+                if i + j >= len(page.lines):
+                    break
+                value = page.first_amount(i + j)
+                if value is not None and value > 0:
+                    values[next(iter(rule["fields"]))] = value
+                    pending.remove(rule)
+                    break
+
+
+def _apply(rule, page, data, values, matched, deadline):
+    kind = rule["kind"]
+    if kind == "find":
+        _apply_find(rule, page, data, matched, deadline)
+    elif kind == "near":
+        _apply_near(rule, page, data, matched)
+    elif kind == "line_at":
+        if len(page.lines) > rule["index"]:
+            value = page.lines[rule["index"]]
+            data[next(iter(rule["fields"]))] = rule["clean"](value) if rule["clean"] else value
+    elif kind == "line_amounts":
+        if len(page.lines) < rule["min_lines"] or len(page.lines) <= rule["index"]:
+            return
+        tokens = page.amounts(rule["index"])
+        picks = [pick for count, pick in rule["picks"] if count <= len(tokens)]
+        if not picks:
+            return
+        positives = [value for _, value in tokens if value > 0]
+        if len(positives) < len(picks[-1]):
+            return
+        for field, position in picks[-1].items():
+            if not values.get(field):
+                values[field] = positives[position]
+    elif kind == "amount_block":
+        for i, line in enumerate(page.lines):
+            if rule["label"].search(line):
+                numbers = [page.amounts(j)[0][0] for j in range(i, min(i + rule["span"], len(page.lines)))
+                           if page.amounts(j)]
+                if len(numbers) >= 3:
+                    data["Fee"], data["VAT"], data["total fee"] = numbers[:3]
+                break
+    elif kind == "guess_amounts":
+        numbers = sorted(set(round(n, 2) for n in page.all_amounts() if n > 0))
+        if len(numbers) >= 3:
+            values["VAT"] = values.get("VAT") or numbers[0]
+            values["Fee"] = values.get("Fee") or numbers[-2]
+            values["total fee"] = values.get("total fee") or numbers[-1]
+        elif len(numbers) == 2:
+            values["VAT"] = values.get("VAT") or numbers[0]
+            values["total fee"] = values.get("total fee") or numbers[1]
+            values["Fee"] = values.get("Fee") or values["total fee"] - values["VAT"]
+    elif kind == "reconcile_total":
+        fee, vat, total = (values.get(field) for field in AMOUNT_FIELDS)
+        if fee and vat and (total or rule["fill"]):
+            if not total or abs(total - (fee + vat)) > 0.01:
+                values["total fee"] = fee + vat
+    elif kind == "compute":
+        rule["fn"](page, data, values)
+
+
+def match(rules, text, budget_ms=None):
+    """ใช้กฎกับข้อความหนึ่งหน้า คืนค่า dict ตาม validate.REQUIRED
+    จำนวนเงินที่ได้จากกฎแบบตัวเลข (> 0) จัดรูปแบบเป็น 1,234.56"""
+    page = text if isinstance(text, PageText) else PageText(text)
+    data = {field: "" for field in validate.REQUIRED}
+    values = {}
+    matched = set()
+    deadline = time.perf_counter() + (BUDGET_MS if budget_ms is None else budget_ms) / 1000.0
+    over_budget = False
+
+    i = 0
+    while i < len(rules):
+        rule = rules[i]
+        if rule["kind"] == "labelled":
+            # รวมกฎ labelled ที่ติดกัน (คนละฟิลด์) เป็นการไล่บรรทัดรอบเดียว
+            batch, seen = [], set()
+            while i < len(rules) and rules[i]["kind"] == "labelled" and next(iter(rules[i]["fields"])) not in seen:
+                seen.add(next(iter(rules[i]["fields"])))
+                batch.append(rules[i])
+                i += 1
+            _scan_labelled(batch, page, values)
+            continue
+        if rule["kind"] in ("find", "near") and time.perf_counter() > deadline:
+            if not over_budget:
+                import extractors
+
+                extractors.log(f"⚠️ หน้านี้ใช้เวลาจับคู่เกิน {BUDGET_MS if budget_ms is None else budget_ms} ms "
+                               f"({len(page.text)} ตัวอักษร) ข้ามการค้นทั้งหน้าที่เหลือ")
+                over_budget = True
+        elif not _done(rule, data, values, matched):
+            _apply(rule, page, data, values, matched, deadline)
+        i += 1
+
+    for field in AMOUNT_FIELDS:
+        value = values.get(field)
+        if value and value > 0:
+            data[field] = validate.fmt(value)
+    return data
@@ -1,11 +1,13 @@
 import os
-import threading
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from tkinter import filedialog, messagebox
-from PyPDF2 import PdfMerger, PdfReader
+from jobbar import JobBar
+from progress import ProgressFeed
 import subprocess
 import platform
+import pdfjoin
+import unlock
 
 class MergePDFPage(ttk.Frame):
     def __init__(self, parent):
@@ -14,6 +16,8 @@ class MergePDFPage(ttk.Frame):
 
         self.merge_path_var = ttk.StringVar()
         self.password_var = ttk.StringVar()
+        self.streaming_var = ttk.BooleanVar(value=True)
+        self.append_var = ttk.BooleanVar(value=False)
 
         # ========== HEADER ==========
         ttk.Label(self, text="📄 Merge PDF Files",
@@ -44,6 +48,14 @@ class MergePDFPage(ttk.Frame):
         ttk.Entry(card, textvariable=self.password_var, show="*",
                   bootstyle="info", font=("Kanit", 10)).grid(row=1, column=1, sticky="ew", padx=(10, 0), pady=(15, 5))
 
+        # --- Streaming Mode ---
+        ttk.Checkbutton(card, text="ประหยัดหน่วยความจำ (เขียนทีละไฟล์ ไม่เก็บ bookmark)",
+                        variable=self.streaming_var,
+                        bootstyle="info-round-toggle").grid(row=2, column=1, sticky="w", padx=(10, 0), pady=(15, 5))
+        ttk.Checkbutton(card, text="เพิ่มเฉพาะไฟล์ใหม่ต่อท้าย merged.pdf เดิม",
+                        variable=self.append_var,
+                        bootstyle="info-round-toggle").grid(row=3, column=1, sticky="w", padx=(10, 0), pady=(5, 5))
+
         # ========== PROGRESS ==========
         self.progress = ttk.Progressbar(self, orient="horizontal",
                                         mode="determinate", length=600,
@@ -51,15 +63,15 @@ class MergePDFPage(ttk.Frame):
         self.progress.pack(pady=(20, 8))
         self.status_label = ttk.Label(self, text="พร้อมทำงาน", font=("Kanit", 10))
         self.status_label.pack(pady=(0, 15))
+        self.feed = ProgressFeed(self, self.progress, self.status_label)
 
         # ========== BUTTONS ==========
         btn_frame = ttk.Frame(self)
         btn_frame.pack()
 
-        self.merge_btn = ttk.Button(btn_frame, text="✨ รวมไฟล์ PDF ✨",
-                                    bootstyle="success-outline",
-                                    width=22, command=self.start_merge)
-        self.merge_btn.pack(side="left", padx=10)
+        self.job_bar = JobBar(btn_frame, "✨ รวมไฟล์ PDF ✨", self.merge_pdfs, self.merge_path_var.get,
+                              self.feed, params=self.read_form, bootstyle="success-outline", width=22)
+        self.job_bar.pack(side="left", padx=10)
 
         self.open_btn = ttk.Button(btn_frame, text="เปิดโฟลเดอร์ 📂",
                                    bootstyle="secondary", width=18,
@@ -75,61 +87,60 @@ class MergePDFPage(ttk.Frame):
         if folder_selected:
             self.merge_path_var.set(folder_selected)
 
-    def start_merge(self):
-        threading.Thread(target=self.merge_pdfs, daemon=True).start()
+    def read_form(self):
+        """ค่าจากฟอร์ม อ่านใน main loop ตอนกดเริ่ม (งานใน thread ของตัวจัดคิวไม่แตะตัวแปร Tk)"""
+        return {"folder_path": self.merge_path_var.get(), "password": self.password_var.get().strip(),
+                "streaming": self.streaming_var.get(), "append": self.append_var.get()}
 
-    def merge_pdfs(self):
-        folder_path = self.merge_path_var.get()
-        password = self.password_var.get().strip()
-        self.open_btn.configure(state="disabled")
+    def merge_pdfs(self, folder_path, password, streaming, append):
+        self.feed.call(self.open_btn.configure, state="disabled")
 
         if not folder_path:
-            messagebox.showwarning("กรุณาเลือกโฟลเดอร์", "กรุณาเลือกโฟลเดอร์ที่มีไฟล์ PDF")
+            self.feed.call(messagebox.showwarning, "กรุณาเลือกโฟลเดอร์", "กรุณาเลือกโฟลเดอร์ที่มีไฟล์ PDF")
             return
 
-        pdf_files = [f for f in os.listdir(folder_path) if f.lower().endswith(".pdf")]
+        # ไม่รวม merged.pdf ของรอบก่อนเข้าไปซ้ำ
+        pdf_files = [f for f in os.listdir(folder_path)
+                     if f.lower().endswith(".pdf") and f.lower() != pdfjoin.OUTPUT_NAME]
         pdf_files.sort()
         if not pdf_files:
-            messagebox.showwarning("ไม่พบไฟล์ PDF", "โฟลเดอร์นี้ไม่มีไฟล์ PDF")
+            self.feed.call(messagebox.showwarning, "ไม่พบไฟล์ PDF", "โฟลเดอร์นี้ไม่มีไฟล์ PDF")
             return
 
-        merger = PdfMerger()
-        total = len(pdf_files)
+        def on_file(i, total, path):
+            self.feed.update(value=i, maximum=total, text=f"กำลังรวมไฟล์ {i}/{total} ...{self.rss_text()}")
 
         try:
-            for i, filename in enumerate(pdf_files, start=1):
-                filepath = os.path.join(folder_path, filename)
-                reader = PdfReader(filepath)
-
-                if reader.is_encrypted:
-                    if not password:
-                        messagebox.showwarning("ไฟล์ถูกเข้ารหัส",
-                                               f"'{filename}' ต้องการรหัสผ่าน!\nกรุณาใส่รหัสผ่านแล้วลองใหม่.")
-                        return
-                    result = reader.decrypt(password)
-                    if result == 0:
-                        messagebox.showerror("รหัสผ่านไม่ถูกต้อง",
-                                             f"ไม่สามารถปลดล็อก '{filename}' ได้ (รหัสไม่ถูกต้อง)")
-                        return
-
-                merger.append(reader)
-                self.progress["value"] = (i / total) * 100
-                self.status_label.config(text=f"กำลังรวมไฟล์ {i}/{total} ...")
-                self.update_idletasks()
-
-            output_path = os.path.join(folder_path, "merged.pdf")
-            merger.write(output_path)
-            merger.close()
-
-            self.status_label.config(text="✅ รวมไฟล์เสร็จสิ้น!")
-            messagebox.showinfo("สำเร็จ!",
-                                f"รวมไฟล์เรียบร้อยแล้ว\n\nบันทึกไว้ที่:\n{output_path}")
-            self.open_btn.configure(state="normal")
+            self.feed.start(len(pdf_files), text="กำลังรวมไฟล์...", unit="ไฟล์")
+            output_path = os.path.join(folder_path, pdfjoin.OUTPUT_NAME)
+            # โหมดต่อท้ายใช้ได้กับ streaming เท่านั้น
+            pages = pdfjoin.merge_files([os.path.join(folder_path, f) for f in pdf_files], output_path,
+                                        password=password or None, streaming=streaming or append,
+                                        on_file=on_file, append=append)
+
+            if append and not pages:
+                self.feed.finish("✅ ไม่มีไฟล์ใหม่")
+                self.feed.call(messagebox.showinfo, "ไม่มีไฟล์ใหม่", f"ทุกไฟล์อยู่ใน merged.pdf แล้ว\n\n{output_path}")
+            else:
+                self.feed.finish(f"✅ รวมไฟล์เสร็จสิ้น! ({pages} หน้า){self.rss_text()}")
+                self.feed.call(messagebox.showinfo, "สำเร็จ!",
+                               f"รวมไฟล์เรียบร้อยแล้ว\n\nบันทึกไว้ที่:\n{output_path}")
+            self.feed.call(self.open_btn.configure, state="normal")
             self.output_path = output_path
+        except unlock.PasswordRequired as e:
+            self.feed.call(messagebox.showwarning, "ไฟล์ถูกเข้ารหัส",
+                           f"'{e}' ต้องการรหัสผ่าน!\nกรุณาใส่รหัสผ่านแล้วลองใหม่.")
+        except unlock.WrongPassword as e:
+            self.feed.call(messagebox.showerror, "รหัสผ่านไม่ถูกต้อง",
+                           f"ไม่สามารถปลดล็อก '{e}' ได้ (รหัสไม่ถูกต้อง)")
         except Exception as e:
-            messagebox.showerror("ข้อผิดพลาด", str(e))
+            self.feed.call(messagebox.showerror, "ข้อผิดพลาด", str(e))
         finally:
-            self.progress["value"] = 0
+            self.feed.update(value=0)
+
+    def rss_text(self):
+        peak = pdfjoin.peak_rss_mb()
+        return f" (หน่วยความจำสูงสุด {peak:.0f} MB)" if peak else ""
 
     def open_folder(self):
         if hasattr(self, "output_path"):
@@ -0,0 +1,305 @@
+import hashlib
+import os
+import platform
+import shlex
+import subprocess
+import tempfile
+import threading
+
+# ตั้ง path tesseract ครั้งเดียวต่อ process (ไม่ต้อง import ttkbootstrap)
+_configured = False
+
+
+def setup_tesseract():
+    global _configured
+    if _configured:
+        return
+    import pytesseract
+
+    if platform.system() == "Windows":
+        pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+    elif platform.system() == "Darwin":  # macOS
+        # Check common macOS locations
+        possible_paths = ["/opt/homebrew/bin/tesseract", "/usr/local/bin/tesseract", "/usr/bin/tesseract"]
+        for path in possible_paths:
+            if os.path.exists(path):
+                pytesseract.pytesseract.tesseract_cmd = path
+                break
+        # If not found, pytesseract will try to use 'tesseract' from PATH
+    _configured = True
+
+
+# -------------------- ENGINE --------------------
+# auto = ใช้ tesserocr ถ้าติดตั้งไว้ ไม่งั้นใช้ pytesseract
+ENGINE = os.environ.get("FUNDFEE_OCR_ENGINE", "auto")
+
+
+def parse_config(config):
+    """แยก "--oem 3 --psm 6 -c key=value" เป็น (oem, psm, [(key, value)])"""
+    oem = psm = None
+    variables = []
+    args = shlex.split(config or "")
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ("--oem", "--psm") and i + 1 < len(args):
+            if arg == "--oem":
+                oem = int(args[i + 1])
+            else:
+                psm = int(args[i + 1])
+            i += 2
+        elif arg == "-c" and i + 1 < len(args) and "=" in args[i + 1]:
+            variables.append(tuple(args[i + 1].split("=", 1)))
+            i += 2
+        else:
+            i += 1
+    return oem, psm, variables
+
+
+def to_pil(img):
+    if hasattr(img, "mode"):
+        return img
+    from PIL import Image
+
+    return Image.fromarray(img)
+
+
+class PytesseractEngine:
+    """เรียก tesseract เป็น subprocess (ทุกครั้งต้องเริ่ม process และโหลด traineddata ใหม่)
+    batch() ส่งหลายภาพใน subprocess เดียวเพื่อจ่ายต้นทุนนั้นครั้งเดียว"""
+
+    name = "pytesseract"
+
+    def __init__(self):
+        setup_tesseract()
+
+    def version(self):
+        import pytesseract
+
+        try:
+            return str(pytesseract.get_tesseract_version())
+        except Exception:
+            return "unknown"
+
+    def image_to_string(self, img, lang="eng+tha", config=""):
+        import pytesseract
+
+        return pytesseract.image_to_string(to_pil(img), lang=lang, config=config)
+
+    def batch(self, images, lang="eng+tha", config=""):
+        import pytesseract
+
+        if len(images) <= 1:
+            return [self.image_to_string(img, lang=lang, config=config) for img in images]
+        with tempfile.TemporaryDirectory(prefix="fundfee-ocr-") as tmp:
+            paths = []
+            for n, img in enumerate(images):
+                path = os.path.join(tmp, f"{n:05d}.png")
+                to_pil(img).save(path)
+                paths.append(path)
+            list_path = os.path.join(tmp, "images.txt")
+            with open(list_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(paths) + "\n")
+            cmd = [pytesseract.pytesseract.tesseract_cmd, list_path, "stdout", "-l", lang] + shlex.split(config or "")
+            out = subprocess.run(cmd, capture_output=True, check=True).stdout.decode("utf-8", "replace")
+        # tesseract คั่นแต่ละภาพด้วย form feed
+        texts = out.split("\f")
+        if texts and not texts[-1].strip():
+            texts = texts[:-1]
+        if len(texts) != len(images):
+            return [self.image_to_string(img, lang=lang, config=config) for img in images]
+        return texts
+
+
+class TesserocrEngine:
+    """libtesseract ใน process เดียวกัน (tesserocr) เก็บ API ที่ init แล้วไว้ใช้ซ้ำ
+    แยกต่อ thread เพราะ PyTessBaseAPI ใช้ข้าม thread พร้อมกันไม่ได้"""
+
+    name = "tesserocr"
+
+    def __init__(self):
+        import tesserocr  # ImportError → ใช้ pytesseract แทน
+
+        self._tesserocr = tesserocr
+        self._local = threading.local()
+
+    def version(self):
+        return self._tesserocr.tesseract_version().splitlines()[0]
+
+    def _api(self, lang, config):
+        apis = self._local.__dict__.setdefault("apis", {})
+        key = (lang, config)
+        if key not in apis:
+            oem, psm, variables = parse_config(config)
+            kwargs = {"lang": lang}
+            if oem is not None:
+                kwargs["oem"] = oem
+            if psm is not None:
+                kwargs["psm"] = psm
+            if os.environ.get("TESSDATA_PREFIX"):
+                kwargs["path"] = os.environ["TESSDATA_PREFIX"]
+            api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            for name, value in variables:
+                api.SetVariable(name, value)
+            apis[key] = api
+        return apis[key]
+
+    def image_to_string(self, img, lang="eng+tha", config=""):
+        api = self._api(lang, config)
+        api.SetImage(to_pil(img))
+        return api.GetUTF8Text()
+
+    def batch(self, images, lang="eng+tha", config=""):
+        return [self.image_to_string(img, lang=lang, config=config) for img in images]
+
+
+ENGINES = {"tesserocr": TesserocrEngine, "pytesseract": PytesseractEngine}
+
+_engine = None
+_engine_pid = None
+
+
+def get_engine():
+    """engine ของ process นี้ (สร้างครั้งเดียว อยู่ไปตลอดอายุ process / worker)"""
+    global _engine, _engine_pid
+    if _engine is None or _engine_pid != os.getpid():
+        if ENGINE == "auto":
+            try:
+                _engine = TesserocrEngine()
+            except ImportError:
+                _engine = PytesseractEngine()
+        elif ENGINE in ENGINES:
+            _engine = ENGINES[ENGINE]()
+        else:
+            raise ValueError(f"ไม่รู้จัก OCR engine: {ENGINE} (ใช้ได้: auto, {', '.join(sorted(ENGINES))})")
+        _engine_pid = os.getpid()
+    return _engine
+
+
+# -------------------- OCR --------------------
+def image_to_string(img, lang="eng+tha", config=""):
+    return get_engine().image_to_string(img, lang=lang, config=config)
+
+
+def images_to_strings(images, lang="eng+tha", config=""):
+    return get_engine().batch(list(images), lang=lang, config=config)
+
+
+def ocr_page(page, resolution, lang="eng+tha", config="", preprocess=None):
+    """OCR หน้า pdfplumber ผ่านแคช — แคชโดนแล้วไม่ต้อง render ภาพหรือเรียก tesseract"""
+    key = None
+    if CACHE_ENABLED:
+        fingerprint = page_fingerprint(page)
+        if fingerprint:
+            key = cache_key(fingerprint, resolution, lang, config, preprocess)
+            text = get_cache().get(key)
+            if text is not None:
+                return text
+
+    img = page.to_image(resolution=resolution).original
+    if CACHE_ENABLED and key is None:
+        # หา fingerprint จาก page object ไม่ได้ → ใช้ hash ของภาพแทน
+        digest = hashlib.sha256(img.tobytes())
+        digest.update(f"{img.mode}{img.size}".encode())
+        key = cache_key("img:" + digest.hexdigest(), resolution, lang, config, preprocess)
+        text = get_cache().get(key)
+        if text is not None:
+            return text
+
+    if preprocess:
+        img = preprocess(img)
+    text = image_to_string(img, lang=lang, config=config)
+    if key:
+        get_cache().put(key, text)
+    return text
+
+
+def preprocess_scb(img):
+    """เตรียมภาพสำหรับ OCR ของ SCBAM (gray → median blur → threshold)"""
+    import cv2
+    import numpy as np
+
+    gray = cv2.cvtColor(np.array(img), cv2.COLOR_BGR2GRAY)
+    gray = cv2.medianBlur(gray, 3)
+    _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
+    return thresh
+
+
+# -------------------- OCR CACHE --------------------
+# เปลี่ยนเลขนี้เมื่อแก้ preprocess / วิธี render เพื่อล้างแคชเดิมทั้งหมด
+CACHE_VERSION = 1
+CACHE_ENABLED = os.environ.get("FUNDFEE_NO_OCR_CACHE", "") == ""
+CACHE_MAX_MB = int(os.environ.get("FUNDFEE_OCR_CACHE_MB", "256"))
+
+_cache = None
+_cache_lock = threading.Lock()
+_tesseract_version = None
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from cache import LRUCache, cache_dir
+
+            _cache = LRUCache(os.path.join(cache_dir(), "ocr.sqlite3"), CACHE_MAX_MB * 1024 * 1024)
+        return _cache
+
+
+def tesseract_version():
+    global _tesseract_version
+    if _tesseract_version is None:
+        _tesseract_version = get_engine().version()
+    return _tesseract_version
+
+
+def cache_key(fingerprint, resolution, lang, config, preprocess):
+    name = getattr(preprocess, "__name__", "") if preprocess else ""
+    raw = "|".join([str(CACHE_VERSION), fingerprint, str(resolution), lang, config, name, tesseract_version()])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def page_fingerprint(page):
+    """hash ของเนื้อหาหน้าเอง (content stream + XObject ภาพ/ฟอร์ม + font + ขนาดหน้า)
+    ไฟล์เดิมหรือหน้าที่เหมือนกันทุกไบต์ได้ค่าเดิมโดยไม่ต้อง render"""
+    try:
+        from pdfminer.pdftypes import resolve1
+
+        page_obj = page.page_obj
+        digest = hashlib.sha256()
+        digest.update(repr((page_obj.mediabox, page_obj.rotate)).encode())
+        for stream in _as_list(resolve1(page_obj.attrs.get("Contents"))):
+            digest.update(_stream_bytes(resolve1(stream)))
+        _hash_resources(digest, page_obj.resources, depth=0)
+        return digest.hexdigest()
+    except Exception:
+        return None
+
+
+def _as_list(obj):
+    if obj is None:
+        return []
+    return obj if isinstance(obj, list) else [obj]
+
+
+def _stream_bytes(stream):
+    raw = getattr(stream, "rawdata", None)
+    if raw is None:
+        raw = stream.get_data()
+    return raw
+
+
+def _hash_resources(digest, resources, depth):
+    from pdfminer.pdftypes import PDFStream, resolve1
+
+    resources = resolve1(resources) or {}
+    for name, font in sorted((resolve1(resources.get("Font")) or {}).items()):
+        font = resolve1(font) or {}
+        digest.update(f"F{name}{font.get('BaseFont')}".encode())
+    for name, xobj in sorted((resolve1(resources.get("XObject")) or {}).items()):
+        xobj = resolve1(xobj)
+        digest.update(f"X{name}".encode())
+        if isinstance(xobj, PDFStream):
+            digest.update(_stream_bytes(xobj))
+            if depth < 3 and xobj.attrs.get("Resources") is not None:
+                _hash_resources(digest, xobj.attrs.get("Resources"), depth + 1)
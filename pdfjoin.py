@@ -0,0 +1,331 @@
+import json
+import os
+import sys
+from collections import deque
+
+import cache
+import jobs
+import unlock
+
+# รวม PDF หลายไฟล์ (ไม่ขึ้นกับ Tk) ใช้โดยหน้า Merge PDF
+#
+# โหมดปกติใช้ PdfMerger ของ PyPDF2: เก็บ object ของทุกไฟล์ไว้ในหน่วยความจำจนเขียนตอนท้าย
+# โหมด streaming (StreamingPdfWriter) เขียน object ของแต่ละไฟล์ลง output ทันทีที่คัดลอก แล้วปล่อย reader ทิ้ง
+# → หน่วยความจำสูงสุดขึ้นกับไฟล์ input ที่ใหญ่ที่สุด ไม่ใช่ผลรวมทั้งโฟลเดอร์
+# (เก็บไว้ตลอดแค่ตำแหน่ง object และเลข object ของแต่ละหน้า) ไม่คัดลอก bookmark / named destination
+#
+# โหมดต่อท้าย (append) ใช้ manifest ข้าง merged.pdf บันทึก sha256 ของไฟล์ที่รวมไปแล้ว
+# รอบถัดไปเขียนเฉพาะหน้าของไฟล์ใหม่ต่อท้าย merged.pdf เดิมเป็น PDF incremental update
+# (object ใหม่ + Pages ที่มี Kids ครบ + xref ของส่วนที่เพิ่ม /Prev ชี้ xref เดิม) ไม่ต้องอ่านไฟล์เก่าซ้ำ
+
+OUTPUT_NAME = "merged.pdf"
+MANIFEST_VERSION = 1
+
+
+def open_reader(path, password=None):
+    """PdfReader ของไฟล์ (ไฟล์เข้ารหัสเปิดจากสำเนาที่ถอดแล้วของ unlock) รหัสผิด → unlock.WrongPassword"""
+    from PyPDF2 import PdfReader
+
+    path, password = unlock.resolve(path, password)
+    reader = PdfReader(path)
+    if reader.is_encrypted:
+        # ปิดแคชสำเนาไว้ (FUNDFEE_NO_UNLOCK_CACHE) → ถอดเองด้วยรหัสที่ resolve เลือกให้
+        reader.decrypt(password or "")
+    return reader
+
+
+def peak_rss_mb():
+    """หน่วยความจำสูงสุดของ process นี้ (MB) หรือ None ถ้าหาไม่ได้"""
+    try:
+        import resource
+    except ImportError:
+        return _peak_rss_windows()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux รายงานเป็น KB, macOS เป็น byte
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _peak_rss_windows():
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32, psapi = ctypes.windll.kernel32, ctypes.windll.psapi
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS),
+                                               wintypes.DWORD]
+        if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+    except Exception:
+        return None
+
+
+# -------------------- STREAMING WRITER --------------------
+class StreamingPdfWriter:
+    """เขียน PDF ทีละ object ต่อท้ายไฟล์ทันที หน้าทั้งหมดอยู่ใต้ Pages เดียว (object 1) Catalog = object 2
+
+    object ของแต่ละไฟล์ถูกเลขใหม่ต่อจากไฟล์ก่อนหน้า (object ที่ใช้ร่วมกันในไฟล์เดียวกันเขียนครั้งเดียว)
+    เขียนลง <output>.part แล้วค่อยแทนที่ตอน close
+    resume = manifest ของไฟล์เดิม (load_manifest) → เขียนต่อท้ายไฟล์เดิมเป็น incremental update แทน
+    """
+
+    PAGES, CATALOG = 1, 2
+
+    def __init__(self, output_path, resume=None):
+        self.output_path = output_path
+        self.resume = resume
+        if resume:
+            self.tmp_path = None
+            self.out = open(output_path, "r+b")
+            self.out.seek(resume["size"])
+            self.base = resume["objects"]
+            self.kids = list(resume["kids"])
+        else:
+            self.tmp_path = output_path + ".part"
+            self.out = open(self.tmp_path, "wb")
+            self.out.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+            self.base = 3
+            self.kids = []
+        self.offsets = []  # ตำแหน่งของ object ที่เขียนรอบนี้ (เลข object = base + index)
+        self.xref = None
+
+    def _new(self):
+        self.offsets.append(0)
+        return self.base + len(self.offsets) - 1
+
+    def append_reader(self, reader, pages=None):
+        """คัดลอกหน้าของ reader (PyPDF2) คืนค่าจำนวนหน้า pages = index หน้า (0-based) ที่ต้องการ (None = ทุกหน้า)
+
+        ลิงก์ที่ชี้ไปหน้าที่ไม่ได้เลือกกลายเป็น null (ไม่ลาก page tree ทั้งไฟล์ตามมา)"""
+        mapping, queue = {}, deque()
+
+        def ref(indirect):
+            key = (indirect.idnum, indirect.generation)
+            num = mapping.get(key)
+            if num is None:
+                num = mapping[key] = self._new()
+                queue.append((num, indirect))
+            return num
+
+        # จองเลขของทุกหน้าก่อน → annotation / link ที่ชี้ไปหน้าอื่นในไฟล์เดียวกันได้เลขใหม่ที่ถูกต้อง
+        wanted = None if pages is None else set(pages)
+        selected = []
+        for index, page in enumerate(reader.pages):
+            original = getattr(page, "indirect_reference", None) or getattr(page, "indirect_ref", None)
+            if wanted is not None and index not in wanted:
+                if original is not None:
+                    mapping[(original.idnum, original.generation)] = 0
+                continue
+            num = self._new()
+            if original is not None:
+                mapping[(original.idnum, original.generation)] = num
+            selected.append((num, page))
+
+        for num, page in selected:
+            # PyPDF2 คัดลอก attribute ที่สืบทอดจาก Pages (Resources / MediaBox / ...) ลงในหน้าให้แล้ว
+            self._write_object(num, page, ref, parent=self.PAGES)
+            self.kids.append(num)
+            while queue:
+                child, indirect = queue.popleft()
+                self._write_object(child, indirect.get_object(), ref)
+        return len(selected)
+
+    def _write_object(self, num, obj, ref, parent=None):
+        self.offsets[num - self.base] = self.out.tell()
+        self.out.write(b"%d 0 obj\n" % num)
+        self._write_value(obj, ref, parent)
+        self.out.write(b"\nendobj\n")
+
+    def _write_value(self, obj, ref, parent=None):
+        from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+        out = self.out
+        if obj is None:
+            out.write(b"null")
+        elif isinstance(obj, IndirectObject):
+            num = ref(obj)
+            out.write(b"%d 0 R" % num if num else b"null")
+        elif isinstance(obj, DictionaryObject):
+            stream = isinstance(obj, StreamObject)
+            out.write(b"<<")
+            for key, value in obj.items():
+                if (stream and key == "/Length") or (parent is not None and key == "/Parent"):
+                    continue
+                out.write(b"\n")
+                key.write_to_stream(out, None)
+                out.write(b" ")
+                self._write_value(value, ref)
+            if parent is not None:
+                out.write(b"\n/Parent %d 0 R" % parent)
+            if stream:
+                out.write(b"\n/Length %d" % len(obj._data))
+            out.write(b"\n>>")
+            if stream:
+                out.write(b"\nstream\n")
+                out.write(obj._data)
+                out.write(b"\nendstream")
+        elif isinstance(obj, ArrayObject):
+            out.write(b"[")
+            for n, value in enumerate(obj):
+                if n:
+                    out.write(b" ")
+                self._write_value(value, ref)
+            out.write(b"]")
+        else:
+            obj.write_to_stream(out, None)
+
+    def close(self):
+        out = self.out
+        pages_at = out.tell()
+        out.write(b"%d 0 obj\n<< /Type /Pages /Count %d /Kids [" % (self.PAGES, len(self.kids)))
+        for n, num in enumerate(self.kids):
+            out.write(b"%s%d 0 R" % (b"\n" if n % 16 == 0 else b" ", num))
+        out.write(b"] >>\nendobj\n")
+        if not self.resume:
+            catalog_at = out.tell()
+            out.write(b"%d 0 obj\n<< /Type /Catalog /Pages %d 0 R >>\nendobj\n" % (self.CATALOG, self.PAGES))
+
+        # incremental update: xref มีแค่ Pages ที่เขียนใหม่ + object ของรอบนี้ ที่เหลือตาม /Prev
+        # (ขึ้นต้นด้วย object 0 เสมอ reader บางตัวถือว่า xref ที่ไม่เริ่มจาก 0 เป็นเลขเพี้ยน)
+        self.xref = out.tell()
+        out.write(b"xref\n0 1\n0000000000 65535 f \n")
+        if self.resume:
+            out.write(b"%d 1\n%010d 00000 n \n" % (self.PAGES, pages_at))
+        else:
+            out.write(b"1 2\n%010d 00000 n \n%010d 00000 n \n" % (pages_at, catalog_at))
+        if self.offsets:
+            out.write(b"%d %d\n" % (self.base, len(self.offsets)))
+            for offset in self.offsets:
+                out.write(b"%010d 00000 n \n" % offset)
+        prev = b" /Prev %d" % self.resume["xref"] if self.resume else b""
+        out.write(b"trailer\n<< /Size %d /Root %d 0 R%s >>\nstartxref\n%d\n%%%%EOF\n"
+                  % (self.base + len(self.offsets), self.CATALOG, prev, self.xref))
+        out.close()
+        if self.tmp_path:
+            os.replace(self.tmp_path, self.output_path)
+
+    def abort(self):
+        if self.resume:
+            # ตัดส่วนที่ต่อท้ายทิ้ง ไฟล์กลับเป็นเหมือนก่อนเริ่ม
+            self.out.truncate(self.resume["size"])
+            self.out.close()
+            return
+        self.out.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def state(self):
+        """ข้อมูลสำหรับต่อท้ายรอบถัดไป (หลัง close)"""
+        return {"size": os.path.getsize(self.output_path), "xref": self.xref,
+                "objects": self.base + len(self.offsets), "kids": self.kids}
+
+
+# -------------------- MANIFEST --------------------
+def manifest_path(output_path):
+    """merged.pdf → merged.manifest.json"""
+    return os.path.splitext(output_path)[0] + ".manifest.json"
+
+
+def load_manifest(output_path):
+    """manifest ที่ตรงกับ output_path ปัจจุบัน หรือ None (ไม่มี / ไฟล์ถูกแก้หลังรวม → ต้องรวมใหม่ทั้งหมด)"""
+    try:
+        with open(manifest_path(output_path), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION and os.path.getsize(output_path) == manifest["size"]:
+            return manifest
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def save_manifest(output_path, manifest):
+    path = manifest_path(output_path)
+    with open(path + ".part", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(path + ".part", path)
+
+
+def remove_manifest(output_path):
+    try:
+        os.remove(manifest_path(output_path))
+    except FileNotFoundError:
+        pass
+
+
+def source_entry(path, known=None):
+    """{name, size, mtime, sha256, pages} ของไฟล์ต้นฉบับ hash ซ้ำเฉพาะไฟล์ที่ชื่อ/ขนาด/เวลาไม่ตรงกับ known"""
+    st = os.stat(path)
+    entry = {"name": os.path.basename(path), "size": st.st_size, "mtime": st.st_mtime_ns}
+    old = (known or {}).get(entry["name"])
+    if old and old["size"] == entry["size"] and old["mtime"] == entry["mtime"]:
+        entry["sha256"] = old["sha256"]
+    else:
+        entry["sha256"] = cache.file_digest(path)
+    return entry
+
+
+# -------------------- MERGE --------------------
+def merge_files(paths, output_path, password=None, streaming=True, on_file=None, append=False):
+    """รวม paths ตามลำดับเป็น output_path คืนค่าจำนวนหน้าที่เขียน on_file(i, total, path) หลังแต่ละไฟล์
+
+    append=True (streaming เท่านั้น): ถ้า output_path มี manifest ที่ตรงกัน เพิ่มเฉพาะไฟล์ที่ sha256 ยังไม่อยู่ใน
+    manifest ต่อท้าย (ไม่มีไฟล์ใหม่ → คืนค่า 0 ไม่แตะไฟล์) ไม่งั้นรวมใหม่ทั้งหมด
+    ไฟล์ที่ต้องใช้รหัสผ่าน → unlock.PasswordRequired / unlock.WrongPassword (ไม่เขียน output)"""
+    pages = 0
+    if not streaming:
+        from PyPDF2 import PdfMerger
+
+        merger = PdfMerger()
+        try:
+            for i, path in enumerate(paths, start=1):
+                jobs.checkpoint()
+                reader = open_reader(path, password)
+                pages += len(reader.pages)
+                merger.append(reader)
+                if on_file:
+                    on_file(i, len(paths), path)
+            merger.write(output_path)
+        finally:
+            merger.close()
+        # ไฟล์จาก PdfMerger ต่อท้ายแบบ incremental ไม่ได้
+        remove_manifest(output_path)
+        return pages
+
+    manifest = load_manifest(output_path) if append else None
+    sources = manifest["sources"] if manifest else []
+    known = {entry["name"]: entry for entry in sources}
+    done = {entry["sha256"] for entry in sources}
+    todo = []
+    for path in paths:
+        entry = source_entry(path, known)
+        if not (manifest and entry["sha256"] in done):
+            done.add(entry["sha256"])
+            todo.append((path, entry))
+    if manifest and not todo:
+        return 0
+
+    writer = StreamingPdfWriter(output_path, resume=manifest)
+    try:
+        for i, (path, entry) in enumerate(todo, start=1):
+            jobs.checkpoint()
+            entry["pages"] = writer.append_reader(open_reader(path, password))
+            pages += entry["pages"]
+            if on_file:
+                on_file(i, len(todo), path)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    save_manifest(output_path, dict(writer.state(), version=MANIFEST_VERSION,
+                                    sources=sources + [entry for _, entry in todo]))
+    return pages
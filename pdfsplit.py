@@ -0,0 +1,114 @@
+import os
+import re
+
+import extractors
+import jobs
+import pdfjoin
+import unlock
+
+# แยกไฟล์ PDF ที่มีใบกำกับหลายใบ (หน้าละใบ) เป็นไฟล์ละใบ ชื่อไฟล์ = <เลขที่>_<Unitholder No.>.pdf
+#
+# ใช้ตัวสกัดรายหน้าของกองทุนเดิม (iter_provider_files: SCBAM แบ่งหน้าให้หลาย process + แคชผลลัพธ์)
+# แล้วกระจายการเขียนไฟล์ผลลัพธ์ให้ process pool แต่ละ worker เปิดไฟล์ต้นฉบับครั้งเดียวต่อชุดงาน
+# หน้าที่ติดกันและได้ชื่อเดียวกันรวมเป็นไฟล์เดียว หน้าที่อ่านเลขที่ไม่ได้ใช้ <ชื่อไฟล์>_p<หน้า>.pdf
+# ชื่อไฟล์กำหนดจากข้อมูลในหน้าเท่านั้น (รันซ้ำได้ชื่อเดิม) ไฟล์ที่มีอยู่แล้วจะถูกข้าม
+
+PROVIDERS = ("scbam", "assetfund")
+
+_UNSAFE = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def safe_name(value):
+    return _UNSAFE.sub("-", str(value or "")).strip("-.")
+
+
+def page_name(data, stem, page_num):
+    """ชื่อไฟล์ (ไม่รวมนามสกุล) ของหนึ่งหน้า"""
+    invoice = "" if str(data.get("เลขที่", "")).startswith("ERROR:") else safe_name(data.get("เลขที่"))
+    if not invoice:
+        return f"{stem}_p{page_num:04d}"
+    holder = safe_name(data.get("Unitholder No."))
+    return f"{invoice}_{holder}" if holder else invoice
+
+
+def plan_outputs(rows, stem):
+    """[(ชื่อไฟล์, [index หน้า 0-based])] ตามลำดับหน้า ชื่อซ้ำที่ไม่ติดกันเติม _p<หน้าแรก>"""
+    plan, used = [], set()
+    for index, data in enumerate(rows):
+        name = page_name(data, stem, index + 1)
+        if plan and plan[-1][0] == name:
+            plan[-1][1].append(index)
+            continue
+        if name in used:
+            name = f"{name}_p{index + 1:04d}"
+        used.add(name)
+        plan.append((name, [index]))
+    return [(name + ".pdf", pages) for name, pages in plan]
+
+
+def write_outputs(source, targets, password=None):
+    """เขียน targets = [(output_path, [index หน้า])] จากไฟล์ต้นฉบับเดียว (เปิดครั้งเดียว) คืนค่าจำนวนไฟล์ที่เขียน"""
+    reader = pdfjoin.open_reader(source, password)
+    for output_path, pages in targets:
+        jobs.checkpoint()
+        writer = pdfjoin.StreamingPdfWriter(output_path)
+        try:
+            writer.append_reader(reader, pages)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+    return len(targets)
+
+
+def chunks(items, count):
+    """แบ่ง items เป็น count ชุดต่อเนื่องขนาดใกล้กัน"""
+    size = max(1, -(-len(items) // max(1, count)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def split_file(pdf_path, provider, out_dir=None, password=None, workers=None, on_page=None, on_write=None):
+    """แยก pdf_path เป็นไฟล์ละใบใน out_dir (ค่าเริ่มต้น <ชื่อไฟล์>_split ข้างไฟล์ต้นฉบับ)
+
+    on_page(pdf_path, page_num, total) ระหว่างสกัดข้อมูล, on_write(done, total) หลังเขียนแต่ละชุด
+    คืนค่า {"out_dir", "written": [...], "skipped": [...]} ไฟล์เปิดไม่ได้ → exception"""
+    if provider not in PROVIDERS:
+        raise ValueError(f"แยกไฟล์ได้เฉพาะ {', '.join(PROVIDERS)}")
+    workers = workers or extractors.default_workers()
+    stem = safe_name(os.path.splitext(os.path.basename(pdf_path))[0]) or "page"
+    out_dir = out_dir or os.path.join(os.path.dirname(os.path.abspath(pdf_path)), stem + "_split")
+
+    [(_, rows, _)] = list(extractors.iter_provider_files(provider, [pdf_path], password=password,
+                                                          workers=workers, on_page=on_page))
+    if len(rows) != extractors.read_page_count(pdf_path, password=password):
+        # เปิดไฟล์ไม่ได้ทั้งไฟล์ (ได้แถว ERROR แถวเดียว) → ไม่รู้ว่าหน้าไหนเป็นใบไหน
+        raise RuntimeError(str(rows[0].get("เลขที่", "")) if rows else "ไม่พบหน้าในไฟล์")
+
+    os.makedirs(out_dir, exist_ok=True)
+    plan = plan_outputs(rows, stem)
+    skipped = [name for name, _ in plan if os.path.exists(os.path.join(out_dir, name))]
+    targets = [(os.path.join(out_dir, name), pages) for name, pages in plan if name not in skipped]
+    written = [os.path.basename(path) for path, _ in targets]
+    if not targets:
+        return {"out_dir": out_dir, "written": written, "skipped": skipped}
+
+    # ถอดรหัส (ถ้ามี) ครั้งเดียวที่นี่ worker เปิดสำเนาเดียวกัน
+    source, source_password = unlock.resolve(pdf_path, password)
+    batches = chunks(targets, workers * 4)
+    done = 0
+    if workers <= 1 or len(batches) <= 1:
+        for batch in batches:
+            done += write_outputs(source, batch, source_password)
+            if on_write:
+                on_write(done, len(targets))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)), initializer=extractors._init_worker,
+                                 initargs=(extractors.worker_settings(),)) as pool:
+            futures = [pool.submit(write_outputs, source, batch, source_password) for batch in batches]
+            for future in as_completed(futures):
+                done += future.result()
+                if on_write:
+                    on_write(done, len(targets))
+    return {"out_dir": out_dir, "written": written, "skipped": skipped}
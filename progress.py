@@ -0,0 +1,141 @@
+import queue
+import time
+from collections import deque
+
+# ช่องทางส่งความคืบหน้าจาก thread ที่ทำงาน → หน้าจอ Tk (Tk ไม่ thread-safe)
+#
+# thread ที่ทำงานเรียก update() ได้ทุกหน้า (แค่ใส่ queue ไม่แตะ widget) ส่วน main loop ดึงทุกอย่างใน queue
+# ด้วย after() ที่ RATE_HZ รวมเป็นค่าล่าสุดแล้ววาดครั้งเดียว → หลายพันหน้าก็วาดไม่เกิน 10 ครั้งต่อวินาที
+# หน้าต่างแจ้งผล (messagebox) / ปุ่มที่ต้องแตะจากงานก็ส่งผ่าน call() ให้ main loop เรียกหลังวาดรอบนั้น
+# ความเร็ว (หน้า/วินาที) และเวลาที่เหลือคิดจากค่าเฉลี่ยเคลื่อนที่ของ AVG_SAMPLES รอบวาดล่าสุด (~5 วินาที)
+
+RATE_HZ = 10
+AVG_SAMPLES = 50
+# ยังไม่มีข้อมูลพอจะประมาณเวลาที่เหลือ (เช่น หน้าแรกยังไม่เสร็จ)
+MIN_SAMPLE_SECONDS = 0.5
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class Rate:
+    """หน่วย/วินาที จากค่าเฉลี่ยเคลื่อนที่ของ (เวลา, ค่า) ล่าสุด"""
+
+    def __init__(self, samples=AVG_SAMPLES):
+        self.samples = deque(maxlen=samples)
+
+    def reset(self):
+        self.samples.clear()
+
+    def add(self, at, value):
+        if self.samples and value < self.samples[-1][1]:
+            self.samples.clear()
+        self.samples.append((at, value))
+
+    def per_second(self):
+        if len(self.samples) < 2:
+            return None
+        (t0, v0), (t1, v1) = self.samples[0], self.samples[-1]
+        if t1 - t0 < MIN_SAMPLE_SECONDS or v1 <= v0:
+            return None
+        return (v1 - v0) / (t1 - t0)
+
+    def eta(self, value, maximum):
+        rate = self.per_second()
+        if not rate or maximum is None or value is None:
+            return None
+        return max(0.0, (maximum - value) / rate)
+
+
+class ProgressFeed:
+    """ความคืบหน้าของหนึ่งหน้าจอ: update / start / finish เรียกจาก thread ไหนก็ได้ วาดบน main loop เท่านั้น"""
+
+    def __init__(self, widget, progress_bar, status_label, hz=RATE_HZ):
+        self.widget = widget
+        self.progress_bar = progress_bar
+        self.status_label = status_label
+        self.interval = max(1, int(1000 / hz))
+        self.events = queue.SimpleQueue()
+        self.calls = queue.SimpleQueue()
+        self.rate = Rate()
+        self.value = None
+        self.maximum = None
+        self.text = None
+        self.unit = None
+        self.active = False
+        widget.after(self.interval, self._tick)
+
+    def update(self, value=None, maximum=None, text=None):
+        self.events.put((time.monotonic(), "update", value, maximum, text, None))
+
+    def start(self, maximum, text="เริ่มประมวลผล...", unit="หน้า"):
+        """เริ่มนับใหม่ (value = 0) unit ใช้แสดงความเร็ว เช่น "หน้า" / "ไฟล์" """
+        self.events.put((time.monotonic(), "start", 0, maximum, text, unit))
+
+    def finish(self, text, value=None):
+        """จบงาน: ข้อความสุดท้าย (ไม่มีความเร็ว / เวลาที่เหลือ) value None = progress ค้างไว้ที่เดิม"""
+        self.events.put((time.monotonic(), "finish", value, None, text, None))
+
+    def call(self, fn, *args, **kwargs):
+        """เรียก fn(*args, **kwargs) บน main loop (เช่น messagebox.showinfo) ไม่รอผล"""
+        self.calls.put((fn, args, kwargs))
+
+    def status(self):
+        """ข้อความที่แสดง (รวมความเร็ว / เวลาที่เหลือระหว่างทำงาน)"""
+        if not self.active or self.text is None:
+            return self.text
+        rate = self.rate.per_second()
+        if rate is None:
+            return self.text
+        text = f"{self.text} · {rate:.1f} {self.unit}/วินาที"
+        eta = self.rate.eta(self.value, self.maximum)
+        return text if eta is None else f"{text} · เหลือประมาณ {format_duration(eta)}"
+
+    def drain(self):
+        """รวมทุก event ที่ค้างใน queue เป็นค่าล่าสุด คืนค่า True ถ้ามีอะไรเปลี่ยน"""
+        changed, sample = False, None
+        while True:
+            try:
+                at, kind, value, maximum, text, unit = self.events.get_nowait()
+            except queue.Empty:
+                break
+            changed = True
+            if kind == "start":
+                self.rate.reset()
+                self.active, self.unit = True, unit
+            elif kind == "finish":
+                self.active = False
+            if maximum is not None:
+                self.maximum = maximum
+            if value is not None:
+                self.value = value
+                sample = (at, value) if self.active else None
+            if text is not None:
+                self.text = text
+        # หนึ่งตัวอย่างต่อรอบ: AVG_SAMPLES รอบ = ช่วงเวลาไม่กี่วินาทีล่าสุด ไม่ขึ้นกับว่าส่งมาถี่แค่ไหน
+        if sample is not None:
+            self.rate.add(*sample)
+        return changed
+
+    def _tick(self):
+        try:
+            if self.drain():
+                if self.maximum is not None:
+                    self.progress_bar["maximum"] = max(1, self.maximum)
+                if self.value is not None:
+                    self.progress_bar["value"] = self.value
+                if self.text is not None:
+                    self.status_label.config(text=self.status())
+            # หลังวาด: ข้อความสุดท้ายขึ้นก่อนหน้าต่างแจ้งผล
+            while True:
+                try:
+                    fn, args, kwargs = self.calls.get_nowait()
+                except queue.Empty:
+                    break
+                fn(*args, **kwargs)
+        finally:
+            self.widget.after(self.interval, self._tick)
@@ -0,0 +1,162 @@
+import os
+import re
+
+import ocr
+import validate
+
+# OCR เฉพาะบริเวณที่มีข้อมูล (ROI) แทนทั้งหน้า แต่ละบริเวณมี crop / dpi / ภาษา / whitelist ของตัวเอง
+#
+# box = (x0, top, x1, bottom) เป็นสัดส่วนของขนาดหน้า (0–1)
+# fields = {ชื่อคอลัมน์: regex ที่มี group เดียว}, "fees": True = ช่องค่าธรรมเนียม (หา Fee/VAT/total จากตัวเลข)
+# "line": ชื่อคอลัมน์ + "label": regex = ข้อความหลังคำกำกับบนบรรทัดเดียวกัน หรือบรรทัดถัดไปที่ไม่ว่าง
+# (ไม่เจอคำกำกับ = ไม่ได้ค่า → ไม่ผ่าน validate → OCR ทั้งหน้า)
+#
+# ค่า box เป็นแถบกว้าง ๆ ตามตำแหน่งบรรทัดที่ตัวสกัดเดิมใช้ (เช่น Eastspring บรรทัด 9 / 16–17) ยังไม่ได้เทียบกับ
+# สแกนจริง จึงปิดไว้เป็นค่าเริ่มต้น (เปิดด้วย FUNDFEE_ROI_OCR=1 / --roi-ocr) และชื่อกองทุนต้องอยู่ติดคำกำกับ
+# แบบเดียวกับตัวสกัดข้อความ เพราะ validate ตรวจได้แค่ว่าไม่ว่าง ชื่อผิดจะไม่ถูก OCR ทั้งหน้าซ้ำ
+
+DIGITS = "0123456789"
+AMOUNT = DIGITS + ".,"
+
+PROFILES = {
+    "scbam": [
+        {"name": "account", "box": (0.0, 0.0, 1.0, 0.35), "dpi": 300, "lang": "eng", "psm": 6,
+         "whitelist": DIGITS + "-/",
+         "fields": {"วันที่": r"\b([0-9]{1,2}/[0-9]{1,2}/[0-9]{4})\b",
+                    "Unitholder No.": r"([0-9]{3}-[0-9]-[0-9]{7}-[0-9])",
+                    "เลขที่": r"[0-9]{3}-[0-9]-[0-9]{7}-[0-9]\D{0,80}?([0-9]{6,12})"}},
+        {"name": "fund", "box": (0.0, 0.15, 1.0, 0.5), "dpi": 300, "lang": "eng", "psm": 6,
+         "fields": {"ชื่อกองทุน": r"\(([A-Z0-9]{3,})\)[^\S\r\n]*[\r\n]\s*(?i:Fund\s*Name)"}},
+        {"name": "fees", "box": (0.0, 0.35, 1.0, 0.9), "dpi": 300, "lang": "eng", "psm": 6,
+         "whitelist": AMOUNT, "fees": True},
+    ],
+    "eastspring": [
+        {"name": "header", "box": (0.0, 0.0, 1.0, 0.35), "dpi": 200, "lang": "eng", "psm": 6,
+         "fields": {"เลขที่": r"(T-I\d{1,2}-\d{8,20})",
+                    "วันที่": r"(\d{2}/\d{2}/\d{4})",
+                    "Unitholder No.": r"(\d{3}-\d-\d{5}-\d)"}},
+        {"name": "fund", "box": (0.0, 0.25, 1.0, 0.45), "dpi": 200, "lang": "eng+tha", "psm": 6,
+         "line": "ชื่อกองทุน", "label": r"(?i:Fund\s*Name|ชื่อกองทุน)\s*[:\-]?"},
+        {"name": "fees", "box": (0.0, 0.4, 1.0, 0.85), "dpi": 200, "lang": "eng", "psm": 6,
+         "whitelist": AMOUNT, "fees": True},
+    ],
+    "assetfund": [
+        {"name": "header", "box": (0.0, 0.0, 1.0, 0.35), "dpi": 200, "lang": "eng", "psm": 6,
+         "fields": {"เลขที่": r"([A-Z]{2,}-[A-Z0-9 ]{1,30}-CF-\d{11})",
+                    "วันที่": r"(\d{2}[/-]\d{2}[/-]\d{4})",
+                    "ชื่อกองทุน": r"\(([A-Z]{2,}-[A-Z0-9 ]{1,30})\)"}},
+        {"name": "unitholder", "box": (0.0, 0.1, 1.0, 0.45), "dpi": 200, "lang": "eng", "psm": 6,
+         "whitelist": DIGITS + "-", "fields": {"Unitholder No.": r"(\d{12}|\d{3}-\d-\d{5,7}-\d)"}},
+        {"name": "fees", "box": (0.0, 0.4, 1.0, 0.9), "dpi": 200, "lang": "eng", "psm": 6,
+         "whitelist": AMOUNT, "fees": True},
+    ],
+}
+
+ENABLED = os.environ.get("FUNDFEE_ROI_OCR", "") != ""
+# ถ้า ROI ไม่ผ่านติดกัน N หน้าโดยยังไม่เคยผ่านเลย ให้เลิกลองใน process นี้ (box ไม่ตรงกับ layout)
+GIVE_UP_AFTER = 5
+
+_stats = {}
+
+
+def region_config(region):
+    config = f"--psm {region.get('psm', 6)}"
+    if region.get("whitelist"):
+        config += f" -c tessedit_char_whitelist={region['whitelist']}"
+    return config
+
+
+# -------------------- OCR --------------------
+def ocr_regions(page, profile):
+    """ข้อความของแต่ละบริเวณ {name: text} — ดูแคชก่อน render หน้าเพียงครั้งเดียวที่ dpi สูงสุดที่ต้องใช้"""
+    fingerprint = ocr.page_fingerprint(page) if ocr.CACHE_ENABLED else None
+    texts, keys, todo = {}, {}, []
+    for region in profile:
+        if fingerprint:
+            keys[region["name"]] = ocr.cache_key(f"{fingerprint}|roi:{region['box']}", region["dpi"],
+                                                 region["lang"], region_config(region), None)
+            text = ocr.get_cache().get(keys[region["name"]])
+            if text is not None:
+                texts[region["name"]] = text
+                continue
+        todo.append(region)
+    if not todo:
+        return texts
+
+    dpi = max(region["dpi"] for region in todo)
+    img = page.to_image(resolution=dpi).original
+    width, height = img.size
+
+    # รวม batch ตามภาษา/config เดียวกัน → engine เรียก tesseract น้อยครั้งที่สุด
+    groups = {}
+    for region in todo:
+        x0, top, x1, bottom = region["box"]
+        crop = img.crop((int(x0 * width), int(top * height), int(x1 * width), int(bottom * height)))
+        if region["dpi"] != dpi:
+            scale = region["dpi"] / dpi
+            crop = crop.resize((max(1, int(crop.width * scale)), max(1, int(crop.height * scale))))
+        groups.setdefault((region["lang"], region_config(region)), []).append((region, crop))
+
+    for (lang, config), items in groups.items():
+        results = ocr.images_to_strings([crop for _, crop in items], lang=lang, config=config)
+        for (region, _), text in zip(items, results):
+            texts[region["name"]] = text
+            if region["name"] in keys:
+                ocr.get_cache().put(keys[region["name"]], text)
+    return texts
+
+
+# -------------------- FIELDS --------------------
+def labelled_line(text, label):
+    """ข้อความหลังคำกำกับ (บรรทัดเดียวกัน) หรือบรรทัดถัดไปที่ไม่ว่าง ไม่เจอคำกำกับคืนค่า "" """
+    lines = [l.strip() for l in text.splitlines() if l.strip()]
+    for i, line in enumerate(lines):
+        m = re.search(label, line)
+        if not m:
+            continue
+        rest = line[m.end():].strip()
+        if rest:
+            return re.sub(r"\s+", " ", rest)
+        return re.sub(r"\s+", " ", lines[i + 1]) if i + 1 < len(lines) else ""
+    return ""
+
+
+def fields_from_texts(profile, texts):
+    data = {field: "" for field in validate.REQUIRED}
+    for region in profile:
+        text = texts.get(region["name"], "")
+        for field, pattern in region.get("fields", {}).items():
+            m = re.search(pattern, text)
+            if m and not data[field]:
+                data[field] = re.sub(r"\s+", " ", m.group(1)).strip()
+        if region.get("line") and not data[region["line"]]:
+            data[region["line"]] = labelled_line(text, region["label"])
+        if region.get("fees"):
+            numbers = [validate.parse_amount(n) for n in validate.AMOUNT_RE.findall(text)]
+            triple = validate.find_fee_triple(numbers)
+            if triple:
+                data["Fee"], data["VAT"], data["total fee"] = (validate.fmt(x) for x in triple)
+    if "วันที่" in data:
+        data["วันที่"] = data["วันที่"].replace("-", "/")
+    return data
+
+
+def extract_fields(page, provider):
+    """OCR เฉพาะ ROI แล้วสกัดเป็นแถว คืนค่า None ถ้าไม่มี profile หรือผลไม่ผ่าน validate"""
+    profile = PROFILES.get(provider)
+    if not ENABLED or not profile:
+        return None
+    ok, failed = _stats.setdefault(provider, [0, 0])
+    if ok == 0 and failed >= GIVE_UP_AFTER:
+        return None
+
+    try:
+        data = fields_from_texts(profile, ocr_regions(page, profile))
+    except Exception as e:
+        print(f"⚠️ ROI OCR ไม่สำเร็จ: {e}")
+        data = {}
+    if validate.validate_row(data):
+        _stats[provider][1] += 1
+        return None
+    _stats[provider][0] += 1
+    return data
@@ -0,0 +1,363 @@
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+import extractors
+import pdfjoin
+import sinks
+
+# service HTTP ในเครื่อง: รับงานสกัดข้อมูล / รวม PDF เข้าคิวกลาง แล้วให้ดาวน์โหลดไฟล์ผลลัพธ์
+#
+# ทุกหน้าจอ (และทุกคนที่ชี้มาที่ service เดียวกัน) ใช้แคช OCR / แคชผลลัพธ์ชุดเดียวกัน ไฟล์ที่ทำแล้วไม่ต้อง OCR ซ้ำ
+# งานรันทีละ slots งาน แต่ละงานใช้ workers process → ไม่แย่ง CPU กันเองเหมือนเปิดหลายหน้าต่าง
+# งานเดียวกัน (ไฟล์ / กองทุน / รูปแบบ / รหัสผ่านเดียวกัน) ที่ยังอยู่ในคิวหรือกำลังรัน ได้ job เดิมกลับไป
+#
+#   POST /uploads?name=a.pdf   (body = ไฟล์ PDF)           → {"upload": id}
+#   POST /jobs                 {"kind": "extract" | "merge", "provider", "folder" | "files" | "uploads",
+#                               "password", "format"}      → job
+#   GET  /jobs, /jobs/<id>, /jobs/<id>/result, /health
+#
+# ไม่มีการยืนยันตัวตน รหัสผ่าน PDF ส่งเป็นข้อความธรรมดา → ค่าเริ่มต้นฟังเฉพาะ 127.0.0.1
+# หน้าจอ Tk ส่งงานมาที่ service เมื่อตั้ง FUNDFEE_SERVICE_URL (เช่น http://127.0.0.1:8765)
+
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_UPLOAD_MB = 512
+CHUNK = 1024 * 1024
+
+SERVICE_URL = os.environ.get("FUNDFEE_SERVICE_URL", "").rstrip("/")
+
+
+class Job:
+    def __init__(self, kind, paths, provider=None, fmt="xlsx", password=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.paths = paths
+        self.provider = provider
+        self.fmt = fmt
+        self.password = password
+        self.status = "queued"
+        self.done_files = 0
+        self.pages = 0
+        self.rows = 0
+        self.errors = 0
+        self.error = None
+        self.result = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    def key(self):
+        return self.kind, self.provider, self.fmt, tuple(self.paths), str(self.password)
+
+    def to_dict(self):
+        """สถานะที่ส่งให้ client (ไม่มีรหัสผ่าน / path ของไฟล์)"""
+        return {"id": self.id, "kind": self.kind, "provider": self.provider, "format": self.fmt,
+                "status": self.status, "total_files": len(self.paths), "done_files": self.done_files,
+                "pages": self.pages, "rows": self.rows, "errors": self.errors, "error": self.error,
+                "result": os.path.basename(self.result) if self.result else None,
+                "created": self.created, "started": self.started, "finished": self.finished}
+
+
+# -------------------- QUEUE --------------------
+class JobQueue:
+    """คิวงานกลาง: slots thread ดึงงานทีละงาน ผลลัพธ์เก็บใน work_dir/<job id>/"""
+
+    def __init__(self, work_dir, workers=None, slots=1):
+        self.work_dir = work_dir
+        self.workers = workers or extractors.default_workers()
+        self.jobs = {}
+        self.uploads = {}
+        self.lock = threading.Lock()
+        self.pending = queue.Queue()
+        self.threads = [threading.Thread(target=self._loop, daemon=True) for _ in range(max(1, slots))]
+        for thread in self.threads:
+            thread.start()
+
+    def add_upload(self, name, stream, length):
+        """เก็บไฟล์ที่อัปโหลด คืนค่า upload id"""
+        name = os.path.basename(name or "")
+        if not name.lower().endswith(".pdf"):
+            raise ValueError("ต้องเป็นไฟล์ .pdf")
+        if length > MAX_UPLOAD_MB * 1024 * 1024:
+            raise ValueError(f"ไฟล์ใหญ่เกิน {MAX_UPLOAD_MB} MB")
+        upload_id = uuid.uuid4().hex[:12]
+        folder = os.path.join(self.work_dir, "uploads", upload_id)
+        os.makedirs(folder)
+        path = os.path.join(folder, name)
+        with open(path, "wb") as f:
+            while length > 0:
+                data = stream.read(min(CHUNK, length))
+                if not data:
+                    raise ValueError("อัปโหลดไม่ครบ")
+                f.write(data)
+                length -= len(data)
+        with self.lock:
+            self.uploads[upload_id] = path
+        return upload_id
+
+    def submit(self, spec):
+        """spec จาก POST /jobs → Job (ค่าไม่ถูกต้อง → ValueError)"""
+        kind = spec.get("kind", "extract")
+        provider = spec.get("provider")
+        fmt = spec.get("format") or "xlsx"
+        if kind not in ("extract", "merge"):
+            raise ValueError(f"ไม่รู้จักงาน: {kind}")
+        if kind == "extract" and provider not in extractors.PROVIDERS:
+            raise ValueError(f"provider ต้องเป็น {', '.join(sorted(extractors.PROVIDERS))}")
+        if fmt not in sinks.FORMATS:
+            raise ValueError(f"ไม่รองรับรูปแบบไฟล์: {fmt}")
+
+        if spec.get("folder"):
+            folder = spec["folder"]
+            if not os.path.isdir(folder):
+                raise ValueError(f"ไม่พบโฟลเดอร์: {folder}")
+            paths = [os.path.join(folder, f) for f in sorted(extractors.list_pdfs(folder))
+                     if not (kind == "merge" and f == pdfjoin.OUTPUT_NAME)]
+        elif spec.get("uploads"):
+            with self.lock:
+                missing = [u for u in spec["uploads"] if u not in self.uploads]
+                paths = [self.uploads[u] for u in spec["uploads"] if u in self.uploads]
+            if missing:
+                raise ValueError(f"ไม่พบไฟล์ที่อัปโหลด: {', '.join(missing)}")
+        else:
+            paths = list(spec.get("files") or [])
+            for path in paths:
+                if not os.path.isfile(path):
+                    raise ValueError(f"ไม่พบไฟล์: {path}")
+        if not paths:
+            raise ValueError("ไม่พบไฟล์ PDF")
+
+        job = Job(kind, [os.path.abspath(p) for p in paths], provider if kind == "extract" else None, fmt,
+                  spec.get("password") or None)
+        with self.lock:
+            for other in self.jobs.values():
+                if other.status in ("queued", "running") and other.key() == job.key():
+                    return other
+            self.jobs[job.id] = job
+        self.pending.put(job)
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        with self.lock:
+            return sorted(self.jobs.values(), key=lambda job: job.created)
+
+    def _loop(self):
+        while True:
+            job = self.pending.get()
+            if job is None:
+                return
+            job.status, job.started = "running", time.time()
+            try:
+                self.run(job)
+                job.status = "done"
+            except Exception as e:
+                job.status, job.error = "failed", f"{type(e).__name__}: {e}"
+                extractors.log(f"⚠️ job {job.id} ล้มเหลว: {job.error}")
+            job.finished = time.time()
+
+    def run(self, job):
+        job_dir = os.path.join(self.work_dir, job.id)
+        os.makedirs(job_dir, exist_ok=True)
+        if job.kind == "merge":
+            def on_file(i, total, path):
+                job.done_files = i
+
+            output_path = os.path.join(job_dir, pdfjoin.OUTPUT_NAME)
+            job.pages = pdfjoin.merge_files(job.paths, output_path, password=job.password, on_file=on_file)
+            job.result = output_path
+            return
+
+        results = extractors.iter_provider_files(job.provider, job.paths, password=job.password,
+                                                 workers=self.workers)
+        with sinks.open_provider_sink(job.provider, job_dir, job.fmt) as sink:
+            for _, rows, pages in results:
+                sink.write_all(rows)
+                job.done_files += 1
+                job.pages += pages
+                job.rows, job.errors = sink.count, sink.errors
+        job.result = sink.output_path
+
+    def close(self):
+        for _ in self.threads:
+            self.pending.put(None)
+
+
+# -------------------- HTTP --------------------
+class Handler(BaseHTTPRequestHandler):
+    server_version = "fundfee"
+
+    def log_message(self, format, *args):
+        extractors.log(f"🌐 {self.address_string()} {format % args}")
+
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def route(self):
+        url = urlsplit(self.path)
+        return [part for part in url.path.split("/") if part], parse_qs(url.query)
+
+    def do_GET(self):
+        jobs = self.server.jobs
+        parts, _ = self.route()
+        if parts == ["health"]:
+            return self.send_json(200, {"ok": True, "queued": jobs.pending.qsize(), "workers": jobs.workers})
+        if parts == ["jobs"]:
+            return self.send_json(200, [job.to_dict() for job in jobs.list()])
+        job = jobs.get(parts[1]) if len(parts) in (2, 3) and parts[0] == "jobs" else None
+        if job is None:
+            return self.send_json(404, {"error": "not found"})
+        if len(parts) == 2:
+            return self.send_json(200, job.to_dict())
+        if parts[2] != "result":
+            return self.send_json(404, {"error": "not found"})
+        if job.status != "done":
+            return self.send_json(409, {"error": f"job {job.status}"})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(os.path.getsize(job.result)))
+        self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(os.path.basename(job.result))}")
+        self.end_headers()
+        with open(job.result, "rb") as f:
+            shutil.copyfileobj(f, self.wfile, CHUNK)
+
+    def do_POST(self):
+        jobs = self.server.jobs
+        parts, query = self.route()
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            if parts == ["uploads"]:
+                upload_id = jobs.add_upload(query.get("name", [""])[0], self.rfile, length)
+                return self.send_json(201, {"upload": upload_id})
+            if parts == ["jobs"]:
+                spec = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(spec, dict):
+                    raise ValueError("body ต้องเป็น JSON object")
+                return self.send_json(202, jobs.submit(spec).to_dict())
+        except ValueError as e:
+            return self.send_json(400, {"error": str(e)})
+        self.send_json(404, {"error": "not found"})
+
+
+def make_server(host=HOST, port=PORT, workers=None, slots=1, work_dir=None):
+    """ThreadingHTTPServer ที่มี .jobs (JobQueue) port=0 เลือก port ว่างให้ (ดู server.server_address)"""
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.jobs = JobQueue(work_dir or tempfile.mkdtemp(prefix="fundfee-service-"), workers, slots)
+    return server
+
+
+def serve(host=HOST, port=PORT, workers=None, slots=1, work_dir=None):
+    """รันจนกว่า Ctrl+C แล้วลบไฟล์ผลลัพธ์ / ไฟล์อัปโหลด (ถ้าไม่ได้กำหนด work_dir เอง)"""
+    server = make_server(host, port, workers, slots, work_dir)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        server.jobs.close()
+        if work_dir is None:
+            shutil.rmtree(server.jobs.work_dir, ignore_errors=True)
+
+
+# -------------------- CLIENT --------------------
+class Client:
+    """เรียก service จากหน้าจอ Tk / สคริปต์ (urllib เท่านั้น)"""
+
+    def __init__(self, url=None, timeout=30):
+        self.url = (url or SERVICE_URL or f"http://{HOST}:{PORT}").rstrip("/")
+        self.timeout = timeout
+
+    def is_local(self):
+        """service อยู่ในเครื่องนี้ (เปิดไฟล์ในเครื่องได้เอง ส่งแค่ path)"""
+        return urlsplit(self.url).hostname in ("127.0.0.1", "localhost", "::1")
+
+    def request(self, method, path, body=None, content_type="application/json"):
+        from urllib.error import HTTPError
+        from urllib.request import Request, urlopen
+
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        request = Request(self.url + path, data=body, method=method,
+                          headers={"Content-Type": content_type} if body is not None else {})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8"))["error"]
+            except Exception:
+                message = str(e)
+            raise RuntimeError(f"service: {message}") from None
+
+    def upload(self, pdf_path):
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+        return self.request("POST", "/uploads?name=" + quote(os.path.basename(pdf_path)), data,
+                            "application/pdf")["upload"]
+
+    def submit(self, kind="extract", provider=None, folder=None, files=None, password=None, fmt="xlsx",
+               upload=False):
+        """ส่งงาน คืนค่าสถานะ job upload=True ส่งเนื้อไฟล์ไปด้วย (service มองไม่เห็นไฟล์ในเครื่องนี้)"""
+        spec = {"kind": kind, "provider": provider, "password": password, "format": fmt}
+        if upload:
+            paths = files or [os.path.join(folder, f) for f in sorted(extractors.list_pdfs(folder))]
+            spec["uploads"] = [self.upload(path) for path in paths]
+        elif folder:
+            spec["folder"] = os.path.abspath(folder)
+        else:
+            spec["files"] = [os.path.abspath(path) for path in files]
+        return self.request("POST", "/jobs", spec)
+
+    def status(self, job_id):
+        return self.request("GET", f"/jobs/{job_id}")
+
+    def wait(self, job_id, on_progress=None, poll=0.5):
+        """รอจนงานเสร็จ on_progress(job) ทุกครั้งที่เช็ก งานล้มเหลว → RuntimeError"""
+        while True:
+            job = self.status(job_id)
+            if on_progress:
+                on_progress(job)
+            if job["status"] == "done":
+                return job
+            if job["status"] == "failed":
+                raise RuntimeError(job["error"])
+            time.sleep(poll)
+
+    def download(self, job_id, output_path):
+        from urllib.request import urlopen
+
+        tmp_path = output_path + ".part"
+        with urlopen(f"{self.url}/jobs/{job_id}/result", timeout=self.timeout) as response, \
+                open(tmp_path, "wb") as f:
+            shutil.copyfileobj(response, f, CHUNK)
+        os.replace(tmp_path, output_path)
+        return output_path
+
+
+def run_remote(kind, output_path, provider=None, folder=None, files=None, password=None, fmt="xlsx",
+               on_progress=None, url=None, upload=None):
+    """ส่งงานให้ service รอจนเสร็จ แล้วบันทึกผลลัพธ์ที่ output_path คืนค่าสถานะ job สุดท้าย
+    upload=None → อัปโหลดไฟล์เมื่อ service ไม่ได้อยู่ในเครื่องนี้ (path ในเครื่องเราไม่มีความหมายกับเครื่องอื่น)"""
+    client = Client(url)
+    if upload is None:
+        upload = not client.is_local()
+    job = client.submit(kind, provider, folder=folder, files=files, password=password, fmt=fmt, upload=upload)
+    job = client.wait(job["id"], on_progress)
+    client.download(job["id"], output_path)
+    return job
@@ -0,0 +1,274 @@
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+import extractors
+import matching
+
+# ปลายทางของแถวที่สกัดได้ เขียนทีละแถวทันทีที่แต่ละหน้า/ไฟล์เสร็จ ไม่ต้องเก็บทุกแถวไว้ในหน่วยความจำ
+#
+#   with sinks.open_sink(output_path, "csv") as sink:
+#       for data in rows:
+#           sink.write(data)
+#
+# เขียนลงไฟล์ชั่วคราวข้างไฟล์ปลายทางแล้วค่อยแทนที่ตอนปิด → ถ้าล้มกลางทางไฟล์เดิมจะไม่เสีย
+# ยกเว้น append=True (csv / jsonl เท่านั้น): ต่อท้ายไฟล์เดิมโดยตรง ลำดับนับต่อจากแถวที่มีอยู่ (โหมดเฝ้าโฟลเดอร์)
+#
+#   xlsx     Excel (openpyxl write-only)
+#   csv      UTF-8 มี BOM (เปิดใน Excel แล้วภาษาไทยไม่เพี้ยน) ค่าเป็นข้อความตามที่แสดงใน Excel
+#   jsonl    หนึ่ง object ต่อบรรทัด key = หัวตาราง
+#   parquet  ต้องมี pyarrow — Fee/VAT/total fee เป็น decimal(18,2), วันที่เป็น date, ลำดับเป็น int64
+
+HEADER_STYLE = "fundfee_header"
+INDEX_STYLE = "fundfee_index"
+
+PARQUET_BATCH_ROWS = 50000
+
+APPEND_FORMATS = ("csv", "jsonl")
+
+
+def parse_decimal(value):
+    """"3,867.43" → Decimal("3867.43") ค่าที่ไม่ใช่ตัวเลข → None"""
+    try:
+        amount = Decimal(str(value).replace(",", ""))
+    except (InvalidOperation, ValueError):
+        return None
+    return amount.quantize(Decimal("0.01")) if amount.is_finite() else None
+
+
+def parse_date(value):
+    """"26/09/2025" / "26-09-2025" → date ปี พ.ศ. (> 2400) แปลงเป็น ค.ศ. ค่าที่อ่านไม่ได้ → None"""
+    try:
+        day, month, year = (int(part) for part in str(value).replace("-", "/").split("/"))
+        if year > 2400:
+            year -= 543
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+class Sink(ABC):
+    """ฐานของทุกรูปแบบ: นับแถว/แถว ERROR, เขียนไฟล์ชั่วคราว, ใช้กับ with ได้
+
+    append=True เขียนลงไฟล์ปลายทางโดยตรง แถวที่ flush แล้วคงอยู่แม้ abort"""
+
+    def __init__(self, output_path, append=False):
+        self.output_path = output_path
+        self.append = append
+        self.tmp_path = output_path if append else output_path + ".part"
+        self.count = 0
+        self.errors = 0
+        self.existing = append and os.path.exists(output_path) and os.path.getsize(output_path) > 0
+
+    def write(self, data):
+        """เขียนหนึ่งแถว (dict ตาม extractors.FIELDS) ลำดับนับต่อจากแถวก่อนหน้า"""
+        self.count += 1
+        if str(data.get("เลขที่", "")).startswith("ERROR:"):
+            self.errors += 1
+        self._write(self.count, data)
+
+    def write_all(self, rows):
+        for data in rows:
+            self.write(data)
+
+    def flush(self):
+        """ให้แถวที่เขียนแล้วเห็นในไฟล์ทันที (โหมด append)"""
+
+    @abstractmethod
+    def _write(self, index, data):
+        """เขียนแถวที่ index ลงไฟล์ชั่วคราว"""
+
+    @abstractmethod
+    def _finish(self):
+        """ปิดไฟล์ชั่วคราว (ก่อนแทนที่ไฟล์ปลายทาง)"""
+
+    def close(self):
+        self._finish()
+        if not self.append:
+            os.replace(self.tmp_path, self.output_path)
+
+    def abort(self):
+        """ทิ้งผลที่เขียนไปแล้ว (โหมด append แค่ปิดไฟล์)"""
+        try:
+            self._finish()
+        except Exception:
+            pass
+        if not self.append and os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class ExcelSink(Sink):
+    """.xlsx แบบ write-only ของ openpyxl: แถวถูกเขียนลง XML ทันที หน่วยความจำคงที่ไม่ขึ้นกับจำนวนแถว
+
+    style ของหัวตาราง/คอลัมน์ลำดับเป็น named style ที่ลงทะเบียนครั้งเดียว แต่ละแถวอ้างแค่ชื่อ
+    widths = {ตัวอักษรคอลัมน์: ความกว้าง} (ต้องกำหนดก่อนเขียนแถวแรก ข้อจำกัดของ write-only)
+    """
+
+    def __init__(self, output_path, sheet_title="PDF Data", widths=None):
+        from openpyxl import Workbook
+        from openpyxl.styles import Alignment, Font, NamedStyle
+
+        super().__init__(output_path)
+        self.wb = Workbook(write_only=True)
+        self.wb.add_named_style(NamedStyle(name=HEADER_STYLE, font=Font(bold=True),
+                                           alignment=Alignment(horizontal="center")))
+        self.wb.add_named_style(NamedStyle(name=INDEX_STYLE, alignment=Alignment(horizontal="center")))
+        self.ws = self.wb.create_sheet(sheet_title)
+        for col, width in (widths or {}).items():
+            self.ws.column_dimensions[col].width = width
+        self.ws.append([self._cell(header, HEADER_STYLE) for header in extractors.HEADERS])
+
+    def _cell(self, value, style):
+        from openpyxl.cell import WriteOnlyCell
+
+        cell = WriteOnlyCell(self.ws, value=value)
+        cell.style = style
+        return cell
+
+    def _write(self, index, data):
+        values = extractors.row_values(index, data)
+        values[0] = self._cell(values[0], INDEX_STYLE)
+        self.ws.append(values)
+
+    def _finish(self):
+        self.wb.save(self.tmp_path)
+
+
+class CsvSink(Sink):
+    def __init__(self, output_path, append=False, **_):
+        super().__init__(output_path, append)
+        if self.existing:
+            with open(output_path, encoding="utf-8-sig", newline="") as f:
+                self.count = max(0, sum(1 for _ in csv.reader(f)) - 1)
+        # โหมด "a" ที่ตำแหน่งไม่ใช่ 0 จะไม่เขียน BOM ซ้ำกลางไฟล์
+        self.file = open(self.tmp_path, "a" if append else "w", encoding="utf-8-sig", newline="")
+        self.writer = csv.writer(self.file)
+        if not self.existing:
+            self.writer.writerow(extractors.HEADERS)
+
+    def _write(self, index, data):
+        self.writer.writerow(extractors.row_values(index, data))
+
+    def flush(self):
+        self.file.flush()
+
+    def _finish(self):
+        self.file.close()
+
+
+class JsonlSink(Sink):
+    def __init__(self, output_path, append=False, **_):
+        super().__init__(output_path, append)
+        if self.existing:
+            with open(output_path, encoding="utf-8") as f:
+                self.count = sum(1 for line in f if line.strip())
+        self.file = open(self.tmp_path, "a" if append else "w", encoding="utf-8")
+
+    def _write(self, index, data):
+        row = dict(zip(extractors.HEADERS, extractors.row_values(index, data)))
+        self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        self.file.flush()
+
+    def _finish(self):
+        self.file.close()
+
+
+class ParquetSink(Sink):
+    """Parquet (pyarrow) แบบคอลัมน์มีชนิด เขียนเป็น row group ละ PARQUET_BATCH_ROWS แถว (หน่วยความจำคงที่)
+
+    ค่าที่แปลงไม่ได้ (เช่นแถว ERROR / ช่องว่าง) เป็น null
+    """
+
+    def __init__(self, output_path, **_):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("บันทึกเป็น Parquet ต้องติดตั้ง pyarrow ก่อน (pip install pyarrow)") from None
+
+        super().__init__(output_path)
+        amount = pa.decimal128(18, 2)
+        self.schema = pa.schema([
+            ("ลำดับ", pa.int64()),
+            ("เลขที่", pa.string()),
+            ("วันที่", pa.date32()),
+            ("Unitholder No.", pa.string()),
+            ("ชื่อกองทุน", pa.string()),
+            ("Fee", amount),
+            ("VAT", amount),
+            ("total fee", amount),
+        ])
+        self.writer = pq.ParquetWriter(self.tmp_path, self.schema)
+        self.columns = {name: [] for name in self.schema.names}
+
+    def _write(self, index, data):
+        columns = self.columns
+        columns["ลำดับ"].append(index)
+        columns["เลขที่"].append(data.get("เลขที่") or "")
+        columns["วันที่"].append(parse_date(data.get("วันที่", "")))
+        columns["Unitholder No."].append(data.get("Unitholder No.") or "")
+        columns["ชื่อกองทุน"].append(data.get("ชื่อกองทุน") or "")
+        for field in matching.AMOUNT_FIELDS:
+            columns[field].append(parse_decimal(data.get(field, "")))
+        if len(columns["ลำดับ"]) >= PARQUET_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+
+        if self.columns["ลำดับ"]:
+            self.writer.write_table(pa.table(self.columns, schema=self.schema))
+            self.columns = {name: [] for name in self.schema.names}
+
+    def _finish(self):
+        self._flush()
+        self.writer.close()
+
+
+FORMATS = {"xlsx": ExcelSink, "csv": CsvSink, "jsonl": JsonlSink, "parquet": ParquetSink}
+
+
+def format_from_path(path, default="xlsx"):
+    """รูปแบบจากนามสกุลไฟล์ (.xlsx / .csv / .jsonl / .parquet)"""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return ext if ext in FORMATS else default
+
+
+def output_name(filename, fmt):
+    """เปลี่ยนนามสกุลของชื่อไฟล์ผลลัพธ์เดิมตามรูปแบบ เช่น TaxInvoiceDaol.xlsx → TaxInvoiceDaol.csv"""
+    return os.path.splitext(filename)[0] + "." + fmt
+
+
+def open_sink(output_path, fmt=None, sheet_title="PDF Data", widths=None, append=False):
+    """sink ตามรูปแบบ (ไม่ระบุ = ดูจากนามสกุลไฟล์) sheet_title / widths ใช้เฉพาะ xlsx
+    append=True ต่อท้ายไฟล์เดิม (เฉพาะ APPEND_FORMATS)"""
+    fmt = fmt or format_from_path(output_path)
+    if fmt not in FORMATS:
+        raise ValueError(f"ไม่รองรับรูปแบบไฟล์: {fmt} (ใช้ได้: {', '.join(FORMATS)})")
+    if append:
+        if fmt not in APPEND_FORMATS:
+            raise ValueError(f"ต่อท้ายไฟล์เดิมได้เฉพาะ {', '.join(APPEND_FORMATS)} (ไม่ใช่ {fmt})")
+        return FORMATS[fmt](output_path, append=True)
+    return FORMATS[fmt](output_path, sheet_title=sheet_title, widths=widths)
+
+
+def open_provider_sink(provider, folder, fmt="xlsx", append=False):
+    """sink ชื่อไฟล์เดิมของกองทุน (extractors.PROVIDERS) ในโฟลเดอร์ พร้อมชื่อ sheet / ความกว้างคอลัมน์"""
+    spec = extractors.PROVIDERS[provider]
+    return open_sink(os.path.join(folder, output_name(spec["output"], fmt)), fmt, spec["sheet"],
+                     widths=spec.get("widths"), append=append)
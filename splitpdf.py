@@ -0,0 +1,144 @@
+import os
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from tkinter import filedialog, messagebox
+from jobbar import JobBar
+from progress import ProgressFeed
+import subprocess
+import platform
+import extractors
+import pdfsplit
+import unlock
+
+class SplitPDFPage(ttk.Frame):
+    """แยกไฟล์ที่มีใบกำกับหลายใบ (หน้าละใบ) เป็นไฟล์ละใบ ตั้งชื่อตามเลขที่ / Unitholder No. ที่สกัดได้"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.configure(padding=20)
+
+        self.split_path_var = ttk.StringVar()
+        self.password_var = ttk.StringVar()
+        self.provider_var = ttk.StringVar(value=pdfsplit.PROVIDERS[0])
+
+        # ========== HEADER ==========
+        ttk.Label(self, text="✂️ Split PDF",
+                  font=("Kanit Semibold", 22),
+                  bootstyle="info").pack(pady=(10, 5))
+        ttk.Label(self, text="แยกไฟล์ PDF ที่มีหลายใบกำกับเป็นไฟล์ละใบ ชื่อไฟล์ <เลขที่>_<Unitholder No.>.pdf",
+                  font=("Kanit", 11), foreground="#c7d0d9").pack(pady=(0, 20))
+
+        # ========== CARD FRAME ==========
+        card = ttk.Frame(self, padding=25)
+        card.pack(pady=10, padx=50, fill="x")
+
+        # --- File Input ---
+        ttk.Label(card, text="📄 ไฟล์ PDF:", font=("Kanit", 11)).grid(row=0, column=0, sticky="w", pady=5)
+
+        file_frame = ttk.Frame(card)
+        file_frame.grid(row=0, column=1, sticky="ew", padx=(10, 0))
+        card.columnconfigure(1, weight=1)
+
+        ttk.Entry(file_frame, textvariable=self.split_path_var,
+                  bootstyle="info", font=("Kanit", 10)).pack(side="left", fill="x", expand=True, padx=(0, 10))
+        ttk.Button(file_frame, text="Browse...",
+                   bootstyle="secondary-outline", command=self.browse_file).pack(side="right")
+
+        # --- Provider ---
+        ttk.Label(card, text="🏦 กองทุน:", font=("Kanit", 11)).grid(row=1, column=0, sticky="w", pady=(15, 5))
+        ttk.Combobox(card, textvariable=self.provider_var, values=list(pdfsplit.PROVIDERS), state="readonly",
+                     width=12, bootstyle="info").grid(row=1, column=1, sticky="w", padx=(10, 0), pady=(15, 5))
+
+        # --- Password Input ---
+        ttk.Label(card, text="🔐 รหัสผ่าน (ถ้ามี):", font=("Kanit", 11)).grid(row=2, column=0, sticky="w", pady=(15, 5))
+        ttk.Entry(card, textvariable=self.password_var, show="*",
+                  bootstyle="info", font=("Kanit", 10)).grid(row=2, column=1, sticky="ew", padx=(10, 0), pady=(15, 5))
+
+        # ========== PROGRESS ==========
+        self.progress = ttk.Progressbar(self, orient="horizontal",
+                                        mode="determinate", length=600,
+                                        bootstyle="info-striped")
+        self.progress.pack(pady=(20, 8))
+        self.status_label = ttk.Label(self, text="พร้อมทำงาน", font=("Kanit", 10))
+        self.status_label.pack(pady=(0, 15))
+        self.feed = ProgressFeed(self, self.progress, self.status_label)
+
+        # ========== BUTTONS ==========
+        btn_frame = ttk.Frame(self)
+        btn_frame.pack()
+
+        self.job_bar = JobBar(btn_frame, "✂️ แยกไฟล์ PDF", self.split_pdf, self.split_path_var.get,
+                              self.feed, params=self.read_form, bootstyle="success-outline", width=22)
+        self.job_bar.pack(side="left", padx=10)
+
+        self.open_btn = ttk.Button(btn_frame, text="เปิดโฟลเดอร์ 📂",
+                                   bootstyle="secondary", width=18,
+                                   command=self.open_folder, state="disabled")
+        self.open_btn.pack(side="left", padx=10)
+
+        ttk.Label(self, text="© 2025 NongAumzaap", font=("Kanit", 9),
+                  foreground="#7c8a97").pack(side="bottom", pady=10)
+
+    # ========== FUNCTION ==========
+    def browse_file(self):
+        file_selected = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
+        if file_selected:
+            self.split_path_var.set(file_selected)
+
+    def read_form(self):
+        """ค่าจากฟอร์ม อ่านใน main loop ตอนกดเริ่ม (งานใน thread ของตัวจัดคิวไม่แตะตัวแปร Tk)"""
+        return {"pdf_path": self.split_path_var.get(), "provider": self.provider_var.get(),
+                "password": self.password_var.get().strip()}
+
+    def split_pdf(self, pdf_path, provider, password):
+        password = password or None
+        self.feed.call(self.open_btn.configure, state="disabled")
+
+        if not pdf_path or not os.path.isfile(pdf_path):
+            self.feed.call(messagebox.showwarning, "กรุณาเลือกไฟล์", "กรุณาเลือกไฟล์ PDF ที่ต้องการแยก")
+            return
+
+        writing = []
+
+        def on_page(path, page_num, total_pages):
+            self.feed.update(value=page_num, maximum=total_pages, text=f"กำลังอ่านหน้า {page_num}/{total_pages} ...")
+
+        def on_write(done, total):
+            # ขั้นที่สอง (เขียนไฟล์) นับใหม่เป็นไฟล์
+            if not writing:
+                writing.append(True)
+                self.feed.start(total, text="กำลังเขียนไฟล์...", unit="ไฟล์")
+            self.feed.update(value=done, text=f"กำลังเขียนไฟล์ {done}/{total} ...")
+
+        try:
+            self.feed.start(None, text="กำลังอ่านไฟล์...")
+            result = pdfsplit.split_file(pdf_path, provider, password=password,
+                                         workers=extractors.default_workers(), on_page=on_page, on_write=on_write)
+            self.output_dir = result["out_dir"]
+            self.feed.finish(f"✅ แยกไฟล์เสร็จสิ้น! ใหม่ {len(result['written'])} ไฟล์"
+                             f" (มีอยู่แล้ว {len(result['skipped'])} ไฟล์)")
+            self.feed.call(messagebox.showinfo, "สำเร็จ!",
+                           f"แยกไฟล์เรียบร้อยแล้ว\n\nใหม่ {len(result['written'])} ไฟล์, "
+                           f"ข้าม {len(result['skipped'])} ไฟล์ที่มีอยู่แล้ว\n\nบันทึกไว้ที่:\n{self.output_dir}")
+            self.feed.call(self.open_btn.configure, state="normal")
+        except unlock.PasswordRequired as e:
+            self.feed.call(messagebox.showwarning, "ไฟล์ถูกเข้ารหัส",
+                           f"'{e}' ต้องการรหัสผ่าน!\nกรุณาใส่รหัสผ่านแล้วลองใหม่.")
+        except unlock.WrongPassword as e:
+            self.feed.call(messagebox.showerror, "รหัสผ่านไม่ถูกต้อง",
+                           f"ไม่สามารถปลดล็อก '{e}' ได้ (รหัสไม่ถูกต้อง)")
+        except Exception as e:
+            self.feed.call(messagebox.showerror, "ข้อผิดพลาด", str(e))
+            self.feed.finish("❌ เกิดข้อผิดพลาด")
+        finally:
+            self.feed.update(value=0)
+
+    def open_folder(self):
+        if hasattr(self, "output_dir"):
+            folder = self.output_dir
+            if platform.system() == "Windows":
+                os.startfile(folder)
+            elif platform.system() == "Darwin":
+                subprocess.Popen(["open", folder])
+            else:
+                subprocess.Popen(["xdg-open", folder])
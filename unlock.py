@@ -0,0 +1,211 @@
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+
+import cache
+
+# ถอดรหัส PDF ครั้งเดียวต่อไฟล์ แล้วทุกส่วน (แยกกองทุน / สกัดข้อมูล / Merge PDF) เปิดสำเนาที่ถอดแล้วแทน
+#
+# สำเนาอยู่ในโฟลเดอร์ชั่วคราวส่วนตัวของ session (mkdtemp, สิทธิ์เฉพาะผู้ใช้) ชื่อไฟล์ = sha256 ของไฟล์ต้นฉบับ
+# worker process ใช้โฟลเดอร์เดียวกับ process หลัก (ส่งผ่าน extractors.worker_settings) จึงใช้สำเนาร่วมกันได้
+# ตอนปิดโปรแกรมเขียนทับสำเนาด้วย 0 แล้วลบทั้งโฟลเดอร์ (wipe)
+#
+# รหัสผ่านใส่ได้หลายตัว (list หรือคั่นด้วย ",") ลองทีละตัวครั้งเดียวต่อไฟล์ ตัวที่เพิ่งใช้ได้ลองก่อน
+# ปิดการเก็บสำเนาด้วย FUNDFEE_NO_UNLOCK_CACHE=1 (ยังเลือกรหัสจากหลายตัวได้ แต่ pdfplumber ถอดรหัสเองทุกครั้ง)
+
+ENABLED = os.environ.get("FUNDFEE_NO_UNLOCK_CACHE", "") == ""
+
+# ไฟล์ที่ไม่มี "/Encrypt" ในส่วนหัว/ท้ายไฟล์ (ที่อยู่ของ trailer) ไม่ต้อง parse เพื่อเช็ก
+PROBE_HEAD = 4096
+PROBE_TAIL = 65536
+WIPE_CHUNK = 1024 * 1024
+
+_dir = None
+_owner = False
+_lock = threading.Lock()
+_resolved = {}
+_last_good = None
+
+
+class PasswordRequired(Exception):
+    """ไฟล์ถูกเข้ารหัสแต่ไม่ได้ใส่รหัสผ่าน"""
+
+
+class WrongPassword(Exception):
+    """ปลดล็อกไฟล์ด้วยรหัสผ่านที่ให้มาไม่ได้"""
+
+
+def candidates(password):
+    """"a" / "a,b" / ["a", "b"] → รหัสที่จะลองตามลำดับ (ไม่ซ้ำ) ทั้งข้อความที่มี "," ลองก่อนแยก"""
+    if not password:
+        return []
+    if isinstance(password, str):
+        items = [password] + ([part.strip() for part in password.split(",")] if "," in password else [])
+    else:
+        items = list(password)
+    return list(dict.fromkeys(item for item in items if item))
+
+
+# -------------------- SESSION DIR --------------------
+def session_dir():
+    """โฟลเดอร์สำเนาของ session นี้ (สร้างครั้งแรกที่เรียก ลบอัตโนมัติตอนจบ process)"""
+    global _dir, _owner
+    with _lock:
+        if _dir is None:
+            _dir = tempfile.mkdtemp(prefix="fundfee-unlocked-")
+            _owner = True
+            atexit.register(wipe)
+        return _dir
+
+
+def use_dir(folder):
+    """worker process: ใช้โฟลเดอร์ของ process หลัก (process หลักเป็นคนลบ)"""
+    global _dir, _owner
+    _dir, _owner = folder, False
+
+
+def wipe():
+    """เขียนทับสำเนาที่ถอดรหัสแล้วด้วย 0 ก่อนลบ แล้วลบโฟลเดอร์ (เฉพาะ process ที่สร้างโฟลเดอร์)"""
+    global _dir, _owner
+    with _lock:
+        folder, owner = _dir, _owner
+        _dir, _owner = None, False
+        _resolved.clear()
+    if not folder or not owner or not os.path.isdir(folder):
+        return
+    zeros = bytes(WIPE_CHUNK)
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        try:
+            remaining = os.path.getsize(path)
+            with open(path, "r+b") as f:
+                while remaining > 0:
+                    remaining -= f.write(zeros[:min(remaining, WIPE_CHUNK)])
+                f.flush()
+                os.fsync(f.fileno())
+            os.remove(path)
+        except OSError:
+            pass
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+# -------------------- RESOLVE --------------------
+def maybe_encrypted(pdf_path):
+    """เช็กเร็วจากไบต์ส่วนหัว/ท้ายไฟล์ False = ไม่เข้ารหัสแน่นอน"""
+    with open(pdf_path, "rb") as f:
+        head = f.read(PROBE_HEAD)
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - PROBE_TAIL))
+        tail = f.read()
+    return b"/Encrypt" in head or b"/Encrypt" in tail
+
+
+def decrypt_reader(reader, password=None, name=""):
+    """ปลดล็อก PdfReader ของ PyPDF2 ด้วยรหัสทีละตัว คืนค่ารหัสที่ใช้ได้ ("" = ไฟล์ไม่มี user password)"""
+    global _last_good
+    tries = candidates(password)
+    if _last_good in tries:
+        tries.remove(_last_good)
+        tries.insert(0, _last_good)
+    for candidate in tries + [""]:
+        if reader.decrypt(candidate) != 0:
+            if candidate:
+                _last_good = candidate
+            return candidate
+    if not tries:
+        raise PasswordRequired(name)
+    raise WrongPassword(name)
+
+
+def _plumber_password(pdf_path, password=None):
+    """เลือกรหัสด้วย pdfplumber (ใช้เมื่อ PyPDF2 ถอดไฟล์นี้ไม่ได้)"""
+    import pdfplumber
+
+    tries = candidates(password)
+    for candidate in tries:
+        try:
+            with pdfplumber.open(pdf_path, password=candidate, pages=[1]):
+                return candidate
+        except Exception:
+            continue
+    if not tries:
+        raise PasswordRequired(os.path.basename(pdf_path))
+    raise WrongPassword(os.path.basename(pdf_path))
+
+
+def _decrypted_copy(reader, pdf_path):
+    import pdfjoin
+
+    folder = session_dir()
+    digest = cache.file_digest(pdf_path)
+    path = os.path.join(folder, digest + ".pdf")
+    if not os.path.exists(path):
+        # ชื่อชั่วคราวไม่ชนกันระหว่าง process/thread ที่ถอดไฟล์เดียวกันพร้อมกัน
+        tmp = os.path.join(folder, f"{digest}.{os.getpid()}.{threading.get_ident()}.pdf")
+        writer = pdfjoin.StreamingPdfWriter(tmp)
+        try:
+            writer.append_reader(reader)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        os.replace(tmp, path)
+    return path
+
+
+def resolved_key(pdf_path, password=None):
+    """key ของ _resolved: (path, size, mtime, รหัสที่ให้มา) — รหัสต่างกันต้องพิสูจน์รหัสใหม่ ไม่ได้สำเนาของคนอื่นไป"""
+    st = os.stat(pdf_path)
+    return os.path.abspath(pdf_path), st.st_size, st.st_mtime_ns, tuple(candidates(password))
+
+
+def check_password(pdf_path, password=None):
+    """เปิดไฟล์ด้วยรหัสที่ให้มาได้หรือไม่ (ไม่สร้างสำเนา) ไม่ได้ → PasswordRequired / WrongPassword
+    ใช้ก่อนคืนผลจากแคชผลลัพธ์ (key ของแคชผลลัพธ์เป็น hash เนื้อไฟล์ ไม่รวมรหัสผ่าน)"""
+    if resolved_key(pdf_path, password) in _resolved or not maybe_encrypted(pdf_path):
+        return
+    from PyPDF2 import PdfReader
+    from PyPDF2.errors import DependencyError
+
+    reader = PdfReader(pdf_path, strict=False)
+    if reader.is_encrypted:
+        try:
+            decrypt_reader(reader, password, os.path.basename(pdf_path))
+        except DependencyError:
+            _plumber_password(pdf_path, password)
+
+
+def resolve(pdf_path, password=None):
+    """(path, password) ที่ใช้เปิดไฟล์จริง ไฟล์เข้ารหัส → สำเนาที่ถอดแล้ว (password None) ไม่เข้ารหัส → ไฟล์เดิม
+
+    แคชต่อ (path, size, mtime, รหัสผ่าน) ใน process นี้ รหัสไม่ถูก → PasswordRequired / WrongPassword"""
+    key = resolved_key(pdf_path, password)
+    found = _resolved.get(key)
+    if found is not None:
+        return found
+
+    result = (pdf_path, None)
+    if maybe_encrypted(pdf_path):
+        from PyPDF2 import PdfReader
+        from PyPDF2.errors import DependencyError
+
+        reader = PdfReader(pdf_path, strict=False)
+        if reader.is_encrypted:
+            try:
+                good = decrypt_reader(reader, password, os.path.basename(pdf_path))
+                result = (_decrypted_copy(reader, pdf_path), None) if ENABLED else (pdf_path, good)
+            except DependencyError:
+                # PyPDF2 ถอด AES ไม่ได้ถ้าไม่มี pycryptodome → ให้ pdfplumber ถอดเองทุกครั้งแบบเดิม
+                result = (pdf_path, _plumber_password(pdf_path, password))
+    _resolved[key] = result
+    return result
+
+
+def open_plumber(pdf_path, password=None, **kwargs):
+    """pdfplumber.open ผ่าน resolve (ไฟล์เข้ารหัสไม่ต้องถอดซ้ำทุกครั้งที่เปิด)"""
+    import pdfplumber
+
+    path, password = resolve(pdf_path, password)
+    return pdfplumber.open(path, password=password or None, **kwargs)
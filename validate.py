@@ -0,0 +1,47 @@
+import re
+
+# ตรวจความสมเหตุสมผลของแถวที่สกัดได้ (ใช้ตัดสินว่าต้อง OCR ใหม่/ละเอียดขึ้นหรือไม่)
+
+AMOUNT_RE = re.compile(r"[\d,]+\.\d{2}")
+VAT_RATE = 0.07
+REQUIRED = ["เลขที่", "วันที่", "Unitholder No.", "ชื่อกองทุน", "Fee", "VAT", "total fee"]
+
+
+def parse_amount(value):
+    try:
+        return float(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+def fmt(x):
+    return f"{x:,.2f}"
+
+
+def fees_consistent(fee, vat, total):
+    """Fee + VAT == total fee (±0.01) และ VAT ≈ 7% ของ Fee (±0.02 จากการปัดเศษ)"""
+    if fee is None or vat is None or total is None or fee <= 0:
+        return False
+    return abs(fee + vat - total) <= 0.01 and abs(vat - round(fee * VAT_RATE, 2)) <= 0.02
+
+
+def find_fee_triple(numbers):
+    """หา (fee, vat, total) จากรายการตัวเลขที่ลำดับ/จำนวนไม่แน่นอน (เช่นจาก OCR ช่องค่าธรรมเนียม)"""
+    values = sorted(set(round(n, 2) for n in numbers if n and n > 0))
+    for total in reversed(values):
+        for fee in values:
+            if fee >= total:
+                break
+            vat = round(total - fee, 2)
+            if fees_consistent(fee, vat, total):
+                return fee, vat, total
+    return None
+
+
+def validate_row(data):
+    """คืนค่า list ของปัญหาที่พบ (ว่าง = ผ่าน)"""
+    problems = [f"ไม่พบ {field}" for field in REQUIRED if not data.get(field)]
+    fee, vat, total = (parse_amount(data.get(f)) for f in ("Fee", "VAT", "total fee"))
+    if fee is not None and vat is not None and total is not None and not fees_consistent(fee, vat, total):
+        problems.append("Fee + VAT ไม่เท่ากับ total fee หรือ VAT ไม่ใช่ 7%")
+    return problems
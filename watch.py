@@ -0,0 +1,331 @@
+import json
+import os
+import select
+import struct
+import sys
+import time
+
+import cache
+import detect
+import extractors
+import sinks
+
+# เฝ้าโฟลเดอร์: สกัดข้อมูลไฟล์ PDF ทันทีที่ถูกวางลงโฟลเดอร์ แล้วต่อท้ายแถวในไฟล์ผลลัพธ์ของกองทุน (csv / jsonl)
+#
+# Linux ใช้ inotify (ผ่าน ctypes ไม่ต้องติดตั้งเพิ่ม) ระบบอื่น / inotify ใช้ไม่ได้ → สแกนโฟลเดอร์ทุก poll วินาที
+# ไฟล์ที่ยังคัดลอกไม่เสร็จ: รอจนขนาด/เวลาแก้ไขไม่เปลี่ยนอย่างน้อย settle วินาที และท้ายไฟล์มี %%EOF
+# (ไฟล์ที่ไม่มี %%EOF รอ STALE_SECONDS แล้วส่งให้ตัวสกัดตัดสินเอง จะได้ไม่ค้างตลอดไป)
+# ไฟล์ที่ทำแล้วจดไว้ใน WATCH_LEDGER ในโฟลเดอร์ผลลัพธ์ (ตาม sha256) รันใหม่ / คัดลอกซ้ำจะไม่ต่อแถวซ้ำ
+# ledger เขียนหลัง flush แถวแล้ว → ถ้าโปรแกรมหยุดระหว่างนั้น ไฟล์นั้นอาจถูกต่อซ้ำได้หนึ่งครั้ง (ไม่หาย)
+
+SETTLE_SECONDS = 2.0
+POLL_SECONDS = 1.0
+# สแกนทั้งโฟลเดอร์เป็นระยะแม้ใช้ inotify (กันเหตุการณ์ตกหล่น เช่น queue ล้น / network drive)
+RESCAN_SECONDS = 60.0
+STALE_SECONDS = 60.0
+EOF_PROBE = 2048
+
+WATCH_LEDGER = ".fundfee_watch.jsonl"
+
+
+def wanted(name):
+    """ไฟล์ PDF ที่ควรสกัด (ไม่นับไฟล์ซ่อน / ไฟล์ชั่วคราวของ Office และโปรแกรมคัดลอก)"""
+    return name.lower().endswith(".pdf") and not name.startswith((".", "~$"))
+
+
+def signature(path):
+    """(size, mtime_ns) หรือ None ถ้าไฟล์หายไปแล้ว"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def has_eof(path):
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - EOF_PROBE))
+            return b"%%EOF" in f.read()
+    except OSError:
+        return False
+
+
+# -------------------- EVENT SOURCES --------------------
+class PollSource:
+    """สแกนโฟลเดอร์ทุกครั้งที่เรียก wait คืนค่าไฟล์ที่ใหม่หรือเปลี่ยน"""
+
+    name = "polling"
+
+    def __init__(self, folders):
+        self.folders = folders
+        self.seen = {}
+
+    def scan(self):
+        changed = set()
+        for folder in self.folders:
+            for name in extractors.list_pdfs(folder):
+                path = os.path.join(folder, name)
+                sig = signature(path)
+                if wanted(name) and sig and self.seen.get(path) != sig:
+                    self.seen[path] = sig
+                    changed.add(path)
+        return changed
+
+    def wait(self, timeout):
+        time.sleep(timeout)
+        return self.scan()
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """inotify ของ Linux: รอเหตุการณ์สร้าง/เขียนเสร็จ/ย้ายเข้าในโฟลเดอร์ (ไม่ใช้ CPU ระหว่างรอ)"""
+
+    name = "inotify"
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_Q_OVERFLOW = 0x4000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, folders):
+        import ctypes
+        import ctypes.util
+
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify มีเฉพาะ Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self.folders = {}
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        for folder in folders:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(folder), mask)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(errno, f"inotify_add_watch: {folder}")
+            self.folders[wd] = folder
+        # เหตุการณ์ล้น queue → ให้ผู้เรียกสแกนทั้งโฟลเดอร์
+        self.overflowed = False
+
+    def wait(self, timeout):
+        changed = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return changed
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + self.EVENT.size <= len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                self.overflowed = True
+            elif wd in self.folders and wanted(name):
+                changed.add(os.path.join(self.folders[wd], name))
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def open_source(folders, use_inotify=True):
+    if use_inotify:
+        try:
+            return InotifySource(folders)
+        except (OSError, AttributeError) as e:
+            extractors.log(f"ใช้ inotify ไม่ได้ ({e}) → สแกนโฟลเดอร์แทน")
+    return PollSource(folders)
+
+
+# -------------------- DEBOUNCE --------------------
+class Debouncer:
+    """ไฟล์ที่รอให้เขียนเสร็จ: ready() คืนค่าไฟล์ที่นิ่งแล้ว"""
+
+    def __init__(self, settle=SETTLE_SECONDS, stale=STALE_SECONDS):
+        self.settle = settle
+        self.stale = max(stale, settle)
+        self.pending = {}
+
+    def add(self, paths, now=None):
+        now = time.monotonic() if now is None else now
+        for path in paths:
+            sig = signature(path)
+            if sig is None:
+                self.pending.pop(path, None)
+            elif path not in self.pending or self.pending[path][0] != sig:
+                self.pending[path] = (sig, now)
+
+    def ready(self, now=None):
+        now = time.monotonic() if now is None else now
+        done = []
+        for path, (sig, since) in list(self.pending.items()):
+            current = signature(path)
+            if current is None:
+                del self.pending[path]
+            elif current != sig:
+                self.pending[path] = (current, now)
+            elif now - since >= self.stale or (now - since >= self.settle and has_eof(path)):
+                del self.pending[path]
+                done.append(path)
+        return sorted(done)
+
+
+# -------------------- LEDGER --------------------
+class Ledger:
+    """ไฟล์ที่ประมวลผลแล้วของโฟลเดอร์ผลลัพธ์หนึ่ง (JSON หนึ่งบรรทัดต่อไฟล์ คีย์ sha256)"""
+
+    def __init__(self, out_dir):
+        self.path = os.path.join(out_dir, WATCH_LEDGER)
+        self.done = set()
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.done.add(json.loads(line)["sha256"])
+                    except (ValueError, KeyError):
+                        continue  # บรรทัดสุดท้ายเขียนไม่ครบ
+
+    def __contains__(self, digest):
+        return digest in self.done
+
+    def add(self, digest, pdf_path, provider, rows):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"sha256": digest, "name": os.path.basename(pdf_path), "provider": provider,
+                                "rows": rows, "at": time.strftime("%Y-%m-%dT%H:%M:%S")},
+                               ensure_ascii=False) + "\n")
+        self.done.add(digest)
+
+
+# -------------------- WATCH --------------------
+def is_error(row):
+    return str(row.get("เลขที่", "")).startswith("ERROR:")
+
+
+class Watcher:
+    """สถานะของการเฝ้า: sink ที่เปิดค้างไว้ต่อ (โฟลเดอร์ผลลัพธ์, กองทุน) และ ledger ต่อโฟลเดอร์ผลลัพธ์"""
+
+    def __init__(self, provider="auto", out_dir=None, fmt="csv", password=None, workers=None, on_file=None):
+        if fmt not in sinks.APPEND_FORMATS:
+            raise ValueError(f"โหมดเฝ้าโฟลเดอร์เขียนได้เฉพาะ {', '.join(sinks.APPEND_FORMATS)}")
+        self.provider = provider
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.password = password
+        self.workers = workers or extractors.default_workers()
+        self.on_file = on_file
+        self.sinks = {}
+        self.ledgers = {}
+        self.errors = 0
+
+    def target(self, pdf_path):
+        out_dir = self.out_dir or os.path.dirname(os.path.abspath(pdf_path))
+        if out_dir not in self.ledgers:
+            os.makedirs(out_dir, exist_ok=True)
+            self.ledgers[out_dir] = Ledger(out_dir)
+        return out_dir
+
+    def sink(self, out_dir, provider):
+        key = (out_dir, provider)
+        if key not in self.sinks:
+            self.sinks[key] = sinks.open_provider_sink(provider, out_dir, self.fmt, append=True)
+        return self.sinks[key]
+
+    def process(self, paths):
+        """สกัดไฟล์ที่นิ่งแล้ว (ข้ามไฟล์ที่อยู่ใน ledger) คืนค่าจำนวนไฟล์ที่ประมวลผล
+
+        ไฟล์ที่แยกกองทุนไม่ได้ หรือทุกแถวเป็น ERROR (รหัสผ่านผิด / ไม่มี OCR / ไฟล์ยังไม่ครบ) ไม่ถูกบันทึกใน ledger
+        และไม่ถูกต่อท้ายผลลัพธ์ → ลองใหม่เมื่อไฟล์เปลี่ยน หรือเมื่อเริ่มเฝ้าใหม่"""
+        fresh = {}
+        for pdf_path in paths:
+            try:
+                digest = cache.file_digest(pdf_path)
+            except OSError:
+                continue  # ถูกย้าย/ลบไปก่อน
+            out_dir = self.target(pdf_path)
+            if digest not in self.ledgers[out_dir] and digest not in fresh.values():
+                fresh[pdf_path] = digest
+        if not fresh:
+            return 0
+
+        if self.provider == "auto":
+            groups, unknown = detect.group_files(list(fresh), password=self.password, workers=self.workers)
+        else:
+            groups, unknown = {self.provider: list(fresh)}, []
+        for pdf_path in unknown:
+            if self.on_file:
+                self.on_file(None, pdf_path, [], None)
+
+        for provider, pdf_path, rows, _ in detect.iter_inbox(groups, password=self.password, workers=self.workers):
+            if rows and all(is_error(row) for row in rows):
+                self.errors += len(rows)
+                if self.on_file:
+                    self.on_file(provider, pdf_path, rows, None)
+                continue
+            out_dir = self.target(pdf_path)
+            sink = self.sink(out_dir, provider)
+            errors = sink.errors
+            sink.write_all(rows)
+            sink.flush()
+            self.errors += sink.errors - errors
+            self.ledgers[out_dir].add(fresh[pdf_path], pdf_path, provider, len(rows))
+            if self.on_file:
+                self.on_file(provider, pdf_path, rows, sink.output_path)
+        return len(fresh)
+
+    def close(self):
+        for sink in self.sinks.values():
+            sink.close()
+        self.sinks.clear()
+
+
+def watch(folders, provider="auto", out_dir=None, fmt="csv", password=None, workers=None,
+          settle=SETTLE_SECONDS, poll=POLL_SECONDS, use_inotify=True, initial=True, on_file=None, stop=None):
+    """เฝ้า folders จนกว่า stop (threading.Event) ถูก set หรือ KeyboardInterrupt
+
+    provider = "auto" แยกกองทุนจากหน้าแรก, out_dir = None เขียนผลลัพธ์ในโฟลเดอร์ของไฟล์นั้น
+    initial = True สกัดไฟล์ที่มีอยู่แล้วตอนเริ่มด้วย (ไฟล์ที่อยู่ใน ledger ถูกข้าม)
+    on_file(provider, pdf_path, rows, output_path) หลังต่อท้ายแต่ละไฟล์ (provider None = ไม่รู้จักกองทุน,
+    output_path None = ทุกแถวเป็น ERROR ไม่ได้ต่อท้าย) สองกรณีนี้จะลองใหม่เมื่อไฟล์เปลี่ยน / เริ่มเฝ้าใหม่"""
+    folders = [os.path.abspath(folder) for folder in folders]
+    for folder in folders:
+        if not os.path.isdir(folder):
+            raise FileNotFoundError(f"ไม่พบโฟลเดอร์: {folder}")
+
+    watcher = Watcher(provider, out_dir, fmt, password, workers, on_file)
+    source = open_source(folders, use_inotify)
+    scanner = source if isinstance(source, PollSource) else PollSource(folders)
+    debouncer = Debouncer(settle)
+    existing = scanner.scan()
+    if initial:
+        debouncer.add(existing)
+    last_scan = time.monotonic()
+    try:
+        while stop is None or not stop.is_set():
+            debouncer.add(source.wait(poll))
+            now = time.monotonic()
+            if scanner is not source and (now - last_scan >= RESCAN_SECONDS or source.overflowed):
+                source.overflowed = False
+                debouncer.add(scanner.scan(), now)
+                last_scan = now
+            ready = debouncer.ready()
+            if ready:
+                watcher.process(ready)
+    finally:
+        source.close()
+        watcher.close()
+    return watcher